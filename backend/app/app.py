@@ -13,6 +13,7 @@ load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file_
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import Config
 from utils.logging_config import setup_flask_logging, get_dms_logger
+from utils.activity_tracker import ActivityTracker
 
 app = Flask(__name__)
 CORS(app, supports_credentials=True)
@@ -55,6 +56,9 @@ Recipient = create_recipient_model(db)
 Trigger = create_trigger_model(db)
 DispatchLog = create_dispatchlog_model(db)
 
+# 사용자 활동(last_seen_at) write-behind 추적기
+activity_tracker = ActivityTracker(app, db)
+
 # API 요청 로깅 미들웨어
 @app.before_request
 def log_request_info():
@@ -120,7 +124,7 @@ app.register_blueprint(init_dispatchlog_routes(db, DispatchLog, Recipient))
 app.register_blueprint(init_system_routes(db))
 app.register_blueprint(init_test_routes())
 app.register_blueprint(init_home_routes())
-app.register_blueprint(init_auth_routes(db, UserInfo))
+app.register_blueprint(init_auth_routes(db, UserInfo, activity_tracker))
 app.register_blueprint(init_liveconfirmation_routes(db, DispatchLog))
 
 # Frontend 로그 라우트 초기화
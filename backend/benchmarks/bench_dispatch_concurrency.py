@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+스케줄러 발송 동시성 벤치마크
+발송 시점이 지난 트리거를 N개 만들어 아웃박스에 기록한 뒤 SCHEDULER_SEND_CONCURRENCY 를 바꿔가며
+아웃박스 한 번 비우기(process_outbox)의 처리량과 발송 완료 지연(시작 -> 발송 완료)
+p50/p99 를 측정합니다. 일부 메시지는 느린 수신 서버를 흉내내 오래 걸리게 합니다.
+
+Usage:
+    python benchmarks/bench_dispatch_concurrency.py [--triggers 1000] [--concurrency 1 4 16]
+                                                    [--smtp-latency 0.02] [--slow-every 100] [--slow-latency 2]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_scheduler_workers import scheduler, email_outbox, engine, seed, reset, cleanup, count_dispatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--triggers', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--smtp-latency', type=float, default=0.02, help='일반 발송 지연(초)')
+    parser.add_argument('--slow-every', type=int, default=100, help='N 번째 발송마다 느린 서버 흉내')
+    parser.add_argument('--slow-latency', type=float, default=2.0, help='느린 발송 지연(초)')
+    args = parser.parse_args()
+
+    state = {'sent': 0, 'started': 0.0, 'completed': []}
+    lock = threading.Lock()
+
+    def fake_send_group_email(to_emails, subject, body):
+        with lock:
+            state['sent'] += 1
+            slow = args.slow_every and state['sent'] % args.slow_every == 0
+        time.sleep(args.slow_latency if slow else args.smtp_latency)
+        with lock:
+            state['completed'].append(time.perf_counter() - state['started'])
+        return {}
+
+    email_outbox.send_group_email = fake_send_group_email
+    scheduler.logger.setLevel('WARNING')
+    email_outbox.logger.setLevel('WARNING')
+
+    with engine.connect() as connection:
+        cleanup(connection)
+        seed(connection, args.triggers)
+
+    print(f"{'concurrency':>11} | {'seconds':>8} | {'emails/s':>9} | {'p50 ms':>8} | {'p99 ms':>8} | {'sent':>6} | {'dup':>4}")
+    try:
+        for concurrency in args.concurrency:
+            with engine.connect() as connection:
+                reset(connection)
+            scheduler.process_email_triggers()
+            email_outbox.SEND_CONCURRENCY = concurrency
+            email_outbox._send_executor = None
+            state.update(sent=0, completed=[], started=time.perf_counter())
+
+            scheduler.process_outbox()
+            elapsed = time.perf_counter() - state['started']
+
+            with engine.connect() as connection:
+                sent, duplicated = count_dispatches(connection)
+            p50 = email_outbox.percentile(state['completed'], 50) * 1000
+            p99 = email_outbox.percentile(state['completed'], 99) * 1000
+            print(f"{concurrency:>11} | {elapsed:>8.2f} | {sent / elapsed:>9.1f} | {p50:>8.0f} | {p99:>8.0f} | {sent:>6} | {duplicated:>4}")
+    finally:
+        with engine.connect() as connection:
+            cleanup(connection)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+이메일 렌더링 벤치마크
+기존 방식(본문 문자열 .replace 치환 + 메시지마다 MIMEText 생성)과
+컴파일된 템플릿 render_batch + MessageSkeleton 조립의 초당 처리량을 비교합니다.
+DB/SMTP 없이 실행됩니다.
+
+Usage:
+    python benchmarks/bench_email_render.py [--messages 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from email.mime.text import MIMEText
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from triggers.email_templates import (
+    LIVE_CONFIRMATION, MessageSkeleton, live_confirmation_body, live_confirmation_subject, render_batch,
+)
+
+SENDER = 'noreply@dms.local'
+BASE_URL = 'dms.local'
+LEGACY_BODY = live_confirmation_body.replace('{{ base_url }}', '$url$').replace('{{ confirm_token }}', '$token$')
+
+
+def legacy(count):
+    messages = []
+    for i in range(count):
+        body = LEGACY_BODY.replace('$url$', BASE_URL).replace('$token$', str(i))
+        msg = MIMEText(body)
+        msg['Subject'] = live_confirmation_subject
+        msg['From'] = SENDER
+        msg['To'] = f"user{i}@load.local"
+        messages.append(msg.as_string())
+    return messages
+
+
+def compiled(count):
+    skeleton = MessageSkeleton(SENDER)
+    rendered = render_batch(LIVE_CONFIRMATION, [{"confirm_token": str(i)} for i in range(count)], base_url=BASE_URL)
+    return [
+        skeleton.build(f"user{i}@load.local", subject, body)
+        for i, (subject, body) in enumerate(rendered)
+    ]
+
+
+def render_only(count):
+    return render_batch(LIVE_CONFIRMATION, [{"confirm_token": str(i)} for i in range(count)], base_url=BASE_URL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=100000)
+    args = parser.parse_args()
+
+    for name, func in (('replace + MIMEText', legacy), ('render_batch + skeleton', compiled),
+                       ('render_batch only', render_only)):
+        started = time.perf_counter()
+        func(args.messages)
+        elapsed = time.perf_counter() - started
+        print(f"{name:<24}: {args.messages / elapsed:>10.0f} messages/s ({elapsed:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+dispatch_log 내보내기 벤치마크
+기존 방식(query.all() -> to_dict 리스트 -> JSON 한 덩어리)과 스트리밍 내보내기(iter_export)의
+첫 바이트까지 걸린 시간, 전체 시간, 최대 메모리(tracemalloc)를 비교합니다.
+임시 SQLite 파일 DB 를 사용하므로 MySQL 없이 실행됩니다.
+
+Usage:
+    python benchmarks/bench_export.py [--rows 200000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import select, text
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.dispatchlog import create_dispatchlog_model
+from utils.export import NDJSON, iter_export
+
+
+def setup(path, rows):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    db = SQLAlchemy(app)
+    DispatchLog = create_dispatchlog_model(db)
+    with app.app_context():
+        with db.engine.begin() as connection:
+            connection.execute(text("""
+                CREATE TABLE dispatch_log (
+                    id INTEGER PRIMARY KEY, will_id INTEGER NOT NULL, recipient_id INTEGER NOT NULL,
+                    sent_at DATETIME, delivered_at DATETIME, read_at DATETIME, status VARCHAR(9)
+                )
+            """))
+            connection.execute(
+                text("INSERT INTO dispatch_log (will_id, recipient_id, sent_at, status) "
+                     "VALUES (:will_id, :recipient_id, '2026-01-01 12:00:00', 'sent')"),
+                [{"will_id": i // 100, "recipient_id": i} for i in range(rows)]
+            )
+    return app, db, DispatchLog
+
+
+def measure(label, chunks):
+    tracemalloc.start()
+    started = time.perf_counter()
+    first = None
+    size = 0
+    for chunk in chunks():
+        if first is None:
+            first = time.perf_counter() - started
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<10} first byte {first * 1000:8.1f} ms  total {elapsed:6.2f} s  "
+          f"peak {peak / 1024 / 1024:7.1f} MB  {size / 1024 / 1024:6.1f} MB sent")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='dispatch_log export benchmark')
+    parser.add_argument('--rows', type=int, default=200000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        app, db, DispatchLog = setup(os.path.join(directory, 'bench.db'), args.rows)
+        with app.app_context():
+            def legacy():
+                logs = DispatchLog.query.all()
+                data = [log.to_dict() for log in logs]
+                yield json.dumps({'success': True, 'data': data, 'count': len(data)}).encode('utf-8')
+
+            def streaming():
+                table = DispatchLog.__table__
+                return iter_export(db.engine, select(table).order_by(table.c.id), NDJSON)
+
+            print(f"dispatch_log rows: {args.rows}")
+            measure('jsonify', legacy)
+            db.session.remove()
+            measure('streaming', streaming)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+스케줄러 다중 워커 처리량 벤치마크
+발송 시점이 지난 pending 트리거를 N개 생성한 뒤 워커 수를 바꿔가며
+전체 backlog 를 비우는 데(트리거 예약 -> 아웃박스 -> 발송) 걸린 시간과 중복 발송 여부를 측정합니다.
+
+실제 SMTP 대신 지정한 지연(--smtp-latency)만큼 sleep 하는 가짜 발송 함수를 사용하므로
+.env 에 설정된 (테스트용) DB 만 있으면 실행할 수 있습니다.
+
+Usage:
+    python benchmarks/bench_scheduler_workers.py [--triggers 2000] [--workers 1 2 4 8] [--smtp-latency 0.02]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from triggers import live_confirmation_trigger_scheduler as scheduler
+from triggers import email_outbox
+from triggers.worker_db import get_engine
+
+engine = get_engine()
+
+BENCH_PREFIX = 'bench_sched_'
+
+
+def seed(connection, count):
+    """벤치마크용 사용자/유언장/트리거 생성"""
+    users = [
+        {"user_id": f"{BENCH_PREFIX}{i}", "email": f"{BENCH_PREFIX}{i}@bench.local"}
+        for i in range(count)
+    ]
+    connection.execute(
+        text("INSERT INTO UserInfo (user_id, email, firstname, lastname) VALUES (:user_id, :email, 'Bench', 'User')"),
+        users
+    )
+    connection.execute(
+        text("INSERT INTO wills (user_id, subject, body) VALUES (:user_id, 'bench', 'bench')"),
+        users
+    )
+    connection.execute(
+        text("""
+            INSERT INTO triggers (user_id, trigger_type, trigger_date, due_at, status)
+            VALUES (:user_id, 'date', CURDATE() - INTERVAL 1 DAY, UTC_TIMESTAMP() - INTERVAL 1 HOUR, 'pending')
+        """),
+        users
+    )
+    connection.commit()
+
+
+def delete_dispatches(connection):
+    """벤치마크 유언장의 아웃박스/발송 로그 삭제"""
+    for table in ('email_outbox', 'dispatch_log'):
+        connection.execute(text(f"""
+            DELETE d FROM {table} d JOIN wills w ON d.will_id = w.id
+            WHERE w.user_id LIKE '{BENCH_PREFIX}%'
+        """))
+
+
+def reset(connection):
+    """트리거를 다시 pending 으로 돌리고 이전 실행의 아웃박스/발송 로그를 지운다"""
+    delete_dispatches(connection)
+    connection.execute(text(f"""
+        UPDATE triggers SET status='pending', claim_token=NULL, claim_expires_at=NULL
+        WHERE user_id LIKE '{BENCH_PREFIX}%'
+    """))
+    connection.commit()
+
+
+def cleanup(connection):
+    """벤치마크 데이터 삭제"""
+    delete_dispatches(connection)
+    for table in ('triggers', 'wills', 'UserInfo'):
+        connection.execute(text(f"DELETE FROM {table} WHERE user_id LIKE '{BENCH_PREFIX}%'"))
+    connection.commit()
+
+
+def count_dispatches(connection):
+    """(전체 발송 수, 중복 발송된 유언장 수)"""
+    total, duplicated = connection.execute(text(f"""
+        SELECT COALESCE(SUM(cnt), 0), COALESCE(SUM(cnt > 1), 0) FROM (
+            SELECT d.will_id, COUNT(*) AS cnt FROM dispatch_log d
+            JOIN wills w ON d.will_id = w.id
+            WHERE w.user_id LIKE '{BENCH_PREFIX}%'
+            GROUP BY d.will_id
+        ) per_will
+    """)).fetchone()
+    return int(total), int(duplicated)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--triggers', type=int, default=2000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--smtp-latency', type=float, default=0.02, help='가짜 SMTP 발송 지연(초)')
+    args = parser.parse_args()
+
+    def fake_send_group_email(to_emails, subject, body):
+        time.sleep(args.smtp_latency)
+        return {}
+
+    email_outbox.send_group_email = fake_send_group_email
+    scheduler.logger.setLevel('WARNING')
+
+    with engine.connect() as connection:
+        cleanup(connection)
+        seed(connection, args.triggers)
+    engine.dispose()
+
+    print(f"{'workers':>8} | {'seconds':>8} | {'emails/s':>9} | {'sent':>6} | {'dup':>4}")
+    try:
+        for workers in args.workers:
+            with engine.connect() as connection:
+                reset(connection)
+            engine.dispose()
+
+            started = time.perf_counter()
+            scheduler.main(['--workers', str(workers), '--once'])
+            elapsed = time.perf_counter() - started
+
+            with engine.connect() as connection:
+                sent, duplicated = count_dispatches(connection)
+            engine.dispose()
+            print(f"{workers:>8} | {elapsed:>8.2f} | {sent / elapsed:>9.1f} | {sent:>6} | {duplicated:>4}")
+    finally:
+        with engine.connect() as connection:
+            cleanup(connection)
+
+
+if __name__ == '__main__':
+    main()
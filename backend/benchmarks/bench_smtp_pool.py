@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+SMTP 커넥션 풀 처리량 벤치마크
+로컬 SMTP 싱크를 띄운 뒤 메시지마다 새 연결을 여는 기존 방식과
+SMTPConnectionPool 을 사용하는 방식의 초당 발송 수를 비교합니다.
+외부 메일 서버나 DB 없이 실행됩니다.
+
+Usage:
+    python benchmarks/bench_smtp_pool.py [--messages 2000] [--latency 0.001] [--pool-size 4]
+"""
+
+import argparse
+import os
+import smtplib
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.text import MIMEText
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.smtp_sink import SMTPSink
+from triggers.smtp_pool import SMTPConfig, SMTPConnectionPool
+
+SENDER = 'bench@dms.local'
+
+
+def build_message(i):
+    msg = MIMEText(f"benchmark message {i}")
+    msg['Subject'] = 'bench'
+    msg['From'] = SENDER
+    msg['To'] = f"user{i}@bench.local"
+    return msg.as_string()
+
+
+def send_with_new_connection(sink, count):
+    """기존 send_email 방식: 메시지마다 SMTP 연결 생성"""
+    for i in range(count):
+        with smtplib.SMTP(sink.host, sink.port) as server:
+            server.sendmail(SENDER, [f"user{i}@bench.local"], build_message(i))
+
+
+def send_with_pool(sink, count, pool_size, threads):
+    pool = SMTPConnectionPool(SMTPConfig(sink.host, sink.port, pool_size=pool_size))
+    try:
+        if threads <= 1:
+            for i in range(count):
+                pool.send(SENDER, [f"user{i}@bench.local"], build_message(i))
+        else:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                list(executor.map(lambda i: pool.send(SENDER, [f"user{i}@bench.local"], build_message(i)), range(count)))
+    finally:
+        pool.close()
+
+
+def run(label, sink, fn, count):
+    connections_before, messages_before = sink.connections, sink.messages
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} | {elapsed:>7.2f}s | {count / elapsed:>9.1f} msg/s | "
+          f"{sink.messages - messages_before:>6} msgs | {sink.connections - connections_before:>6} conns")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=2000)
+    parser.add_argument('--latency', type=float, default=0.001, help='싱크 응답 지연(초), 네트워크 RTT 흉내')
+    parser.add_argument('--pool-size', type=int, default=4)
+    args = parser.parse_args()
+
+    with SMTPSink(latency=args.latency) as sink:
+        run('new connection per message', sink, lambda: send_with_new_connection(sink, args.messages), args.messages)
+        run('pool, 1 thread', sink, lambda: send_with_pool(sink, args.messages, args.pool_size, 1), args.messages)
+        run(f'pool, {args.pool_size} threads', sink,
+            lambda: send_with_pool(sink, args.messages, args.pool_size, args.pool_size), args.messages)
+
+
+if __name__ == '__main__':
+    main()
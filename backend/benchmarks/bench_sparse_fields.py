@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+?fields= sparse fieldset 벤치마크
+본문 50KB 유언장 N 개가 있는 테이블에서 GET /api/wills 전체 필드와 ?fields=id,subject,created_at 의
+응답 크기와 지연 시간을 비교합니다. 임시 SQLite 파일 DB + Flask test client 로 실행되므로
+MySQL 과의 네트워크 전송량 차이는 응답 크기 비율로 가늠합니다.
+
+Usage:
+    python benchmarks/bench_sparse_fields.py [--wills 1000] [--body-kb 50] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.userinfo import create_userinfo_model
+from models.will import create_will_model
+from models.recipients import create_recipient_model
+from routes.will_routes import init_will_routes
+
+
+def create_app(path, wills, body_kb):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    db = SQLAlchemy(app)
+    UserInfo = create_userinfo_model(db)
+    Will = create_will_model(db)
+    Recipient = create_recipient_model(db)
+    app.register_blueprint(init_will_routes(db, Will, Recipient))
+    body = '유언' * (body_kb * 1024 // 6)  # 한글 2자 = UTF-8 6바이트
+    with app.app_context():
+        db.create_all()
+        db.session.add(UserInfo(user_id='bench'))
+        db.session.add_all([Will(user_id='bench', subject=f'will {i}', body=body) for i in range(wills)])
+        db.session.commit()
+    return app
+
+
+def measure(client, url, repeat):
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(url)
+        size = len(response.get_data())
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description='sparse fieldset benchmark')
+    parser.add_argument('--wills', type=int, default=1000)
+    parser.add_argument('--body-kb', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        client = create_app(os.path.join(directory, 'bench.db'), args.wills, args.body_kb).test_client()
+        print(f"wills: {args.wills}, body: {args.body_kb}KB")
+        for label, url in (
+            ('all fields', f'/api/wills?limit={args.wills}'),
+            ('fields=id,subject,created_at', f'/api/wills?limit={args.wills}&fields=id,subject,created_at'),
+        ):
+            latency, size = measure(client, url, args.repeat)
+            print(f"{label:<30} {latency * 1000:8.1f} ms  {size / 1024:10.1f} KB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+due 트리거 적재 메모리 벤치마크
+pending 트리거 수를 바꿔가며 DueTriggerTimer.load 의 최대 메모리(tracemalloc peak)를
+기존 방식(fetchall 로 전체 결과를 받은 뒤 전부 heap 에 적재)과 비교합니다.
+
+DB 대신 행을 하나씩 만들어 내는 가짜 커넥션을 사용하므로 DB 없이 실행됩니다.
+(server-side cursor 처럼 행을 필요할 때만 만들어 내고, fetchall 을 흉내낼 때만 리스트로 모은다)
+
+Usage:
+    python benchmarks/bench_timer_memory.py [--sizes 100 100000 1000000 5000000] [--capacity 10000]
+"""
+
+import argparse
+import heapq
+import itertools
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from triggers.due_trigger_timer import DueTriggerTimer
+
+BASE = datetime(2025, 1, 1)
+
+
+def pending_rows(count):
+    """due_at 순서의 pending 트리거 행 (id, due_at, updated_at) 을 하나씩 생성"""
+    for i in range(count):
+        due_at = BASE + timedelta(seconds=i)
+        yield (i + 1, due_at, due_at)
+
+
+class StreamingResult:
+    def __init__(self, rows):
+        self.rows = iter(rows)
+
+    def __iter__(self):
+        return self.rows
+
+    def fetchone(self):
+        return next(self.rows)
+
+
+class StreamingConnection:
+    """DueTriggerTimer 쿼리에 server-side cursor 처럼 행을 흘려보내는 가짜 커넥션"""
+
+    def __init__(self, count):
+        self.count = count
+
+    def execute(self, statement, params=None, execution_options=None):
+        sql = str(statement)
+        if 'SELECT NOW()' in sql:
+            return StreamingResult([(BASE, BASE)])
+        return StreamingResult(itertools.islice(pending_rows(self.count), params['capacity']))
+
+    def commit(self):
+        pass
+
+
+def load_all(count):
+    """기존 방식: 전체 pending 행을 fetchall 한 뒤 모두 heap 에 적재"""
+    rows = list(pending_rows(count))
+    due_by_id = {}
+    heap = []
+    for trigger_id, due_at, _ in rows:
+        due_by_id[trigger_id] = due_at
+        heap.append((due_at, trigger_id))
+    heapq.heapify(heap)
+    return due_by_id, heap
+
+
+def load_streaming(count, capacity):
+    timer = DueTriggerTimer(capacity=capacity)
+    timer.load(StreamingConnection(count))
+    return timer
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak / (1024 * 1024), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 100000, 1000000, 5000000])
+    parser.add_argument('--capacity', type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"{'pending':>10} | {'fetchall MB':>11} | {'fetchall s':>10} | {'stream MB':>9} | {'stream s':>8}")
+    for size in args.sizes:
+        all_mb, all_s = measure(load_all, size)
+        stream_mb, stream_s = measure(load_streaming, size, args.capacity)
+        print(f"{size:>10} | {all_mb:>11.1f} | {all_s:>10.2f} | {stream_mb:>9.1f} | {stream_s:>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
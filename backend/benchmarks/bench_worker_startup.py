@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+스케줄러 워커 기동 비용 벤치마크
+새 파이썬 프로세스에서 각 부트스트랩을 import 하는 데 걸린 시간과 최대 RSS 를 비교합니다.
+- web app   : 기존 방식 (from app.app import app, db — 블루프린트/로깅/SELECT 1 포함)
+- worker_db : 경량 부트스트랩 (.env/Config + SQLAlchemy 엔진만)
+- scheduler : 경량 부트스트랩을 쓰는 스케줄러 모듈 전체 (SMTP/아웃박스 포함)
+
+Usage:
+    python benchmarks/bench_worker_startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BOOTSTRAPS = {
+    'web app': 'from app.app import app, db',
+    'worker_db': 'from triggers.worker_db import get_engine; get_engine()',
+    'scheduler': 'from triggers import live_confirmation_trigger_scheduler as s; s.get_engine()',
+}
+
+CHILD_TEMPLATE = """
+import json, resource, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {backend!r})
+{statement}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                   "modules": len(sys.modules)}}))
+"""
+
+
+def measure(statement):
+    code = CHILD_TEMPLATE.format(backend=BACKEND_DIR, statement=statement)
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'bootstrap':>10} | {'import ms':>9} | {'max RSS MB':>10} | {'modules':>7}")
+    for name, statement in BOOTSTRAPS.items():
+        samples = [measure(statement) for _ in range(args.runs)]
+        seconds = statistics.median(sample['seconds'] for sample in samples)
+        rss_mb = statistics.median(sample['max_rss_kb'] for sample in samples) / 1024
+        print(f"{name:>10} | {seconds * 1000:>9.0f} | {rss_mb:>10.1f} | {samples[-1]['modules']:>7}")
+
+
+if __name__ == '__main__':
+    main()
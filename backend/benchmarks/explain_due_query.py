@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+스케줄러 due 트리거 조회 쿼리 실행 계획 비교
+기존 조건(trigger_date < CURDATE() OR is_triggered) 과 due_at 조건의 EXPLAIN 을 나란히 출력합니다.
+
+기존 쿼리는 OR 조건 때문에 idx_triggers_status 로 pending 행을 모두 읽고 나머지는
+행 단위로 거르지만 (type=ref, Extra: Using where; Using filesort),
+due_at 쿼리는 idx_triggers_status_due 하나로 range scan 후 정렬 없이 LIMIT 에서 멈춥니다
+(type=range, key=idx_triggers_status_due, Extra 에 filesort 없음).
+
+Usage:
+    python benchmarks/explain_due_query.py
+"""
+
+import os
+import sys
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+load_dotenv(os.path.join(BACKEND_DIR, '.env'))
+
+from config import Config
+
+QUERIES = {
+    'trigger_date (before)': """
+        SELECT id FROM triggers
+        WHERE status = 'pending'
+        AND (trigger_date < CURDATE() OR is_triggered = TRUE)
+        AND (claim_expires_at IS NULL OR claim_expires_at < NOW())
+        ORDER BY id
+        LIMIT 100
+    """,
+    'due_at (after)': """
+        SELECT id FROM triggers
+        WHERE status = 'pending'
+        AND due_at <= UTC_TIMESTAMP()
+        AND (claim_expires_at IS NULL OR claim_expires_at < NOW())
+        ORDER BY due_at
+        LIMIT 100
+    """,
+}
+
+COLUMNS = ('type', 'possible_keys', 'key', 'key_len', 'rows', 'filtered', 'Extra')
+
+
+def main():
+    engine = create_engine(Config.SQLALCHEMY_DATABASE_URI)
+    with engine.connect() as connection:
+        for name, sql in QUERIES.items():
+            result = connection.execute(text("EXPLAIN " + sql))
+            keys = list(result.keys())
+            print(f"\n== {name}")
+            for row in result.fetchall():
+                plan = dict(zip(keys, row))
+                for column in COLUMNS:
+                    print(f"  {column:>13}: {plan.get(column)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+스케줄러 부하 테스트 하네스
+합성 사용자/유언장/발송 시점이 지난 트리거 N개를 로컬 DB 에 만들고, 프로세스 안에서 띄운
+SMTP 싱크(메시지를 받아 세기만 함)로 실제 SMTP 경로(커넥션 풀 포함)를 거쳐 전체 backlog 를 비웁니다.
+외부 메일 서버 없이(.env 의 로컬/테스트 DB 만으로) 실행되며 다음을 보고합니다.
+- 트리거 처리량(triggers/s), 발송 처리량(emails/s)
+- DB 시간(트리거 예약/아웃박스 기록) 대 SMTP 시간
+- 메모리 최대 사용량(부모/워커 프로세스 max RSS)
+
+Usage:
+    python benchmarks/load_test_scheduler.py [--triggers 1000000] [--workers 4]
+                                             [--seed-chunk 10000] [--smtp-latency 0] [--keep] [--reuse]
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from benchmarks.smtp_sink import SMTPSink
+from triggers import live_confirmation_trigger_scheduler as scheduler
+from triggers import email_outbox
+from triggers import scheduler_metrics
+from triggers.smtp_pool import SMTPConfig
+from triggers.worker_db import get_engine
+
+LOAD_PREFIX = 'load_'
+DELETE_CHUNK = 50000
+
+
+def seed(connection, count, chunk_size):
+    """사용자/유언장/트리거를 chunk_size 행씩 multi-row INSERT 로 생성"""
+    started = time.perf_counter()
+    for offset in range(0, count, chunk_size):
+        users = [
+            {"user_id": f"{LOAD_PREFIX}{i}", "email": f"{LOAD_PREFIX}{i}@load.local"}
+            for i in range(offset, min(count, offset + chunk_size))
+        ]
+        connection.execute(
+            text("INSERT INTO UserInfo (user_id, email, firstname, lastname) VALUES (:user_id, :email, 'Load', 'User')"),
+            users
+        )
+        connection.execute(text("INSERT INTO wills (user_id, subject, body) VALUES (:user_id, 'load', 'load')"), users)
+        connection.execute(text("""
+            INSERT INTO triggers (user_id, trigger_type, trigger_date, due_at, status)
+            VALUES (:user_id, 'date', CURDATE() - INTERVAL 1 DAY, UTC_TIMESTAMP() - INTERVAL 1 HOUR, 'pending')
+        """), users)
+        connection.commit()
+        done = offset + len(users)
+        print(f"  seeded {done}/{count} ({done / (time.perf_counter() - started):.0f} rows/s)", end='\r')
+    print()
+
+
+def delete_in_chunks(connection, sql):
+    while connection.execute(text(sql + f" LIMIT {DELETE_CHUNK}")).rowcount:
+        connection.commit()
+    connection.commit()
+
+
+def delete_dispatches(connection):
+    """부하 테스트 유언장의 아웃박스/발송 로그 삭제"""
+    for table in ('email_outbox', 'dispatch_log'):
+        delete_in_chunks(connection, f"""
+            DELETE FROM {table} WHERE will_id IN (
+                SELECT id FROM (SELECT id FROM wills WHERE user_id LIKE '{LOAD_PREFIX}%') load_wills
+            )
+        """)
+
+
+def reset(connection):
+    """이전 실행 결과를 지우고 트리거를 다시 due 상태로 돌린다"""
+    delete_dispatches(connection)
+    connection.execute(text(f"""
+        UPDATE triggers SET status='pending', claim_token=NULL, claim_expires_at=NULL,
+            due_at = UTC_TIMESTAMP() - INTERVAL 1 HOUR
+        WHERE user_id LIKE '{LOAD_PREFIX}%'
+    """))
+    connection.commit()
+
+
+def cleanup(connection):
+    """부하 테스트 데이터 삭제"""
+    delete_dispatches(connection)
+    for table in ('triggers', 'wills', 'UserInfo'):
+        delete_in_chunks(connection, f"DELETE FROM {table} WHERE user_id LIKE '{LOAD_PREFIX}%'")
+
+
+def count_seeded(connection):
+    return connection.execute(text(f"SELECT COUNT(*) FROM triggers WHERE user_id LIKE '{LOAD_PREFIX}%'")).scalar()
+
+
+def histogram_sum(snapshot, key):
+    histogram = snapshot['histograms'].get(key)
+    return histogram['sum'] if histogram else 0.0
+
+
+def report(snapshot, sink, triggers, elapsed):
+    counters = snapshot['counters']
+    processed = counters.get('scheduler_triggers_processed_total', 0)
+    sent = counters.get('outbox_emails_total{status="sent"}', 0)
+    trigger_db = histogram_sum(snapshot, 'scheduler_cycle_seconds')
+    outbox_db = (histogram_sum(snapshot, 'outbox_db_seconds{stage="claim"}')
+                 + histogram_sum(snapshot, 'outbox_db_seconds{stage="record"}'))
+    smtp_wall = histogram_sum(snapshot, 'outbox_send_batch_seconds')
+    smtp_per_message = histogram_sum(snapshot, 'smtp_send_seconds')
+    parent_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+
+    print(f"\n== {triggers} triggers in {elapsed:.1f}s")
+    print(f"  triggers processed : {processed} ({processed / elapsed:.0f} triggers/s)")
+    print(f"  emails sent        : {sent} ({sent / elapsed:.0f} emails/s), sink received {sink.messages}"
+          f" over {sink.connections} connections")
+    print(f"  DB time            : {trigger_db + outbox_db:.1f}s (trigger claim/enqueue {trigger_db:.1f}s,"
+          f" outbox claim/record {outbox_db:.1f}s), summed over processes")
+    print(f"  SMTP time          : {smtp_wall:.1f}s batch wall ({smtp_per_message:.1f}s summed per message)")
+    print(f"  max RSS            : parent {parent_rss:.0f} MB, largest worker {child_rss:.0f} MB")
+    failures = {key: value for key, value in counters.items() if key.startswith(('smtp_failures_total', 'scheduler_errors_total'))}
+    if failures:
+        print(f"  failures           : {failures}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--triggers', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=4, help='트리거 워커 프로세스 수')
+    parser.add_argument('--seed-chunk', type=int, default=10000, help='INSERT 한 번에 넣을 행 수')
+    parser.add_argument('--smtp-latency', type=float, default=0.0, help='싱크 응답 지연(초, 원격 서버 왕복 흉내)')
+    parser.add_argument('--keep', action='store_true', help='끝난 뒤 데이터를 지우지 않음')
+    parser.add_argument('--reuse', action='store_true', help='이미 만든 데이터를 재사용 (seed 생략)')
+    args = parser.parse_args()
+
+    scheduler.logger.setLevel('WARNING')
+    email_outbox.logger.setLevel('WARNING')
+    scheduler_metrics.METRICS_DIR = tempfile.mkdtemp(prefix='dms-load-metrics-')
+    engine = get_engine()
+
+    with engine.connect() as connection:
+        if args.reuse and count_seeded(connection) >= args.triggers:
+            reset(connection)
+        else:
+            cleanup(connection)
+            seed(connection, args.triggers, args.seed_chunk)
+    engine.dispose()
+
+    with SMTPSink(latency=args.smtp_latency) as sink:
+        # fork 된 워커들도 이 설정으로 부모 프로세스의 싱크에 접속한다
+        email_outbox.SMTP_CONFIG = SMTPConfig(
+            host=sink.host, port=sink.port, user='load@dms.local', password=None, starttls=False,
+            pool_size=email_outbox.SMTP_CONFIG.pool_size,
+        )
+        email_outbox._smtp_pool = None
+
+        started = time.perf_counter()
+        # --once: 각 워커가 due 트리거를 아웃박스로 옮긴 뒤 아웃박스까지 비우고 종료
+        scheduler.main(['--workers', str(args.workers), '--once'])
+        elapsed = time.perf_counter() - started
+        report(scheduler_metrics.read_stats_files(stale_seconds=float('inf')), sink, args.triggers, elapsed)
+
+    if not args.keep:
+        with engine.connect() as connection:
+            cleanup(connection)
+
+
+if __name__ == '__main__':
+    main()
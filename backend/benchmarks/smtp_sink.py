@@ -0,0 +1,101 @@
+"""
+벤치마크용 로컬 SMTP 싱크
+메일을 실제로 전달하지 않고 받은 메시지/수신자 수만 센다.
+latency 를 주면 모든 응답 전에 지연을 넣어 원격 서버의 왕복 시간을 흉내낸다.
+refuse({주소: 응답 코드}) 를 주면 그 주소의 RCPT TO 를 거부한다.
+
+    with SMTPSink(latency=0.005) as sink:
+        ...  # localhost:sink.port 로 발송
+        print(sink.messages, sink.recipients, sink.connections)
+"""
+
+import socketserver
+import threading
+import time
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+
+    def reply(self, line):
+        if self.server.sink.latency:
+            time.sleep(self.server.sink.latency)
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        sink = self.server.sink
+        sink._count('connections')
+        self.reply('220 dms-bench-sink ESMTP')
+        recipients = 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', 'replace').strip().upper()
+            if command.startswith('EHLO'):
+                self.reply('250-dms-bench-sink\r\n250 8BITMIME')
+            elif command.startswith('HELO'):
+                self.reply('250 dms-bench-sink')
+            elif command.startswith('MAIL FROM'):
+                recipients = 0
+                self.reply('250 OK')
+            elif command.startswith('RCPT TO'):
+                address = command.partition('<')[2].partition('>')[0].lower()
+                code = sink.refuse.get(address)
+                if code:
+                    self.reply(f'{code} Recipient refused')
+                    continue
+                recipients += 1
+                self.reply('250 OK')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b'.\n', b''):
+                    pass
+                sink._count('messages')
+                sink._count('recipients', recipients)
+                self.reply('250 OK queued')
+            elif command in ('RSET', 'NOOP'):
+                self.reply('250 OK')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SMTPSink:
+    """백그라운드 스레드에서 동작하는 SMTP 싱크 서버"""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, refuse=None):
+        self.latency = latency
+        self.refuse = {address.lower(): code for address, code in (refuse or {}).items()}
+        self.connections = 0
+        self.messages = 0
+        self.recipients = 0
+        self._lock = threading.Lock()
+        self._server = _ThreadingServer((host, port), _SMTPHandler)
+        self._server.sink = self
+        self.host, self.port = self._server.server_address
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -5,6 +5,7 @@ CREATE DATABASE IF NOT EXISTS dmsdb CHARACTER SET utf8mb4 COLLATE utf8mb4_unicod
 USE dmsdb;
 
 -- 기존 테이블 삭제 (순서 중요: 외래키 관계 역순)
+DROP TABLE IF EXISTS email_outbox;
 DROP TABLE IF EXISTS dispatch_log;
 DROP TABLE IF EXISTS recipients;
 DROP TABLE IF EXISTS triggers;
@@ -21,7 +22,10 @@ CREATE TABLE UserInfo (
   grade VARCHAR(3),                    -- 멤버십 등급 (Pre/Gol/Sta)
   password_hash VARCHAR(255),
   DOB DATE,
-  created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  last_seen_at DATETIME DEFAULT CURRENT_TIMESTAMP,  -- 마지막 활동 시각 (inactivity 트리거 판단)
+  timezone VARCHAR(64),                -- IANA 시간대 (트리거 due_at 계산, 없으면 기본 시간대)
+  INDEX idx_userinfo_last_seen (last_seen_at)
 );
 
 -- 디지털 유언서 테이블
@@ -31,7 +35,8 @@ CREATE TABLE wills (
   subject VARCHAR(255),                -- 유언서 제목
   body TEXT,                          -- 유언서 본문
   created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-  lastmodified_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  lastmodified_at DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),  -- ETag 버전
+  released_at DATETIME NULL,           -- 수신자에게 공개(fan-out)된 시각
   FOREIGN KEY (user_id) REFERENCES UserInfo(user_id),
   INDEX idx_wills_user_id (user_id)
 );
@@ -58,23 +63,59 @@ CREATE TABLE triggers (
   status ENUM('pending', 'completed', 'failed') DEFAULT 'pending',
   description TEXT,
   created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  updated_at DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),  -- 변경 커서/ETag 버전
+  claim_token VARCHAR(36),             -- 스케줄러 워커 예약 토큰
+  claim_expires_at DATETIME,           -- 예약 만료 시각 (워커 장애 시 재처리)
+  due_at DATETIME,                     -- 발송 예정 시각 (UTC, 저장 시 계산)
   FOREIGN KEY (user_id) REFERENCES UserInfo(user_id),
   INDEX idx_triggers_user_id (user_id),
   INDEX idx_triggers_status (status),
   INDEX idx_triggers_date (trigger_date),
-  INDEX idx_triggers_created (created_at)
+  INDEX idx_triggers_created (created_at),
+  INDEX idx_triggers_claim_token (claim_token),
+  INDEX idx_triggers_updated (updated_at),
+  INDEX idx_triggers_status_due (status, due_at)
 );
 
 -- 발송 로그 테이블
 CREATE TABLE dispatch_log (
   id INT PRIMARY KEY AUTO_INCREMENT,
   will_id INT NOT NULL,
-  recipient_id INT NOT NULL,
+  recipient_id INT NULL,               -- live confirmation(유언장 주인에게 보낸 메일)은 NULL
   sent_at DATETIME,                    -- 실제 발송 시간
   delivered_at DATETIME,               -- 수신자 메일함 전달 시간
   read_at DATETIME,                    -- 수신자 읽음 확인 시간
   status ENUM('pending', 'sent', 'delivered', 'read', 'failed') DEFAULT 'pending',
+  type TINYINT NOT NULL,               -- 1: live confirmation, 2: 유언장 공개
+  confirm_token VARCHAR(64) NULL,      -- live confirmation 링크의 임의 토큰
   FOREIGN KEY (will_id) REFERENCES wills(id),
-  FOREIGN KEY (recipient_id) REFERENCES recipients(id)
-);
\ No newline at end of file
+  FOREIGN KEY (recipient_id) REFERENCES recipients(id),
+  UNIQUE INDEX uq_dispatch_log_will_recipient_type (will_id, recipient_id, type),
+  UNIQUE INDEX uq_dispatch_log_confirm_token (confirm_token)
+);
+
+-- 이메일 발송 아웃박스 테이블 (스케줄러가 기록, 발송 워커가 비움)
+CREATE TABLE email_outbox (
+  id BIGINT PRIMARY KEY AUTO_INCREMENT,
+  trigger_id INT NULL,                 -- 발송을 만든 트리거
+  will_id INT NOT NULL,
+  recipient_id INT NULL,
+  dispatch_log_id INT NULL,            -- will release 발송이면 미리 만든 dispatch_log 행
+  dispatch_type TINYINT NOT NULL DEFAULT 1,  -- dispatch_log.type 과 동일
+  priority TINYINT NOT NULL DEFAULT 3,  -- 레인 안 발송 순서 (유언장 주인 등급, 작을수록 먼저)
+  to_email VARCHAR(255) NOT NULL,
+  subject VARCHAR(255),
+  body MEDIUMTEXT,
+  status ENUM('pending', 'sending', 'sent', 'dead') NOT NULL DEFAULT 'pending',
+  attempts INT NOT NULL DEFAULT 0,
+  next_attempt_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,  -- 다음 시도 시각 / sending 상태의 visibility timeout
+  lock_token VARCHAR(36),              -- 발송 워커 예약 토큰
+  last_error VARCHAR(500),
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  sent_at DATETIME,
+  INDEX idx_outbox_status_next (status, next_attempt_at),
+  INDEX idx_outbox_lock_token (lock_token),
+  UNIQUE INDEX idx_outbox_dispatch_log (dispatch_log_id),
+  INDEX idx_outbox_type_status_sent (dispatch_type, status, sent_at),
+  INDEX idx_outbox_lane (dispatch_type, status, priority, next_attempt_at)
+);
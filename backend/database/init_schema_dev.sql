@@ -4,6 +4,7 @@ CREATE DATABASE IF NOT EXISTS dmsdb CHARACTER SET utf8mb4 COLLATE utf8mb4_unicod
 USE dmsdb;
 
 -- 기존 테이블 삭제 (순서 중요: 외래키 관계 역순)
+DROP TABLE IF EXISTS email_outbox;
 DROP TABLE IF EXISTS dispatch_log;
 DROP TABLE IF EXISTS recipients;
 DROP TABLE IF EXISTS triggers;
@@ -20,7 +21,10 @@ CREATE TABLE UserInfo (
   grade VARCHAR(3),
   password_hash VARCHAR(255),
   DOB DATE,
-  created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  last_seen_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  timezone VARCHAR(64),
+  INDEX idx_userinfo_last_seen (last_seen_at)
 );
 
 -- 디지털 유언서 테이블
@@ -30,7 +34,8 @@ CREATE TABLE wills (
   subject VARCHAR(255),
   body TEXT,
   created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-  lastmodified_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  lastmodified_at DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),  -- ETag 버전
+  released_at DATETIME NULL,
   FOREIGN KEY (user_id) REFERENCES UserInfo(user_id),
   INDEX idx_wills_user_id (user_id)
 );
@@ -57,12 +62,18 @@ CREATE TABLE triggers (
   status ENUM('pending', 'completed', 'failed') DEFAULT 'pending',
   description TEXT,
   created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-  updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  updated_at DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),  -- 변경 커서/ETag 버전
+  claim_token VARCHAR(36),
+  claim_expires_at DATETIME,
+  due_at DATETIME,
   FOREIGN KEY (user_id) REFERENCES UserInfo(user_id),
   INDEX idx_triggers_user_id (user_id),
   INDEX idx_triggers_status (status),
   INDEX idx_triggers_date (trigger_date),
-  INDEX idx_triggers_created (created_at)
+  INDEX idx_triggers_created (created_at),
+  INDEX idx_triggers_claim_token (claim_token),
+  INDEX idx_triggers_updated (updated_at),
+  INDEX idx_triggers_status_due (status, due_at)
 );
 
 -- 발송 로그 테이블
@@ -75,5 +86,34 @@ CREATE TABLE dispatch_log (
   read_at DATETIME,
   status ENUM('pending', 'sent', 'delivered', 'read', 'failed') DEFAULT 'pending',
   type TINYINT NOT NULL,
-  FOREIGN KEY (will_id) REFERENCES wills(id)
+  confirm_token VARCHAR(64) NULL,
+  FOREIGN KEY (will_id) REFERENCES wills(id),
+  UNIQUE INDEX uq_dispatch_log_will_recipient_type (will_id, recipient_id, type),
+  UNIQUE INDEX uq_dispatch_log_confirm_token (confirm_token)
+);
+
+-- 이메일 발송 아웃박스 테이블
+CREATE TABLE email_outbox (
+  id BIGINT PRIMARY KEY AUTO_INCREMENT,
+  trigger_id INT NULL,
+  will_id INT NOT NULL,
+  recipient_id INT NULL,
+  dispatch_log_id INT NULL,
+  dispatch_type TINYINT NOT NULL DEFAULT 1,
+  priority TINYINT NOT NULL DEFAULT 3,
+  to_email VARCHAR(255) NOT NULL,
+  subject VARCHAR(255),
+  body MEDIUMTEXT,
+  status ENUM('pending', 'sending', 'sent', 'dead') NOT NULL DEFAULT 'pending',
+  attempts INT NOT NULL DEFAULT 0,
+  next_attempt_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  lock_token VARCHAR(36),
+  last_error VARCHAR(500),
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  sent_at DATETIME,
+  INDEX idx_outbox_status_next (status, next_attempt_at),
+  INDEX idx_outbox_lock_token (lock_token),
+  UNIQUE INDEX idx_outbox_dispatch_log (dispatch_log_id),
+  INDEX idx_outbox_type_status_sent (dispatch_type, status, sent_at),
+  INDEX idx_outbox_lane (dispatch_type, status, priority, next_attempt_at)
 );
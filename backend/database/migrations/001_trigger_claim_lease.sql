@@ -0,0 +1,9 @@
+-- 기존 DB 마이그레이션: 스케줄러 다중 워커용 트리거 예약(claim) 컬럼 추가
+-- 워커는 claim_token 으로 트리거 배치를 예약하고, claim_expires_at 이 지나면
+-- 다른 워커가 다시 가져갈 수 있습니다 (워커 장애 대비 lease).
+USE dmsdb;
+
+ALTER TABLE triggers
+  ADD COLUMN claim_token VARCHAR(36) NULL AFTER updated_at,
+  ADD COLUMN claim_expires_at DATETIME NULL AFTER claim_token,
+  ADD INDEX idx_triggers_claim_token (claim_token);
@@ -0,0 +1,6 @@
+-- 기존 DB 마이그레이션: 스케줄러 변경 커서(updated_at) 조회용 인덱스
+-- DueTriggerTimer 가 몇 초마다 "updated_at >= 커서" 로 변경분만 읽습니다.
+USE dmsdb;
+
+ALTER TABLE triggers
+  ADD INDEX idx_triggers_updated (updated_at);
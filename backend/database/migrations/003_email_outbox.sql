@@ -0,0 +1,24 @@
+-- 기존 DB 마이그레이션: 이메일 발송 아웃박스 테이블 추가
+-- 스케줄러는 트리거 상태 전이와 같은 트랜잭션에서 email_outbox 에 기록하고,
+-- 발송 워커가 이 테이블을 비우며 SMTP 로 발송합니다.
+USE dmsdb;
+
+CREATE TABLE IF NOT EXISTS email_outbox (
+  id BIGINT PRIMARY KEY AUTO_INCREMENT,
+  trigger_id INT NULL,
+  will_id INT NOT NULL,
+  recipient_id INT NULL,
+  dispatch_type TINYINT NOT NULL DEFAULT 1,
+  to_email VARCHAR(255) NOT NULL,
+  subject VARCHAR(255),
+  body MEDIUMTEXT,
+  status ENUM('pending', 'sending', 'sent', 'dead') NOT NULL DEFAULT 'pending',
+  attempts INT NOT NULL DEFAULT 0,
+  next_attempt_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  lock_token VARCHAR(36),
+  last_error VARCHAR(500),
+  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+  sent_at DATETIME,
+  INDEX idx_outbox_status_next (status, next_attempt_at),
+  INDEX idx_outbox_lock_token (lock_token)
+);
@@ -0,0 +1,12 @@
+-- 기존 DB 마이그레이션: 사용자 마지막 활동 시각 추가 (inactivity 트리거 판단용)
+-- 인증된 요청이 ActivityTracker 를 통해 몇 초 단위로 모아 갱신합니다.
+USE dmsdb;
+
+ALTER TABLE UserInfo
+  ADD COLUMN last_seen_at DATETIME DEFAULT CURRENT_TIMESTAMP AFTER created_at;
+
+-- 기존 사용자는 가입 시각을 마지막 활동으로 간주
+UPDATE UserInfo SET last_seen_at = COALESCE(created_at, NOW());
+
+ALTER TABLE UserInfo
+  ADD INDEX idx_userinfo_last_seen (last_seen_at);
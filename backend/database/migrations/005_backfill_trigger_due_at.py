@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+005 마이그레이션 후속: 기존 트리거의 due_at(UTC) 을 청크 단위로 채웁니다.
+- id 키셋(id > 마지막 처리 id)으로 chunk-size 행씩 읽어 테이블 전체를 잠그지 않음
+- 청크마다 커밋하고 --pause 초 쉬어 복제 지연/운영 쿼리 영향을 줄임
+- 이미 due_at 이 있는 행은 건너뛰므로 중단 후 다시 실행해도 안전함
+- 웹 앱을 띄우지 않고 .env 의 DB 설정만으로 실행
+
+Usage:
+    python database/migrations/005_backfill_trigger_due_at.py [--chunk-size 1000] [--pause 0.1]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(BACKEND_DIR)
+load_dotenv(os.path.join(BACKEND_DIR, '.env'))
+
+from config import Config
+from utils.trigger_due import compute_due_at
+
+SELECT_CHUNK_SQL = text("""
+    SELECT t.id, t.trigger_date, t.is_triggered, u.timezone
+    FROM triggers t
+    LEFT JOIN UserInfo u ON u.user_id = t.user_id
+    WHERE t.id > :after AND t.due_at IS NULL
+    ORDER BY t.id
+    LIMIT :chunk_size
+""")
+
+# updated_at 은 그대로 두어 백필이 "변경" 으로 보이지 않게 함
+UPDATE_DUE_AT_SQL = text("UPDATE triggers SET due_at = :due_at, updated_at = updated_at WHERE id = :id")
+
+
+def backfill(engine, chunk_size, pause):
+    after, scanned, updated = 0, 0, 0
+    started = time.perf_counter()
+    while True:
+        with engine.connect() as connection:
+            rows = connection.execute(SELECT_CHUNK_SQL, {"after": after, "chunk_size": chunk_size}).fetchall()
+            if not rows:
+                break
+            params = []
+            for trigger_id, trigger_date, is_triggered, timezone_name in rows:
+                due_at = compute_due_at(trigger_date, is_triggered, timezone_name)
+                if due_at is not None:
+                    params.append({"id": trigger_id, "due_at": due_at})
+            if params:
+                connection.execute(UPDATE_DUE_AT_SQL, params)
+            connection.commit()
+
+        after = rows[-1][0]
+        scanned += len(rows)
+        updated += len(params)
+        print(f"  ~id {after}: scanned {scanned}, updated {updated} ({time.perf_counter() - started:.1f}s)")
+        if pause:
+            time.sleep(pause)
+    return scanned, updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--pause', type=float, default=0.1, help='청크 사이 대기(초)')
+    args = parser.parse_args()
+
+    engine = create_engine(Config.SQLALCHEMY_DATABASE_URI)
+    print("🔄 triggers.due_at 백필 시작")
+    scanned, updated = backfill(engine, args.chunk_size, args.pause)
+    print(f"✅ 완료: {scanned}행 확인, {updated}행 due_at 설정")
+
+
+if __name__ == '__main__':
+    main()
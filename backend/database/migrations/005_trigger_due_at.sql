@@ -0,0 +1,17 @@
+-- 기존 DB 마이그레이션: 트리거 발송 예정 시각(due_at, UTC) 및 사용자 시간대 추가
+-- 스케줄러가 "trigger_date < CURDATE() OR is_triggered" 대신
+-- (status, due_at) 인덱스 range scan 으로 due 트리거를 찾도록 합니다.
+--
+-- 적용 순서:
+--   1. 이 파일 실행 (컬럼/인덱스 추가, 온라인 DDL)
+--   2. python database/migrations/005_backfill_trigger_due_at.py  (기존 행 due_at 을 청크 단위로 채움)
+--   3. 스케줄러 재시작
+USE dmsdb;
+
+ALTER TABLE UserInfo
+  ADD COLUMN timezone VARCHAR(64) AFTER last_seen_at;
+
+ALTER TABLE triggers
+  ADD COLUMN due_at DATETIME AFTER claim_expires_at,
+  ADD INDEX idx_triggers_status_due (status, due_at),
+  ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,42 @@
+-- 기존 DB 마이그레이션: 유언장 공개(will release) fan-out
+-- live confirmation 에 응답하지 않은 사용자의 유언장을 수신자 전원에게 발송합니다.
+-- - wills.released_at: fan-out 시작 시각 (한 번만 공개)
+-- - email_outbox.dispatch_log_id: 미리 일괄 INSERT 한 dispatch_log 행 (발송 결과를 그 행에 기록)
+-- - 유니크 키: 동시에 fan-out 해도 수신자별 dispatch_log / 아웃박스 행은 하나만 (INSERT IGNORE)
+-- - dispatch_log.confirm_token: live confirmation 링크에 넣는 임의 토큰 (순차 id 로는 확인 처리 불가)
+--
+-- 유니크 키를 추가하기 전에 기존 dispatch_log 를 정리합니다 (이 순서를 바꾸면 ALTER 가 중복 키로 실패).
+--   1) live confirmation 기록의 recipient_id = 0 을 NULL 로 (NULL 은 유니크 키에서 제외)
+--   2) (will_id, recipient_id, type) 가 같은 행이 여러 개면 가장 먼저 기록된 MIN(id) 한 행만 남기고 삭제
+--      email_outbox.dispatch_log_id 는 이 마이그레이션에서 새로 생기므로 삭제된 행을 가리키는 참조는 없음
+-- 삭제될 행 수는 미리 아래 쿼리로 확인할 수 있습니다 (백업 후 실행 권장).
+--   SELECT COUNT(*) - COUNT(DISTINCT will_id, recipient_id, type) FROM dispatch_log
+--   WHERE recipient_id IS NOT NULL AND recipient_id <> 0;
+USE dmsdb;
+
+ALTER TABLE wills
+  ADD COLUMN released_at DATETIME NULL AFTER lastmodified_at;
+
+-- 기존 live confirmation 기록은 recipient_id = 0 으로 쌓여 있으므로 NULL 로 바꿔 유니크 키에서 제외
+UPDATE dispatch_log SET recipient_id = NULL WHERE recipient_id = 0;
+
+-- 중복 (will_id, recipient_id, type) 은 MIN(id) 만 남김
+DELETE d FROM dispatch_log d
+JOIN (
+  SELECT will_id, recipient_id, type, MIN(id) AS keep_id
+  FROM dispatch_log
+  WHERE recipient_id IS NOT NULL
+  GROUP BY will_id, recipient_id, type
+  HAVING COUNT(*) > 1
+) dup ON dup.will_id = d.will_id AND dup.recipient_id = d.recipient_id AND dup.type = d.type
+WHERE d.id <> dup.keep_id;
+
+ALTER TABLE dispatch_log
+  ADD COLUMN confirm_token VARCHAR(64) NULL AFTER type,
+  ADD UNIQUE INDEX uq_dispatch_log_will_recipient_type (will_id, recipient_id, type),
+  ADD UNIQUE INDEX uq_dispatch_log_confirm_token (confirm_token);
+
+ALTER TABLE email_outbox
+  ADD COLUMN dispatch_log_id INT NULL AFTER recipient_id,
+  ADD UNIQUE INDEX idx_outbox_dispatch_log (dispatch_log_id),
+  ADD INDEX idx_outbox_type_status_sent (dispatch_type, status, sent_at);
@@ -0,0 +1,8 @@
+-- 기존 DB 마이그레이션: 아웃박스 발송 레인/우선순위
+-- 레인(dispatch_type)별 발송 워커가 자기 레인만 가져가고,
+-- 레인 안에서는 유언장 주인 등급(Pre=0, Gol=1, Sta=2, 그 외 3) 순서로 발송합니다.
+USE dmsdb;
+
+ALTER TABLE email_outbox
+  ADD COLUMN priority TINYINT NOT NULL DEFAULT 3 AFTER dispatch_type,
+  ADD INDEX idx_outbox_lane (dispatch_type, status, priority, next_attempt_at);
@@ -0,0 +1,10 @@
+-- 기존 DB 마이그레이션: 조건부 GET(ETag/Last-Modified) 버전 컬럼 정밀도
+-- GET /api/wills/<id>, /api/triggers/<id> 는 lastmodified_at / updated_at 으로 강한 ETag 를 만듭니다.
+-- 초 단위면 같은 초 안의 두 번째 수정이 같은 ETag 가 되므로 마이크로초까지 저장합니다.
+USE dmsdb;
+
+ALTER TABLE wills
+  MODIFY COLUMN lastmodified_at DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
+
+ALTER TABLE triggers
+  MODIFY COLUMN updated_at DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6);
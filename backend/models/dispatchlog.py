@@ -6,11 +6,18 @@ def create_dispatchlog_model(db):
         __table_args__ = {'extend_existing': True}
         id = db.Column(db.Integer, primary_key=True)
         will_id = db.Column(db.Integer, db.ForeignKey('wills.id'), nullable=False)
-        recipient_id = db.Column(db.Integer, db.ForeignKey('recipients.id'), nullable=False)
+        recipient_id = db.Column(db.Integer, db.ForeignKey('recipients.id'))  # live confirmation 은 NULL
         sent_at = db.Column(db.DateTime)
         delivered_at = db.Column(db.DateTime)  # 수신자 메일함 전달 시간
         read_at = db.Column(db.DateTime)       # 수신자 읽음 확인 시간
         status = db.Column(db.Enum('pending', 'sent', 'delivered', 'read', 'failed'), default='pending')
+        confirm_token = db.Column(db.String(64), unique=True)  # live confirmation 링크 토큰 (응답에 노출하지 않음)
+
+        # to_dict 키 -> 컬럼 속성 (?fields= 로 일부만 조회할 때 사용)
+        FIELD_COLUMNS = {
+            'id': 'id', 'will_id': 'will_id', 'recipient_id': 'recipient_id', 'sent_at': 'sent_at',
+            'delivered_at': 'delivered_at', 'read_at': 'read_at', 'status': 'status'
+        }
         
         def to_dict(self):
             return {
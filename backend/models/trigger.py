@@ -1,3 +1,11 @@
+from sqlalchemy import FetchedValue, event, inspect
+
+from utils.trigger_due import compute_due_at, fetch_user_timezone
+
+# due_at 을 다시 계산해야 하는 컬럼
+DUE_AT_SOURCE_COLUMNS = ('user_id', 'trigger_date', 'is_triggered')
+
+
 def create_trigger_model(db):
     """Trigger 모델을 생성하는 팩토리 함수"""
     
@@ -14,6 +22,16 @@ def create_trigger_model(db):
         last_checked = db.Column(db.DateTime)
         is_triggered = db.Column(db.Boolean, default=False)
         status = db.Column(db.Enum('pending', 'completed', 'failed'), default='pending')  # 새로 추가된 필드
+        due_at = db.Column(db.DateTime)  # 발송 예정 시각 (UTC, 저장 시 자동 계산)
+        # DB 가 ON UPDATE CURRENT_TIMESTAMP 로 관리 (스케줄러 변경 커서와 같은 DB 시계, ETag 버전)
+        updated_at = db.Column(db.DateTime, server_default=db.func.now(), server_onupdate=FetchedValue())
+
+        # to_dict 키 -> 컬럼 속성 (?fields= 로 일부만 조회할 때 사용)
+        FIELD_COLUMNS = {
+            'trigger_id': 'id', 'user_id': 'user_id', 'trigger_type': 'trigger_type', 'trigger_date': 'trigger_date',
+            'trigger_value': 'trigger_value', 'description': 'description', 'last_checked': 'last_checked',
+            'is_triggered': 'is_triggered', 'status': 'status'
+        }
         
         def to_dict(self):
             return {
@@ -28,4 +46,17 @@ def create_trigger_model(db):
                 'status': self.status
             }
     
+    def set_due_at(mapper, connection, target):
+        """저장 시 사용자 시간대 기준 발송 예정 시각(UTC)을 계산"""
+        if target.due_at is not None and not any(
+            inspect(target).attrs[column].history.has_changes() for column in DUE_AT_SOURCE_COLUMNS
+        ):
+            return
+        target.due_at = compute_due_at(
+            target.trigger_date, target.is_triggered, fetch_user_timezone(connection, target.user_id)
+        )
+
+    event.listen(Trigger, 'before_insert', set_due_at)
+    event.listen(Trigger, 'before_update', set_due_at)
+
     return Trigger
@@ -12,6 +12,13 @@ def create_userinfo_model(db):
         password_hash = db.Column(db.String(255), nullable=True)  # 비밀번호 해시
         DOB = db.Column(db.Date, nullable=True)
         created_at = db.Column(db.DateTime, server_default=db.func.now())
+        timezone = db.Column(db.String(64), nullable=True)  # IANA 시간대 (예: Asia/Seoul), 트리거 due_at 계산용
+
+        # to_dict 키 -> 컬럼 속성 (?fields= 로 일부만 조회할 때 사용, password_hash 는 제외)
+        FIELD_COLUMNS = {
+            'id': 'id', 'user_id': 'user_id', 'lastname': 'lastname', 'firstname': 'firstname', 'email': 'email',
+            'grade': 'grade', 'DOB': 'DOB', 'created_at': 'created_at', 'timezone': 'timezone'
+        }
         
         def to_dict(self):
             return {
@@ -22,7 +29,8 @@ def create_userinfo_model(db):
                 'email': self.email,
                 'grade': self.grade,
                 'DOB': self.DOB.isoformat() if self.DOB else None,
-                'created_at': self.created_at.isoformat() if self.created_at else None
+                'created_at': self.created_at.isoformat() if self.created_at else None,
+                'timezone': self.timezone
             }
     
     return UserInfo
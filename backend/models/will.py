@@ -11,6 +11,13 @@ def create_will_model(db):
         body = db.Column(db.Text)
         created_at = db.Column(db.DateTime, default=datetime.utcnow)
         lastmodified_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+        released_at = db.Column(db.DateTime)  # 수신자에게 공개(fan-out)된 시각
+
+        # to_dict 키 -> 컬럼 속성 (?fields= 로 일부만 조회할 때 사용)
+        FIELD_COLUMNS = {
+            'id': 'id', 'user_id': 'user_id', 'subject': 'subject', 'body': 'body',
+            'created_at': 'created_at', 'lastmodified_at': 'lastmodified_at', 'released_at': 'released_at'
+        }
         
         def to_dict(self):
             return {
@@ -19,7 +26,8 @@ def create_will_model(db):
                 'subject': self.subject,
                 'body': self.body,
                 'created_at': self.created_at.isoformat() if self.created_at else None,
-                'lastmodified_at': self.lastmodified_at.isoformat() if self.lastmodified_at else None
+                'lastmodified_at': self.lastmodified_at.isoformat() if self.lastmodified_at else None,
+                'released_at': self.released_at.isoformat() if self.released_at else None
             }
     
     return Will
@@ -9,8 +9,8 @@ from datetime import datetime, timedelta
 import jwt
 from functools import wraps
 
-def init_auth_routes(db, UserInfo):
-    """인증 라우트 초기화"""
+def init_auth_routes(db, UserInfo, activity_tracker=None):
+    """인증 라우트 초기화 (activity_tracker 가 있으면 인증된 요청마다 last_seen_at 기록)"""
     auth_bp = Blueprint('auth', __name__)
     
     # JWT 시크릿 키 (환경변수에서 가져오거나 기본값 사용)
@@ -60,6 +60,10 @@ def init_auth_routes(db, UserInfo):
             if not user:
                 return jsonify({'success': False, 'message': '사용자를 찾을 수 없습니다'}), 401
             
+            # 활동 기록 (메모리 버퍼, DB 반영은 write-behind)
+            if activity_tracker:
+                activity_tracker.touch(user.user_id)
+            
             # 현재 사용자 정보를 함수에 전달
             return f(user, *args, **kwargs)
         return decorated
@@ -99,6 +103,9 @@ def init_auth_routes(db, UserInfo):
             # JWT 토큰 생성
             token = generate_token(user_id)
             
+            if activity_tracker:
+                activity_tracker.touch(user.user_id)
+            
             # 성공 응답
             return jsonify({
                 'success': True,
@@ -2,6 +2,10 @@ from flask import Blueprint, jsonify, request
 from datetime import datetime
 import logging
 
+from utils.export import ExportFormatError, export_response
+from utils.fields import FieldsError, parse_fields, to_dict, with_fields
+from utils.pagination import PaginationError, fetch_page, page_response, parse_page_request
+
 # DispatchLog 라우트 블루프린트 생성
 dispatchlog_bp = Blueprint('dispatchlog', __name__, url_prefix='/api/dispatch-logs')
 
@@ -15,14 +19,17 @@ def init_dispatchlog_routes(db, DispatchLog, Recipient=None):
     @dispatchlog_bp.route('', methods=['GET'])
     def get_all_dispatch_logs():
         try:
-            logs = DispatchLog.query.all()
-            logs_list = [log.to_dict() for log in logs]
-            logger.info(f"✅ 모든 발송 로그 조회 성공: {len(logs_list)}개")
+            page_request = parse_page_request(request.args)
+            fields = parse_fields(request.args, DispatchLog)
+            page = fetch_page(db, with_fields(DispatchLog.query, DispatchLog, fields), DispatchLog.id, page_request)
+            logs_list = [to_dict(log, fields) for log in page.items]
+            logger.info(f"✅ 모든 발송 로그 조회 성공: {len(logs_list)}개 (after={page_request.after}, limit={page.limit})")
+            return jsonify(page_response(page, logs_list)), 200
+        except (PaginationError, FieldsError) as e:
             return jsonify({
-                'success': True,
-                'data': logs_list,
-                'count': len(logs_list)
-            }), 200
+                'success': False,
+                'error': str(e)
+            }), 400
         except Exception as e:
             logger.error(f"❌ 발송 로그 조회 실패: {e}")
             return jsonify({
@@ -74,14 +81,20 @@ def init_dispatchlog_routes(db, DispatchLog, Recipient=None):
     @dispatchlog_bp.route('/recipient/<int:recipient_id>', methods=['GET'])
     def get_logs_by_recipient(recipient_id):
         try:
-            logs = DispatchLog.query.filter_by(recipient_id=recipient_id).all()
-            logs_list = [log.to_dict() for log in logs]
+            fields = parse_fields(request.args, DispatchLog)
+            logs = with_fields(DispatchLog.query, DispatchLog, fields).filter_by(recipient_id=recipient_id).all()
+            logs_list = [to_dict(log, fields) for log in logs]
             logger.info(f"✅ 수신자 ID {recipient_id}의 발송 로그 조회 성공: {len(logs_list)}개")
             return jsonify({
                 'success': True,
                 'data': logs_list,
                 'count': len(logs_list)
             }), 200
+        except FieldsError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         except Exception as e:
             logger.error(f"❌ 수신자 ID {recipient_id} 발송 로그 조회 실패: {e}")
             return jsonify({
@@ -93,7 +106,8 @@ def init_dispatchlog_routes(db, DispatchLog, Recipient=None):
     @dispatchlog_bp.route('/<int:log_id>', methods=['GET'])
     def get_dispatch_log(log_id):
         try:
-            log = DispatchLog.query.get(log_id)
+            fields = parse_fields(request.args, DispatchLog)
+            log = with_fields(DispatchLog.query, DispatchLog, fields).get(log_id)
             if not log:
                 logger.warning(f"⚠️ 발송 로그 ID {log_id} 찾을 수 없음")
                 return jsonify({
@@ -104,8 +118,13 @@ def init_dispatchlog_routes(db, DispatchLog, Recipient=None):
             logger.info(f"✅ 발송 로그 ID {log_id} 조회 성공")
             return jsonify({
                 'success': True,
-                'data': log.to_dict()
+                'data': to_dict(log, fields)
             }), 200
+        except FieldsError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         except Exception as e:
             logger.error(f"❌ 발송 로그 ID {log_id} 조회 실패: {e}")
             return jsonify({
@@ -266,4 +285,25 @@ def init_dispatchlog_routes(db, DispatchLog, Recipient=None):
                 'error': str(e)
             }), 500
 
+    # 8. GET /api/dispatch-logs/export - 발송 로그 전체 내보내기 (NDJSON/CSV 스트리밍, ?will_id= 로 유언장별)
+    @dispatchlog_bp.route('/export', methods=['GET'])
+    def export_dispatch_logs():
+        try:
+            will_id = request.args.get('will_id', type=int)
+            table = DispatchLog.__table__
+            where = table.c.will_id == will_id if will_id is not None else None
+            logger.info(f"📤 발송 로그 내보내기 시작 (will_id={will_id})")
+            return export_response(db.engine, table, request, where=where)
+        except ExportFormatError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 406
+        except Exception as e:
+            logger.error(f"❌ 발송 로그 내보내기 실패: {e}")
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+
     return dispatchlog_bp
\ No newline at end of file
@@ -1,16 +1,17 @@
 
 # 기존 라우트 패턴에 맞게 Blueprint factory 함수로 변경
 from flask import Blueprint
-from datetime import datetime
 
 def init_liveconfirmation_routes(db, DispatchLog):
     liveconfirmation_routes = Blueprint('liveconfirmation', __name__)
 
-    @liveconfirmation_routes.route('/auth/liveconfirmation/<int:dispatch_log_id>/', methods=['GET'])
-    def live_confirmation(dispatch_log_id):
-        dispatch_log = db.session.query(DispatchLog).filter_by(id=dispatch_log_id).first()
+    # 링크는 순차 id 가 아닌 발송마다 만든 임의 토큰(dispatch_log.confirm_token)으로 찾는다
+    @liveconfirmation_routes.route('/auth/liveconfirmation/<string:confirm_token>/', methods=['GET'])
+    def live_confirmation(confirm_token):
+        dispatch_log = db.session.query(DispatchLog).filter_by(confirm_token=confirm_token).first()
         if dispatch_log:
-            dispatch_log.read_at = datetime.utcnow()
+            # 발송 시각(sent_at)과 같은 DB 시계로 기록해야 유언장 공개 판정에서 비교할 수 있음
+            dispatch_log.read_at = db.func.now()
             dispatch_log.status = 'read'
             db.session.commit()
             return "인증이 완료되었습니다."
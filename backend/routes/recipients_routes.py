@@ -1,6 +1,10 @@
 from flask import Blueprint, jsonify, request
 import logging
 
+from utils.entity_cache import RECIPIENTS_BY_WILL, entity_cache
+from utils.export import ExportFormatError, export_response
+from utils.pagination import PaginationError, fetch_page, page_response, parse_page_request
+
 # Recipients 라우트 블루프린트 생성
 recipients_bp = Blueprint('recipients', __name__, url_prefix='/api/recipients')
 
@@ -14,14 +18,16 @@ def init_recipients_routes(db, Recipient):
     @recipients_bp.route('', methods=['GET'])
     def get_all_recipients():
         try:
-            recipients = Recipient.query.all()
-            recipients_list = [recipient.to_dict() for recipient in recipients]
-            logger.info(f"✅ 모든 수신자 조회 성공: {len(recipients_list)}명")
+            page_request = parse_page_request(request.args)
+            page = fetch_page(db, Recipient.query, Recipient.id, page_request)
+            recipients_list = [recipient.to_dict() for recipient in page.items]
+            logger.info(f"✅ 모든 수신자 조회 성공: {len(recipients_list)}명 (after={page_request.after}, limit={page.limit})")
+            return jsonify(page_response(page, recipients_list)), 200
+        except PaginationError as e:
             return jsonify({
-                'success': True,
-                'data': recipients_list,
-                'count': len(recipients_list)
-            }), 200
+                'success': False,
+                'error': str(e)
+            }), 400
         except Exception as e:
             logger.error(f"❌ 수신자 조회 실패: {e}")
             return jsonify({
@@ -33,8 +39,12 @@ def init_recipients_routes(db, Recipient):
     @recipients_bp.route('/will/<int:will_id>', methods=['GET'])
     def get_recipients_by_will(will_id):
         try:
-            recipients = Recipient.query.filter_by(will_id=will_id).all()
-            recipients_list = [recipient.to_dict() for recipient in recipients]
+            generation = entity_cache.generation
+            recipients_list = entity_cache.get(RECIPIENTS_BY_WILL, will_id)
+            if recipients_list is None:
+                recipients = Recipient.query.filter_by(will_id=will_id).all()
+                recipients_list = [recipient.to_dict() for recipient in recipients]
+                entity_cache.set(RECIPIENTS_BY_WILL, will_id, recipients_list, generation)
             logger.info(f"✅ 유언장 ID {will_id}의 수신자 조회 성공: {len(recipients_list)}명")
             return jsonify({
                 'success': True,
@@ -101,6 +111,7 @@ def init_recipients_routes(db, Recipient):
             
             db.session.add(new_recipient)
             db.session.commit()
+            entity_cache.invalidate(RECIPIENTS_BY_WILL, new_recipient.will_id)
             
             logger.info(f"✅ 신규 수신자 생성 성공: ID {new_recipient.id}")
             return jsonify({
@@ -136,6 +147,7 @@ def init_recipients_routes(db, Recipient):
                 }), 400
             
             # 데이터 업데이트
+            previous_will_id = recipient.will_id
             if 'will_id' in data:
                 recipient.will_id = data['will_id']
             if 'recipient_email' in data:
@@ -146,6 +158,7 @@ def init_recipients_routes(db, Recipient):
                 recipient.relatedCode = data['relatedCode']
             
             db.session.commit()
+            entity_cache.invalidate(RECIPIENTS_BY_WILL, previous_will_id, recipient.will_id)
             
             logger.info(f"✅ 수신자 ID {recipient_id} 업데이트 성공")
             return jsonify({
@@ -173,8 +186,10 @@ def init_recipients_routes(db, Recipient):
                     'error': 'Recipient not found'
                 }), 404
             
+            will_id = recipient.will_id
             db.session.delete(recipient)
             db.session.commit()
+            entity_cache.invalidate(RECIPIENTS_BY_WILL, will_id)
             
             logger.info(f"✅ 수신자 ID {recipient_id} 삭제 성공")
             return jsonify({
@@ -190,4 +205,25 @@ def init_recipients_routes(db, Recipient):
                 'error': str(e)
             }), 500
 
+    # 7. GET /api/recipients/export - 수신자 전체 내보내기 (NDJSON/CSV 스트리밍, ?will_id= 로 유언장별)
+    @recipients_bp.route('/export', methods=['GET'])
+    def export_recipients():
+        try:
+            will_id = request.args.get('will_id', type=int)
+            table = Recipient.__table__
+            where = table.c.will_id == will_id if will_id is not None else None
+            logger.info(f"📤 수신자 내보내기 시작 (will_id={will_id})")
+            return export_response(db.engine, table, request, where=where)
+        except ExportFormatError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 406
+        except Exception as e:
+            logger.error(f"❌ 수신자 내보내기 실패: {e}")
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+
     return recipients_bp
\ No newline at end of file
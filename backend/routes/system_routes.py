@@ -4,6 +4,8 @@ import logging
 import subprocess
 from datetime import datetime
 
+from utils.entity_cache import entity_cache
+
 # 로거 설정
 logger = logging.getLogger(__name__)
 
@@ -41,6 +43,14 @@ def init_system_routes(db):
         
         return jsonify(response)
     
+    @system_bp.route('/api/system/cache', methods=['GET'])
+    def cache_stats():
+        """엔티티 캐시 상태 (이 프로세스 기준 hit/miss, 항목 수, 바이트)"""
+        return jsonify({
+            'success': True,
+            'data': entity_cache.stats()
+        })
+    
     @system_bp.route('/api/docs', methods=['GET'])
     def api_docs():
         """API 문서 페이지 서빙"""
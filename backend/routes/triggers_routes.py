@@ -2,6 +2,11 @@ from flask import Blueprint, jsonify, request
 from datetime import datetime
 import logging
 
+from utils.conditional import is_not_modified, not_modified_response, set_validators, version_etag
+from utils.entity_cache import TRIGGERS_BY_USER, entity_cache
+from utils.fields import FieldsError, parse_fields, project, to_dict, with_fields
+from utils.pagination import PaginationError, fetch_page, page_response, parse_page_request
+
 # Triggers 라우트 블루프린트 생성
 triggers_bp = Blueprint('triggers', __name__, url_prefix='/api/triggers')
 
@@ -15,14 +20,17 @@ def init_triggers_routes(db, Trigger):
     @triggers_bp.route('', methods=['GET'])
     def get_all_triggers():
         try:
-            triggers = Trigger.query.all()
-            triggers_list = [trigger.to_dict() for trigger in triggers]
-            logger.info(f"✅ 모든 트리거 조회 성공: {len(triggers_list)}개")
+            page_request = parse_page_request(request.args)
+            fields = parse_fields(request.args, Trigger)
+            page = fetch_page(db, with_fields(Trigger.query, Trigger, fields), Trigger.id, page_request)
+            triggers_list = [to_dict(trigger, fields) for trigger in page.items]
+            logger.info(f"✅ 모든 트리거 조회 성공: {len(triggers_list)}개 (after={page_request.after}, limit={page.limit})")
+            return jsonify(page_response(page, triggers_list)), 200
+        except (PaginationError, FieldsError) as e:
             return jsonify({
-                'success': True,
-                'data': triggers_list,
-                'count': len(triggers_list)
-            }), 200
+                'success': False,
+                'error': str(e)
+            }), 400
         except Exception as e:
             logger.error(f"❌ 트리거 조회 실패: {e}")
             return jsonify({
@@ -34,14 +42,28 @@ def init_triggers_routes(db, Trigger):
     @triggers_bp.route('/user/<user_id>', methods=['GET'])
     def get_triggers_by_user(user_id):
         try:
-            triggers = Trigger.query.filter_by(user_id=user_id).order_by(Trigger.trigger_date.desc()).all()
-            triggers_list = [trigger.to_dict() for trigger in triggers]
+            fields = parse_fields(request.args, Trigger)
+            generation = entity_cache.generation
+            triggers_list = entity_cache.get(TRIGGERS_BY_USER, user_id)
+            if triggers_list is not None:
+                triggers_list = [project(trigger, fields) for trigger in triggers_list]
+            else:
+                triggers = with_fields(Trigger.query, Trigger, fields)\
+                    .filter_by(user_id=user_id).order_by(Trigger.trigger_date.desc()).all()
+                triggers_list = [to_dict(trigger, fields) for trigger in triggers]
+                if fields is None:
+                    entity_cache.set(TRIGGERS_BY_USER, user_id, triggers_list, generation)
             logger.info(f"✅ 사용자 ID {user_id}의 트리거 조회 성공: {len(triggers_list)}개")
             return jsonify({
                 'success': True,
                 'data': triggers_list,
                 'count': len(triggers_list)
             }), 200
+        except FieldsError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         except Exception as e:
             logger.error(f"❌ 사용자 ID {user_id} 트리거 조회 실패: {e}")
             return jsonify({
@@ -79,7 +101,17 @@ def init_triggers_routes(db, Trigger):
     @triggers_bp.route('/<int:trigger_id>', methods=['GET'])
     def get_trigger(trigger_id):
         try:
-            trigger = Trigger.query.get(trigger_id)
+            fields = parse_fields(request.args, Trigger)
+            # 수정 시각만 먼저 조회해 클라이언트 사본이 최신이면 행을 읽지 않고 304
+            version = db.session.query(Trigger.updated_at).filter(Trigger.id == trigger_id).first()
+            trigger = None
+            if version is not None:
+                modified_at = version.updated_at
+                etag = version_etag('trigger', trigger_id, modified_at, fields)
+                if is_not_modified(request, etag, modified_at):
+                    logger.info(f"✅ 트리거 ID {trigger_id} 변경 없음 (304)")
+                    return not_modified_response(etag, modified_at)
+                trigger = with_fields(Trigger.query, Trigger, fields).get(trigger_id)
             if not trigger:
                 logger.warning(f"⚠️ 트리거 ID {trigger_id} 찾을 수 없음")
                 return jsonify({
@@ -88,10 +120,15 @@ def init_triggers_routes(db, Trigger):
                 }), 404
             
             logger.info(f"✅ 트리거 ID {trigger_id} 조회 성공")
-            return jsonify({
+            return set_validators(jsonify({
                 'success': True,
-                'data': trigger.to_dict()
-            }), 200
+                'data': to_dict(trigger, fields)
+            }), etag, modified_at), 200
+        except FieldsError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         except Exception as e:
             logger.error(f"❌ 트리거 ID {trigger_id} 조회 실패: {e}")
             return jsonify({
@@ -178,6 +215,7 @@ def init_triggers_routes(db, Trigger):
             
             db.session.add(new_trigger)
             db.session.commit()
+            entity_cache.invalidate(TRIGGERS_BY_USER, new_trigger.user_id)
             
             logger.info(f"✅ 신규 트리거 생성 성공: ID {new_trigger.id}")
             return jsonify({
@@ -213,6 +251,7 @@ def init_triggers_routes(db, Trigger):
                 }), 400
             
             # 데이터 업데이트
+            previous_user_id = trigger.user_id
             if 'user_id' in data:
                 trigger.user_id = data['user_id']
             if 'trigger_type' in data:
@@ -240,6 +279,7 @@ def init_triggers_routes(db, Trigger):
                 trigger.is_triggered = data['is_triggered']
             
             db.session.commit()
+            entity_cache.invalidate(TRIGGERS_BY_USER, previous_user_id, trigger.user_id)
             
             logger.info(f"✅ 트리거 ID {trigger_id} 업데이트 성공")
             return jsonify({
@@ -267,8 +307,10 @@ def init_triggers_routes(db, Trigger):
                     'error': 'Trigger not found'
                 }), 404
             
+            user_id = trigger.user_id
             db.session.delete(trigger)
             db.session.commit()
+            entity_cache.invalidate(TRIGGERS_BY_USER, user_id)
             
             logger.info(f"✅ 트리거 ID {trigger_id} 삭제 성공")
             return jsonify({
@@ -2,6 +2,12 @@ from flask import Blueprint, jsonify, request
 from datetime import datetime
 import logging
 
+from utils.conditional import content_etag_response
+from utils.entity_cache import TRIGGERS_BY_USER, USER, entity_cache
+from utils.fields import FieldsError, parse_fields, project, to_dict, with_fields
+from utils.pagination import PaginationError, fetch_page, page_response, parse_page_request
+from utils.trigger_due import is_valid_timezone, reschedule_user_triggers
+
 # UserInfo 라우트 블루프린트 생성
 userinfo_bp = Blueprint('userinfo', __name__, url_prefix='/api/users')
 
@@ -15,14 +21,17 @@ def init_userinfo_routes(db, UserInfo):
     @userinfo_bp.route('', methods=['GET'])
     def get_all_users():
         try:
-            users = UserInfo.query.all()
-            users_list = [user.to_dict() for user in users]
-            logger.info(f"✅ 모든 사용자 조회 성공: {len(users_list)}명")
+            page_request = parse_page_request(request.args)
+            fields = parse_fields(request.args, UserInfo)
+            page = fetch_page(db, with_fields(UserInfo.query, UserInfo, fields), UserInfo.id, page_request)
+            users_list = [to_dict(user, fields) for user in page.items]
+            logger.info(f"✅ 모든 사용자 조회 성공: {len(users_list)}명 (after={page_request.after}, limit={page.limit})")
+            return jsonify(page_response(page, users_list)), 200
+        except (PaginationError, FieldsError) as e:
             return jsonify({
-                'success': True,
-                'data': users_list,
-                'count': len(users_list)
-            }), 200
+                'success': False,
+                'error': str(e)
+            }), 400
         except Exception as e:
             logger.error(f"❌ 사용자 조회 실패: {e}")
             return jsonify({
@@ -34,19 +43,34 @@ def init_userinfo_routes(db, UserInfo):
     @userinfo_bp.route('/<string:user_id>', methods=['GET'])
     def get_user(user_id):
         try:
-            user = UserInfo.query.filter_by(user_id=user_id).first()
-            if not user:
-                logger.warning(f"⚠️ 사용자 ID {user_id} 찾을 수 없음")
-                return jsonify({
-                    'success': False,
-                    'error': 'User not found'
-                }), 404
+            fields = parse_fields(request.args, UserInfo)
+            generation = entity_cache.generation
+            data = entity_cache.get(USER, user_id)
+            if data is not None:
+                data = project(data, fields)
+            else:
+                user = with_fields(UserInfo.query, UserInfo, fields).filter_by(user_id=user_id).first()
+                if not user:
+                    logger.warning(f"⚠️ 사용자 ID {user_id} 찾을 수 없음")
+                    return jsonify({
+                        'success': False,
+                        'error': 'User not found'
+                    }), 404
+                data = to_dict(user, fields)
+                if fields is None:
+                    entity_cache.set(USER, user_id, data, generation)
             
             logger.info(f"✅ 사용자 ID {user_id} 조회 성공")
-            return jsonify({
+            # UserInfo 에는 수정 시각 컬럼이 없어 본문 해시로 ETag 를 만든다
+            return content_etag_response(request, jsonify({
                 'success': True,
-                'data': user.to_dict()
-            }), 200
+                'data': data
+            }))
+        except FieldsError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         except Exception as e:
             logger.error(f"❌ 사용자 ID {user_id} 조회 실패: {e}")
             return jsonify({
@@ -77,6 +101,12 @@ def init_userinfo_routes(db, UserInfo):
                         'success': False,
                         'error': 'Invalid date format. Use YYYY-MM-DD'
                     }), 400
+
+            if data.get('timezone') and not is_valid_timezone(data['timezone']):
+                return jsonify({
+                    'success': False,
+                    'error': 'Invalid timezone. Use an IANA name like Asia/Seoul'
+                }), 400
             
             # 새 사용자 생성
             new_user = UserInfo(
@@ -85,7 +115,8 @@ def init_userinfo_routes(db, UserInfo):
                 firstname=data.get('firstname'),
                 email=data.get('email'),
                 grade=data.get('grade'),
-                DOB=dob
+                DOB=dob,
+                timezone=data.get('timezone')
             )
             
             db.session.add(new_user)
@@ -144,8 +175,18 @@ def init_userinfo_routes(db, UserInfo):
                         }), 400
                 else:
                     user.DOB = None
+            if 'timezone' in data and data['timezone'] != user.timezone:
+                if data['timezone'] and not is_valid_timezone(data['timezone']):
+                    return jsonify({
+                        'success': False,
+                        'error': 'Invalid timezone. Use an IANA name like Asia/Seoul'
+                    }), 400
+                user.timezone = data['timezone']
+                # 시간대가 바뀌면 pending 트리거의 발송 예정 시각(UTC)도 다시 계산
+                reschedule_user_triggers(db.session.connection(), user.user_id, user.timezone)
             
             db.session.commit()
+            entity_cache.invalidate(USER, user.user_id)
             
             logger.info(f"✅ 사용자 ID {user_id} 업데이트 성공")
             return jsonify({
@@ -175,6 +216,8 @@ def init_userinfo_routes(db, UserInfo):
             
             db.session.delete(user)
             db.session.commit()
+            entity_cache.invalidate(USER, user.user_id)
+            entity_cache.invalidate(TRIGGERS_BY_USER, user.user_id)
             
             logger.info(f"✅ 사용자 ID {user_id} 삭제 성공")
             return jsonify({
@@ -2,6 +2,11 @@ from flask import Blueprint, jsonify, request
 from datetime import datetime
 import logging
 
+from utils.conditional import is_not_modified, not_modified_response, set_validators, version_etag
+from utils.entity_cache import RECIPIENTS_BY_WILL, WILL, entity_cache
+from utils.fields import FieldsError, parse_fields, project, to_dict, with_fields
+from utils.pagination import PaginationError, fetch_page, page_response, parse_page_request
+
 # Will 라우트 블루프린트 생성
 will_bp = Blueprint('will', __name__, url_prefix='/api/wills')
 
@@ -11,18 +16,25 @@ logger = logging.getLogger(__name__)
 def init_will_routes(db, Will, Recipient):
     """Will 라우트를 초기화하고 모델을 주입"""
     
-    # 1. GET /api/wills - 모든 유언장 조회
+    # 1. GET /api/wills - 모든 유언장 조회 (?user_id= 로 특정 사용자만)
     @will_bp.route('', methods=['GET'])
     def get_all_wills():
         try:
-            wills = Will.query.all()
-            wills_list = [will.to_dict() for will in wills]
-            logger.info(f"✅ 모든 유언장 조회 성공: {len(wills_list)}개")
+            page_request = parse_page_request(request.args)
+            fields = parse_fields(request.args, Will)
+            query = with_fields(Will.query, Will, fields)
+            user_id = request.args.get('user_id')
+            if user_id:
+                query = query.filter_by(user_id=user_id)
+            page = fetch_page(db, query, Will.id, page_request, filtered=bool(user_id))
+            wills_list = [to_dict(will, fields) for will in page.items]
+            logger.info(f"✅ 모든 유언장 조회 성공: {len(wills_list)}개 (after={page_request.after}, limit={page.limit})")
+            return jsonify(page_response(page, wills_list)), 200
+        except (PaginationError, FieldsError) as e:
             return jsonify({
-                'success': True,
-                'data': wills_list,
-                'count': len(wills_list)
-            }), 200
+                'success': False,
+                'error': str(e)
+            }), 400
         except Exception as e:
             logger.error(f"❌ 유언장 조회 실패: {e}")
             return jsonify({
@@ -34,19 +46,49 @@ def init_will_routes(db, Will, Recipient):
     @will_bp.route('/<int:will_id>', methods=['GET'])
     def get_will(will_id):
         try:
-            will = Will.query.get(will_id)
-            if not will:
+            fields = parse_fields(request.args, Will)
+            generation = entity_cache.generation
+            data = None
+            cached = entity_cache.get(WILL, will_id)
+            if cached is not None:
+                modified_at, data = cached
+                found = True
+            else:
+                # 수정 시각만 먼저 조회해 클라이언트 사본이 최신이면 행을 읽지 않고 304
+                version = db.session.query(Will.lastmodified_at).filter(Will.id == will_id).first()
+                found = version is not None
+                modified_at = version.lastmodified_at if found else None
+            if found:
+                etag = version_etag('will', will_id, modified_at, fields)
+                if is_not_modified(request, etag, modified_at):
+                    logger.info(f"✅ 유언장 ID {will_id} 변경 없음 (304)")
+                    return not_modified_response(etag, modified_at)
+                if data is not None:
+                    data = project(data, fields)
+                else:
+                    will = with_fields(Will.query, Will, fields).get(will_id)
+                    found = will is not None
+                    if found:
+                        data = to_dict(will, fields)
+                        if fields is None:
+                            entity_cache.set(WILL, will_id, (will.lastmodified_at, data), generation)
+            if not found:
                 logger.warning(f"⚠️ 유언장 ID {will_id} 찾을 수 없음")
                 return jsonify({
                     'success': False,
                     'error': 'Will not found'
                 }), 404
-            
+
             logger.info(f"✅ 유언장 ID {will_id} 조회 성공")
-            return jsonify({
+            return set_validators(jsonify({
                 'success': True,
-                'data': will.to_dict()
-            }), 200
+                'data': data
+            }), etag, modified_at), 200
+        except FieldsError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         except Exception as e:
             logger.error(f"❌ 유언장 ID {will_id} 조회 실패: {e}")
             return jsonify({
@@ -101,6 +143,7 @@ def init_will_routes(db, Will, Recipient):
                         created_recipients.append(new_recipient)
             
             db.session.commit()
+            entity_cache.invalidate(RECIPIENTS_BY_WILL, new_will.id)
             
             logger.info(f"✅ 신규 유언장 생성 성공: ID {new_will.id}, Recipients: {len(created_recipients)}명")
             
@@ -127,8 +170,9 @@ def init_will_routes(db, Will, Recipient):
     @will_bp.route('/user/<int:user_id>', methods=['GET'])
     def get_wills_by_user(user_id):
         try:
-            wills = Will.query.filter_by(user_id=user_id).all()
-            wills_list = [will.to_dict() for will in wills]
+            fields = parse_fields(request.args, Will)
+            wills = with_fields(Will.query, Will, fields).filter_by(user_id=user_id).all()
+            wills_list = [to_dict(will, fields) for will in wills]
             
             logger.info(f"✅ 사용자 ID {user_id}의 유언장 조회 성공: {len(wills_list)}개")
             return jsonify({
@@ -137,6 +181,11 @@ def init_will_routes(db, Will, Recipient):
                 'count': len(wills_list),
                 'user_id': user_id
             }), 200
+        except FieldsError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         except Exception as e:
             logger.error(f"❌ 사용자 ID {user_id}의 유언장 조회 실패: {e}")
             return jsonify({
@@ -174,6 +223,7 @@ def init_will_routes(db, Will, Recipient):
             will.lastmodified_at = datetime.utcnow()
             
             db.session.commit()
+            entity_cache.invalidate(WILL, will_id)
             
             logger.info(f"✅ 유언장 ID {will_id} 업데이트 성공")
             return jsonify({
@@ -203,6 +253,8 @@ def init_will_routes(db, Will, Recipient):
             
             db.session.delete(will)
             db.session.commit()
+            entity_cache.invalidate(WILL, will_id)
+            entity_cache.invalidate(RECIPIENTS_BY_WILL, will_id)
             
             logger.info(f"✅ 유언장 ID {will_id} 삭제 성공")
             return jsonify({
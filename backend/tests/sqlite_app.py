@@ -0,0 +1,90 @@
+"""
+SQLite 메모리 DB 위에 실제 모델/라우트를 올린 테스트 앱 (MySQL 없이 라우트 로직 검증용)
+라우트 블루프린트는 모듈 전역이라 프로세스당 한 번만 초기화할 수 있으므로 get_app() 으로 공유한다.
+"""
+
+import os
+import sys
+from datetime import date, datetime
+from functools import lru_cache
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.userinfo import create_userinfo_model
+from models.will import create_will_model
+from models.recipients import create_recipient_model
+from models.trigger import create_trigger_model
+from models.dispatchlog import create_dispatchlog_model
+from routes.userinfo_routes import init_userinfo_routes
+from routes.will_routes import init_will_routes
+from routes.recipients_routes import init_recipients_routes
+from routes.triggers_routes import init_triggers_routes
+from routes.dispatchlog_routes import init_dispatchlog_routes
+from routes.system_routes import init_system_routes
+from routes.liveconfirmation_routes import init_liveconfirmation_routes
+
+RECIPIENT_COUNT = 25
+DISPATCH_LOG_COUNT = 30
+
+
+class SQLiteApp:
+    """앱, db, 모델 묶음"""
+
+    def __init__(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        self.db = db = SQLAlchemy(self.app)
+        self.UserInfo = create_userinfo_model(db)
+        self.Will = create_will_model(db)
+        self.Recipient = create_recipient_model(db)
+        self.Trigger = create_trigger_model(db)
+        self.DispatchLog = create_dispatchlog_model(db)
+
+        self.app.register_blueprint(init_userinfo_routes(db, self.UserInfo))
+        self.app.register_blueprint(init_will_routes(db, self.Will, self.Recipient))
+        self.app.register_blueprint(init_recipients_routes(db, self.Recipient))
+        self.app.register_blueprint(init_triggers_routes(db, self.Trigger))
+        self.app.register_blueprint(init_dispatchlog_routes(db, self.DispatchLog, self.Recipient))
+        self.app.register_blueprint(init_system_routes(db))
+        self.app.register_blueprint(init_liveconfirmation_routes(db, self.DispatchLog))
+
+        with self.app.app_context():
+            db.create_all()
+            self._seed()
+
+    def _seed(self):
+        db = self.db
+        db.session.add_all([
+            self.UserInfo(user_id='alice', email='alice@test.local', grade='Pre'),
+            self.UserInfo(user_id='bob', email='bob@test.local', grade='Sta'),
+        ])
+        db.session.add_all([
+            self.Will(user_id='alice' if i % 3 else 'bob', subject=f'will {i}', body=f'본문 {i}')
+            for i in range(1, 8)
+        ])
+        db.session.add_all([
+            self.Recipient(will_id=1, recipient_email=f'r{i}@test.local', recipient_name=f'수신자{i}')
+            for i in range(RECIPIENT_COUNT)
+        ])
+        db.session.add_all([
+            self.Trigger(user_id='alice', trigger_type='date', trigger_date=date(2030, 1, i), status='pending')
+            for i in range(1, 4)
+        ])
+        db.session.add_all([
+            self.DispatchLog(will_id=1 + i % 2, recipient_id=1 + i % RECIPIENT_COUNT, status='sent',
+                             sent_at=datetime(2026, 1, 1, 12, 0, i))
+            for i in range(DISPATCH_LOG_COUNT)
+        ])
+        db.session.commit()
+
+    def client(self):
+        return self.app.test_client()
+
+
+@lru_cache(maxsize=None)
+def get_app():
+    return SQLiteApp()
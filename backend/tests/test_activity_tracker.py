@@ -0,0 +1,74 @@
+import unittest
+import contextlib
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.activity_tracker import ActivityTracker
+
+
+class FakeConnection:
+    def __init__(self, owner):
+        self.owner = owner
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement, params=None):
+        if self.owner.fail:
+            raise RuntimeError('db down')
+        self.owner.updates.append(params)
+
+    def commit(self):
+        pass
+
+
+class FakeDB:
+    """flush 가 실행한 UPDATE 파라미터를 기록하는 가짜 db"""
+
+    def __init__(self):
+        self.updates = []
+        self.fail = False
+        self.engine = self
+
+    def connect(self):
+        return FakeConnection(self)
+
+
+class FakeApp:
+    @contextlib.contextmanager
+    def app_context(self):
+        yield
+
+
+class TestActivityTracker(unittest.TestCase):
+    """ActivityTracker write-behind 테스트"""
+
+    def setUp(self):
+        self.db = FakeDB()
+        self.tracker = ActivityTracker(FakeApp(), self.db, flush_seconds=3600)
+
+    def test_touches_are_coalesced_into_one_update(self):
+        """같은 사용자의 여러 요청은 한 번의 UPDATE 로 합쳐짐"""
+        for user_id in ('b', 'a', 'b', 'a', 'b'):
+            self.tracker.touch(user_id)
+        self.assertEqual(self.tracker.flush(), 2)
+        self.assertEqual(self.db.updates, [{'user_ids': ['a', 'b']}])
+        self.assertEqual(self.tracker.flush(), 0)
+
+    def test_failed_flush_is_retried(self):
+        """갱신 실패 시 사용자를 버퍼에 되돌려 다음 flush 에서 재시도"""
+        self.tracker.touch('a')
+        self.db.fail = True
+        self.assertEqual(self.tracker.flush(), 0)
+        self.db.fail = False
+        self.assertEqual(self.tracker.flush(), 1)
+        self.assertEqual(self.db.updates, [{'user_ids': ['a']}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import sys
+import os
+
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlite_app import get_app
+from utils.entity_cache import entity_cache
+
+
+class TestConditionalGet(unittest.TestCase):
+    """ETag / Last-Modified 조건부 GET 테스트"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sqlite_app = get_app()
+        cls.client = cls.sqlite_app.client()
+
+    def setUp(self):
+        # DB 접근 형태를 확인하므로 엔티티 캐시는 끈다
+        entity_cache.enabled = False
+        self.statements = []
+        with self.sqlite_app.app.app_context():
+            self.engine = self.sqlite_app.db.engine
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+
+    def tearDown(self):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+        entity_cache.enabled = True
+
+    def _record(self, connection, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def test_will_not_modified_skips_body(self):
+        """If-None-Match 가 맞으면 수정 시각만 조회하고 본문 없이 304"""
+        response = self.client.get('/api/wills/1')
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        self.assertTrue(etag.startswith('"will-1-'))
+        self.assertIn('Last-Modified', response.headers)
+        self.assertEqual(response.headers['Cache-Control'], 'private, no-cache')
+
+        self.statements.clear()
+        response = self.client.get('/api/wills/1', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_data(), b'')
+        self.assertEqual(response.headers['ETag'], etag)
+        self.assertEqual(len(self.statements), 1)
+        self.assertNotIn('wills.body', self.statements[0])
+
+    def test_if_modified_since(self):
+        """If-Modified-Since 가 수정 시각 이후면 304, 이전이면 200"""
+        last_modified = self.client.get('/api/wills/2').headers['Last-Modified']
+        response = self.client.get('/api/wills/2', headers={'If-Modified-Since': last_modified})
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get('/api/wills/2', headers={'If-Modified-Since': 'Mon, 01 Jan 2001 00:00:00 GMT'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_changes_on_update_and_fields(self):
+        """수정되면 새 ETag 로 200, ?fields= 마다 다른 ETag"""
+        etag = self.client.get('/api/wills/7').headers['ETag']
+        with self.sqlite_app.app.app_context():
+            will = self.sqlite_app.db.session.get(self.sqlite_app.Will, 7)
+            will.subject = 'will 7 (수정)'
+            self.sqlite_app.db.session.commit()
+        response = self.client.get('/api/wills/7', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual(response.get_json()['data']['subject'], 'will 7 (수정)')
+
+        fields_etag = self.client.get('/api/wills/7?fields=subject').headers['ETag']
+        self.assertNotEqual(fields_etag, response.headers['ETag'])
+
+    def test_trigger_and_user(self):
+        """트리거는 updated_at 버전, 사용자는 본문 해시 ETag"""
+        etag = self.client.get('/api/triggers/1').headers['ETag']
+        self.assertTrue(etag.startswith('"trigger-1-'))
+        response = self.client.get('/api/triggers/1', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+        etag = self.client.get('/api/users/alice').headers['ETag']
+        response = self.client.get('/api/users/alice', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get('/api/users/bob', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_missing_resource(self):
+        """없는 리소스는 그대로 404"""
+        self.assertEqual(self.client.get('/api/wills/999').status_code, 404)
+        self.assertEqual(self.client.get('/api/triggers/999').status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
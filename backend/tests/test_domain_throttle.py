@@ -0,0 +1,92 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from triggers.domain_throttle import DomainThrottle, TokenBucket, parse_domain_rates
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDomainThrottle(unittest.TestCase):
+    """도메인별 token bucket 테스트 (가짜 시계 사용)"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_bucket_refills_at_rate(self):
+        """burst 만큼 바로 쓰고, 그다음은 rate 속도로만 허용"""
+        bucket = TokenBucket(rate=2.0, burst=3.0, clock=self.clock)
+        self.assertEqual([bucket.try_acquire() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(bucket.try_acquire(), 0.5)
+        self.clock.now = 0.5
+        self.assertEqual(bucket.try_acquire(), 0.0)
+
+    def test_large_group_waits_for_full_bucket(self):
+        """burst 보다 큰 묶음은 버킷이 가득 찼을 때 허용하고 빚은 나중에 갚음"""
+        bucket = TokenBucket(rate=1.0, burst=2.0, clock=self.clock)
+        self.assertEqual(bucket.try_acquire(5), 0.0)
+        self.assertAlmostEqual(bucket.try_acquire(), 4.0)
+
+    def test_domains_are_independent(self):
+        """한 도메인이 막혀도 다른 도메인은 토큰이 남아 있음"""
+        throttle = DomainThrottle(default_rate=1.0, burst=1.0, domain_rates={'fast.test': 100.0}, clock=self.clock)
+        self.assertEqual(throttle.acquire('slow.test'), 0.0)
+        self.assertGreater(throttle.acquire('slow.test'), 0.0)
+        self.assertEqual(throttle.acquire('other.test'), 0.0)
+        self.assertEqual(throttle.rate('fast.test'), 100.0)
+
+    def test_backoff_on_4xx_and_recovery(self):
+        """4xx 마다 rate 절반(하한 min_rate), 성공하면 설정값까지 조금씩 회복"""
+        throttle = DomainThrottle(default_rate=10.0, burst=10.0, min_rate=1.0, clock=self.clock)
+        throttle.on_throttled('gmail.com')
+        self.assertEqual(throttle.rate('gmail.com'), 5.0)
+        for _ in range(10):
+            throttle.on_throttled('gmail.com')
+        self.assertEqual(throttle.rate('gmail.com'), 1.0)
+        for _ in range(100):
+            throttle.on_success('gmail.com')
+        self.assertEqual(throttle.rate('gmail.com'), 10.0)
+
+    def test_parse_domain_rates(self):
+        """SMTP_DOMAIN_RATES 파싱: 도메인은 소문자, 잘못된 항목은 무시"""
+        self.assertEqual(parse_domain_rates('Gmail.com=5, naver.com=20,,bad'), {'gmail.com': 5.0, 'naver.com': 20.0})
+        self.assertEqual(parse_domain_rates(None), {})
+
+    def test_rejects_non_positive_rate_and_burst(self):
+        """rate/burst 가 0 이하이면 만들 때 ValueError (0 으로 나누며 발송 스레드가 죽지 않도록)"""
+        for rate, burst in ((0, 1.0), (-1.0, 1.0), (1.0, 0), (float('nan'), 1.0)):
+            with self.assertRaises(ValueError):
+                TokenBucket(rate=rate, burst=burst, clock=self.clock)
+        with self.assertRaisesRegex(ValueError, 'SMTP_DOMAIN_RATE'):
+            DomainThrottle(default_rate=0, clock=self.clock)
+        with self.assertRaisesRegex(ValueError, 'SMTP_DOMAIN_BURST'):
+            DomainThrottle(burst=0, clock=self.clock)
+        with self.assertRaisesRegex(ValueError, 'SMTP_DOMAIN_MIN_RATE'):
+            DomainThrottle(min_rate=0, clock=self.clock)
+        with self.assertRaisesRegex(ValueError, r'SMTP_DOMAIN_RATES\[gmail.com\]'):
+            DomainThrottle(domain_rates=parse_domain_rates('naver.com=20,gmail.com=0'), clock=self.clock)
+
+    def test_from_env_rejects_zero_rate(self):
+        """환경 변수로 rate 0 을 주면 from_env 에서 바로 실패"""
+        original = os.environ.get('SMTP_DOMAIN_RATE')
+        try:
+            os.environ['SMTP_DOMAIN_RATE'] = '0'
+            with self.assertRaisesRegex(ValueError, 'SMTP_DOMAIN_RATE must be greater than 0'):
+                DomainThrottle.from_env()
+        finally:
+            if original is None:
+                os.environ.pop('SMTP_DOMAIN_RATE', None)
+            else:
+                os.environ['SMTP_DOMAIN_RATE'] = original
+
+
+if __name__ == '__main__':
+    unittest.main()
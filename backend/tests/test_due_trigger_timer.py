@@ -0,0 +1,168 @@
+import unittest
+import sys
+import os
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from triggers.due_trigger_timer import DueTriggerTimer
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def fetchone(self):
+        return self.rows[0]
+
+
+class FakeConnection:
+    """DueTriggerTimer 가 실행하는 쿼리에 미리 정한 결과를 돌려주는 가짜 커넥션"""
+
+    def __init__(self, now, pending=None):
+        self.now = now
+        self.pending = pending or []
+        self.changes = []
+        self.refresh_params = []
+        self.load_count = 0
+
+    def execute(self, statement, params=None, execution_options=None):
+        sql = str(statement)
+        if 'SELECT NOW()' in sql:
+            return FakeResult([(self.now, self.now - timedelta(hours=9))])
+        if 'updated_at >= :cursor' in sql:
+            self.refresh_params.append(params)
+            return FakeResult(self.changes)
+        self.load_count += 1
+        # 실제 쿼리처럼 due_at 순서로 capacity 개까지만
+        return FakeResult(sorted(self.pending, key=lambda row: row[1])[:params['capacity']])
+
+    def commit(self):
+        pass
+
+
+class FakeClock:
+    """수동으로 진행시키는 시계"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDueTriggerTimer(unittest.TestCase):
+    """DueTriggerTimer 테스트"""
+
+    def setUp(self):
+        self.now = datetime(2025, 3, 10, 12, 0, 0)
+        self.connection = FakeConnection(self.now, pending=[
+            (1, datetime(2025, 3, 10), self.now - timedelta(days=2)),
+            (2, datetime(2025, 3, 13), self.now - timedelta(days=1)),
+        ])
+        self.timer = DueTriggerTimer()
+        self.timer.load(self.connection)
+
+    def test_load_orders_by_due(self):
+        """적재 후 가장 이른 트리거가 due 상태"""
+        self.assertEqual(len(self.timer), 2)
+        self.assertEqual(self.timer.next_due(), datetime(2025, 3, 10))
+        self.assertTrue(self.timer.has_due(self.now))
+
+    def test_refresh_removes_completed_trigger(self):
+        """완료된 트리거는 heap 에서 제외"""
+        self.connection.changes = [(1, datetime(2025, 3, 10), 'completed', self.now)]
+        self.timer.refresh(self.connection)
+        self.assertFalse(self.timer.has_due(self.now))
+        self.assertEqual(self.timer.next_due(), datetime(2025, 3, 13))
+        self.assertEqual(self.timer.seconds_until_next_due(self.now), timedelta(days=2, hours=12).total_seconds())
+
+    def test_refresh_adds_new_and_rescheduled_triggers(self):
+        """신규/날짜 변경 트리거 반영 및 커서 전진"""
+        later = self.now + timedelta(seconds=30)
+        self.connection.changes = [
+            (2, datetime(2025, 3, 21), 'pending', self.now),
+            (3, datetime(2025, 3, 12), 'pending', later),
+        ]
+        self.timer.refresh(self.connection)
+        self.assertEqual(len(self.timer), 3)
+
+        self.connection.changes = [(1, datetime(2025, 3, 10), 'completed', later)]
+        self.timer.refresh(self.connection)
+        self.assertEqual(self.timer.next_due(), datetime(2025, 3, 12))
+        self.assertEqual(self.connection.refresh_params[-1], {'cursor': later})
+
+    def test_pending_without_due_at_is_not_scheduled(self):
+        """due_at 이 없는 pending 트리거(날짜 미지정, 미발동)는 heap 에 넣지 않음"""
+        self.connection.changes = [(1, None, 'pending', self.now)]
+        self.timer.refresh(self.connection)
+        self.assertEqual(len(self.timer), 1)
+        self.assertEqual(self.timer.next_due(), datetime(2025, 3, 13))
+
+    def test_clock_follows_db_utc(self):
+        """now() 는 DB 의 UTC_TIMESTAMP() 기준"""
+        drift = self.timer.now() - (self.now - timedelta(hours=9))
+        self.assertLess(abs(drift.total_seconds()), 5)
+
+    def test_capacity_bounds_memory_and_reloads_next_window(self):
+        """capacity 를 넘는 backlog 는 이른 순서로 일부만 적재하고, 다 처리되면 다음 범위를 적재"""
+        pending = [(i, datetime(2025, 3, 1) + timedelta(hours=i), self.now) for i in range(1, 11)]
+        connection = FakeConnection(self.now, pending=pending)
+        timer = DueTriggerTimer(capacity=3)
+        timer.load(connection)
+        self.assertEqual(len(timer), 3)
+        self.assertEqual(timer.next_due(), datetime(2025, 3, 1, 1))
+
+        # 범위 밖(horizon 이후)으로 밀린 트리거는 메모리에서 빠짐
+        connection.changes = [(3, datetime(2025, 3, 9), 'pending', self.now)]
+        timer.refresh(connection)
+        self.assertEqual(len(timer), 2)
+
+        # 범위 안의 트리거가 모두 처리되면 다음 범위를 다시 적재
+        connection.pending = pending[3:]
+        connection.changes = [(1, None, 'completed', self.now), (2, None, 'completed', self.now)]
+        timer.refresh(connection)
+        self.assertIsNone(timer.next_due())
+        timer.refresh(connection)
+        self.assertEqual(connection.load_count, 2)
+        self.assertEqual(len(timer), 3)
+        self.assertEqual(timer.next_due(), datetime(2025, 3, 1, 4))
+
+    def test_periodic_reload_picks_up_missed_rows(self):
+        """커서보다 늦게 커밋돼 증분 조회에 걸리지 않은 트리거도 주기적인 전체 적재로 반영"""
+        clock = FakeClock()
+        connection = FakeConnection(self.now, pending=list(self.connection.pending))
+        timer = DueTriggerTimer(reload_seconds=60, clock=clock)
+        timer.load(connection)
+
+        # 커서 이전 updated_at 으로 늦게 커밋된 트리거: 증분 조회 결과에는 없음
+        connection.pending.append((3, datetime(2025, 3, 9), self.now - timedelta(seconds=1)))
+        timer.refresh(connection)
+        self.assertEqual(len(timer), 2)
+        self.assertEqual(connection.load_count, 1)
+
+        clock.now = 60
+        timer.refresh(connection)
+        self.assertEqual(connection.load_count, 2)
+        self.assertEqual(len(timer), 3)
+        self.assertEqual(timer.next_due(), datetime(2025, 3, 9))
+
+        # 다시 적재한 뒤에는 다음 주기까지 증분 조회
+        clock.now = 119
+        timer.refresh(connection)
+        self.assertEqual(connection.load_count, 2)
+
+    def test_empty_timer(self):
+        """pending 트리거가 없으면 대기할 예정 시각도 없음"""
+        timer = DueTriggerTimer()
+        timer.load(FakeConnection(self.now))
+        self.assertIsNone(timer.next_due())
+        self.assertIsNone(timer.seconds_until_next_due())
+        self.assertFalse(timer.has_due())
+
+
+if __name__ == '__main__':
+    unittest.main()
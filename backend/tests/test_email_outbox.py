@@ -0,0 +1,178 @@
+import unittest
+import smtplib
+import socket
+from collections import namedtuple
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.smtp_sink import SMTPSink
+from triggers import email_outbox
+from triggers.domain_throttle import DomainThrottle
+from triggers.smtp_pool import SMTPConfig
+
+OutboxRow = namedtuple('OutboxRow', 'id to_email subject body attempts')
+
+
+class TestOutboxRetryPolicy(unittest.TestCase):
+    """아웃박스 재시도/dead-letter 분류 테스트"""
+
+    def test_5xx_is_permanent(self):
+        """5xx 응답은 dead-letter"""
+        self.assertTrue(email_outbox.is_permanent_failure(smtplib.SMTPDataError(554, b'rejected')))
+        self.assertTrue(email_outbox.is_permanent_failure(
+            smtplib.SMTPRecipientsRefused({'a@test.local': (550, b'no such user')})
+        ))
+
+    def test_4xx_and_connection_errors_are_retried(self):
+        """4xx 응답과 연결 오류는 재시도"""
+        self.assertFalse(email_outbox.is_permanent_failure(smtplib.SMTPDataError(451, b'try later')))
+        self.assertFalse(email_outbox.is_permanent_failure(
+            smtplib.SMTPRecipientsRefused({'a@test.local': (450, b'mailbox busy')})
+        ))
+        self.assertFalse(email_outbox.is_permanent_failure(smtplib.SMTPServerDisconnected('gone')))
+        self.assertFalse(email_outbox.is_permanent_failure(socket.timeout()))
+
+    def test_backoff_grows_exponentially_and_is_capped(self):
+        """백오프는 지수적으로 늘어나고 최대값에서 멈춤 (jitter 10% 이내)"""
+        base = email_outbox.OUTBOX_BACKOFF_BASE_SECONDS
+        cap = email_outbox.OUTBOX_BACKOFF_MAX_SECONDS
+        for attempts, expected in ((1, base), (2, base * 2), (3, base * 4), (50, cap)):
+            delay = email_outbox.backoff_seconds(attempts)
+            self.assertGreaterEqual(delay, expected)
+            self.assertLessEqual(delay, expected * 1.1)
+
+    def test_percentile(self):
+        """nearest-rank 백분위수"""
+        values = list(range(1, 101))
+        self.assertEqual(email_outbox.percentile(values, 50), 50)
+        self.assertEqual(email_outbox.percentile(values, 99), 99)
+        self.assertEqual(email_outbox.percentile([], 99), 0.0)
+
+
+class FakeClaimConnection:
+    """claim_outbox_batch 가 실행한 SQL/파라미터를 기록하는 가짜 커넥션 (예약할 행 없음)"""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append((' '.join(str(statement).split()), params))
+        return FakeRows()
+
+    def commit(self):
+        pass
+
+
+class FakeRows:
+    def fetchall(self):
+        return []
+
+
+class TestPriorityLanes(unittest.TestCase):
+    """발송 레인/등급 우선순위 테스트"""
+
+    def test_grade_priority(self):
+        """등급 순서 Pre < Gol < Sta < 그 외"""
+        priorities = [email_outbox.grade_priority(grade) for grade in ('Pre', 'Gol', 'Sta', None, 'xx')]
+        self.assertEqual(priorities, [0, 1, 2, 3, 3])
+        message = email_outbox.outbox_message('a@test.local', 's', 'b', 1, grade='Pre')
+        self.assertEqual(message['priority'], 0)
+
+    def test_lane_claim_filters_dispatch_type(self):
+        """레인 워커는 자기 레인만, 레인 안에서는 등급 순서로 예약"""
+        connection = FakeClaimConnection()
+        email_outbox.claim_outbox_batch(connection, 'token', lane=email_outbox.LANE_RELEASE)
+        sql, params = connection.statements[0]
+        self.assertIn('AND dispatch_type = :dispatch_type', sql)
+        self.assertIn('ORDER BY priority, next_attempt_at', sql)
+        self.assertEqual(params['dispatch_type'], email_outbox.DISPATCH_TYPE_WILL_RELEASE)
+
+    def test_unlaned_claim_prefers_confirmation(self):
+        """레인을 주지 않으면 live confirmation 레인부터 예약"""
+        connection = FakeClaimConnection()
+        email_outbox.claim_outbox_batch(connection, 'token')
+        sql, _ = connection.statements[0]
+        self.assertNotIn(':dispatch_type', sql)
+        self.assertIn('ORDER BY dispatch_type, priority, next_attempt_at', sql)
+        self.assertLess(email_outbox.DISPATCH_TYPE_LIVE_CONFIRMATION, email_outbox.DISPATCH_TYPE_WILL_RELEASE)
+
+    def test_lane_latency_metrics(self):
+        """레인별 대기/전달 시간 histogram"""
+        registry = email_outbox.metrics
+        registry.reset()
+        Sent = namedtuple('Sent', 'dispatch_type queued_seconds')
+        email_outbox.observe_lane_latency([Sent(1, 2.5), Sent(2, None)], claimed_at=0.0)
+        histograms = registry.snapshot()['histograms']
+        self.assertEqual(histograms['outbox_queue_seconds{lane="confirmation"}']['sum'], 2.5)
+        self.assertEqual(histograms['outbox_delivery_seconds{lane="release"}']['count'], 1)
+        registry.reset()
+
+
+class TestDomainBatching(unittest.TestCase):
+    """같은 도메인 수신자를 한 SMTP 트랜잭션으로 묶어 발송하는 테스트"""
+
+    def setUp(self):
+        self.sink = SMTPSink(refuse={'gone@a.test': 550, 'busy@a.test': 450}).start()
+        self.original_config = email_outbox.SMTP_CONFIG
+        email_outbox.SMTP_CONFIG = SMTPConfig(self.sink.host, self.sink.port, user='dms@test.local',
+                                              pool_size=2, max_recipients_per_message=3)
+        email_outbox._smtp_pool = None
+        email_outbox._domain_throttle = None
+
+    def tearDown(self):
+        email_outbox.get_smtp_pool().close()
+        email_outbox.SMTP_CONFIG = self.original_config
+        email_outbox._smtp_pool = None
+        email_outbox._domain_throttle = None
+        self.sink.stop()
+
+    def test_group_by_domain(self):
+        """도메인과 내용이 같은 메시지만 max_recipients 개씩 묶음"""
+        rows = [OutboxRow(i, f"u{i}@A.test", 's', 'same', 1) for i in range(5)]
+        rows += [OutboxRow(5, 'u5@b.test', 's', 'same', 1), OutboxRow(6, 'u6@a.test', 's', 'other', 1)]
+        groups = email_outbox.group_by_domain(rows, max_recipients=3)
+        self.assertEqual([[row.id for row in group] for group in groups], [[0, 1, 2], [3, 4], [5], [6]])
+        self.assertEqual(len(email_outbox.group_by_domain(rows, max_recipients=1)), 7)
+
+    def test_batched_send_reports_each_recipient(self):
+        """한 트랜잭션 안에서 일부 수신자만 거부되면 그 수신자만 재시도/dead-letter"""
+        addresses = ['a1@a.test', 'gone@a.test', 'busy@a.test', 'a2@a.test', 'b1@b.test']
+        rows = [OutboxRow(i, address, '제목', '본문', 1) for i, address in enumerate(addresses)]
+        sent, retry, dead, deferred, latencies = email_outbox.send_outbox_batch(rows)
+
+        self.assertEqual(sorted(row.to_email for row in sent), ['a1@a.test', 'a2@a.test', 'b1@b.test'])
+        self.assertEqual([row.to_email for row, _ in retry], ['busy@a.test'])
+        self.assertEqual([row.to_email for row, _ in dead], ['gone@a.test'])
+        # a.test 4명 -> 3명 + 1명 트랜잭션, b.test 1 트랜잭션
+        self.assertEqual(len(latencies), 3)
+        self.assertEqual(self.sink.messages, 3)
+        self.assertEqual(self.sink.recipients, 3)
+
+    def test_all_refused_group(self):
+        """트랜잭션의 수신자가 모두 거부돼도 수신자별 코드로 분류"""
+        rows = [OutboxRow(0, 'gone@a.test', 's', 'b', 1), OutboxRow(1, 'busy@a.test', 's', 'b', 1)]
+        sent, retry, dead, _, _ = email_outbox.send_outbox_batch(rows)
+        self.assertEqual(sent, [])
+        self.assertEqual([row.id for row, _ in retry], [1])
+        self.assertEqual([row.id for row, _ in dead], [0])
+
+    def test_throttled_domain_is_deferred_without_blocking_others(self):
+        """토큰이 없는 도메인 메시지는 미루고 다른 도메인은 그대로 발송, 4xx 를 받으면 rate 감소"""
+        email_outbox._domain_throttle = DomainThrottle(default_rate=1.0, burst=2.0)
+        email_outbox._domain_throttle_pid = os.getpid()
+        rows = [OutboxRow(i, f"u{i}@a.test", 's', f"body {i}", 1) for i in range(4)]
+        rows += [OutboxRow(4, 'u4@b.test', 's', 'body', 1), OutboxRow(5, 'busy@a.test', 's', 'body', 1)]
+        sent, retry, dead, deferred, _ = email_outbox.send_outbox_batch(rows)
+
+        self.assertEqual(sorted(row.id for row in sent), [0, 1, 4])
+        self.assertEqual(sorted(row.id for row, _ in deferred), [2, 3, 5])
+        self.assertTrue(all(0 < wait <= 2.0 for _, wait in deferred))
+        self.assertEqual(self.sink.messages, 3)
+        self.assertEqual(retry, [])
+        self.assertEqual(dead, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import email
+from email import policy
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jinja2 import UndefinedError
+
+from triggers import email_templates
+from triggers.email_templates import LIVE_CONFIRMATION, MessageSkeleton
+
+
+class TestTemplateRegistry(unittest.TestCase):
+    """컴파일된 이메일 템플릿 레지스트리 테스트"""
+
+    def test_live_confirmation_render(self):
+        """live confirmation 본문에 URL/확인 토큰이 들어가고 제목은 고정"""
+        subject, body = email_templates.render_template(LIVE_CONFIRMATION, base_url='dms.local', confirm_token='tok7')
+        self.assertEqual(subject, email_templates.live_confirmation_subject)
+        self.assertIn("https://dms.local/auth/liveconfirmation/tok7/\n", body)
+        self.assertNotIn('{{', body)
+
+    def test_render_batch_matches_single_render(self):
+        """batch 렌더링 결과는 하나씩 렌더링한 결과와 같음"""
+        contexts = [{"confirm_token": confirm_token} for confirm_token in ('a', 'b', 'c')]
+        batch = email_templates.render_batch(LIVE_CONFIRMATION, contexts, base_url='dms.local')
+        single = [
+            email_templates.render_template(LIVE_CONFIRMATION, base_url='dms.local', confirm_token=confirm_token)
+            for confirm_token in ('a', 'b', 'c')
+        ]
+        self.assertEqual(batch, single)
+
+    def test_registered_template_with_dynamic_subject(self):
+        """새 템플릿 등록: 변수가 있는 제목도 렌더링, 빠진 변수는 오류"""
+        template = email_templates.register_template('test_notice', '{{ name }} 님께', '본문 {{ name }}')
+        self.assertIsNone(template.static_subject)
+        self.assertEqual(email_templates.render_batch('test_notice', [{"name": "A"}]), [('A 님께', '본문 A')])
+        with self.assertRaises(UndefinedError):
+            email_templates.render_template('test_notice')
+        with self.assertRaises(KeyError):
+            email_templates.get_template('missing')
+
+
+class TestMessageSkeleton(unittest.TestCase):
+    """미리 만든 헤더 틀로 조립한 메시지 테스트"""
+
+    def test_message_round_trip(self):
+        """조립한 메시지를 파싱하면 제목/수신자/본문이 그대로 복원됨"""
+        subject, body = email_templates.render_template(LIVE_CONFIRMATION, base_url='dms.local', confirm_token='tok7')
+        raw = MessageSkeleton('noreply@dms.local').build('user@test.local', subject, body)
+        self.assertTrue(raw.isascii())
+
+        parsed = email.message_from_string(raw, policy=policy.default)
+        self.assertEqual(parsed['Subject'], subject)
+        self.assertEqual(parsed['From'], 'noreply@dms.local')
+        self.assertEqual(parsed['To'], 'user@test.local')
+        self.assertEqual(parsed.get_content_type(), 'text/plain')
+        self.assertEqual(parsed.get_content(), body)
+
+
+if __name__ == '__main__':
+    unittest.main()
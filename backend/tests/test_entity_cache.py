@@ -0,0 +1,170 @@
+import unittest
+import sys
+import os
+
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlite_app import get_app
+from utils.entity_cache import RECIPIENTS_BY_WILL, WILL, EntityCache, entity_cache, estimate_size
+
+
+class FakeClock:
+    """수동으로 진행시키는 시계"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestEntityCache(unittest.TestCase):
+    """EntityCache LRU/TTL/무효화 테스트"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = EntityCache(max_entries=3, max_bytes=1000, ttl_seconds=10, clock=self.clock)
+
+    def test_hit_and_ttl_expiry(self):
+        """TTL 안에서는 hit, 지나면 만료되어 miss"""
+        self.cache.set(WILL, 1, {'id': 1})
+        self.assertEqual(self.cache.get(WILL, 1), {'id': 1})
+        self.clock.now = 10
+        self.assertIsNone(self.cache.get(WILL, 1))
+        stats = self.cache.stats()
+        self.assertEqual(stats['entries'], 0)
+        self.assertEqual(stats['entities'][WILL]['hits'], 1)
+        self.assertEqual(stats['entities'][WILL]['misses'], 1)
+        self.assertEqual(stats['entities'][WILL]['expired'], 1)
+        self.assertEqual(stats['entities'][WILL]['hit_ratio'], 0.5)
+
+    def test_lru_eviction_by_entries(self):
+        """항목 수 상한을 넘으면 가장 오래 쓰지 않은 항목부터 제거"""
+        for key in (1, 2, 3):
+            self.cache.set(WILL, key, key)
+        self.cache.get(WILL, 1)
+        self.cache.set(WILL, 4, 4)
+        self.assertIsNone(self.cache.get(WILL, 2))
+        self.assertEqual(self.cache.get(WILL, 1), 1)
+        self.assertEqual(self.cache.stats()['entities'][WILL]['evictions'], 1)
+
+    def test_byte_cap(self):
+        """바이트 상한을 넘으면 제거하고, 상한보다 큰 값은 저장하지 않음"""
+        value = 'x' * 400
+        self.cache.set(WILL, 1, value)
+        self.cache.set(WILL, 2, value)
+        self.cache.set(WILL, 3, value)
+        self.assertIsNone(self.cache.get(WILL, 1))
+        self.assertEqual(self.cache.stats()['bytes'], 2 * estimate_size(value))
+
+        self.cache.set(WILL, 4, 'x' * 2000)
+        self.assertIsNone(self.cache.get(WILL, 4))
+        self.assertEqual(self.cache.stats()['entries'], 2)
+
+    def test_invalidate_and_stale_set(self):
+        """무효화는 항목을 지우고, 조회 중 무효화가 있었으면 읽어 온 값을 저장하지 않음"""
+        self.cache.set(RECIPIENTS_BY_WILL, 1, [1])
+        generation = self.cache.generation
+        self.cache.invalidate(RECIPIENTS_BY_WILL, 1)
+        self.assertIsNone(self.cache.get(RECIPIENTS_BY_WILL, 1))
+        self.cache.set(RECIPIENTS_BY_WILL, 1, [1], generation)
+        self.assertIsNone(self.cache.get(RECIPIENTS_BY_WILL, 1))
+        self.assertEqual(self.cache.stats()['entities'][RECIPIENTS_BY_WILL]['invalidations'], 1)
+
+    def test_disabled(self):
+        """꺼져 있으면 저장도 조회도 하지 않음"""
+        self.cache.enabled = False
+        self.cache.set(WILL, 1, 1)
+        self.assertIsNone(self.cache.get(WILL, 1))
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+
+class TestEntityCacheRoutes(unittest.TestCase):
+    """라우트 read-through 캐시와 쓰기 무효화 테스트"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sqlite_app = get_app()
+        cls.client = cls.sqlite_app.client()
+
+    def setUp(self):
+        entity_cache.clear()
+        self.statements = []
+        with self.sqlite_app.app.app_context():
+            self.engine = self.sqlite_app.db.engine
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+
+    def tearDown(self):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+    def _record(self, connection, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def test_will_served_from_cache(self):
+        """두 번째 조회는 DB 를 읽지 않고, ?fields= 와 304 도 캐시 값으로 응답"""
+        first = self.client.get('/api/wills/4')
+        self.assertEqual(first.status_code, 200)
+
+        self.statements.clear()
+        second = self.client.get('/api/wills/4')
+        self.assertEqual(second.get_json(), first.get_json())
+        self.assertEqual(second.headers['ETag'], first.headers['ETag'])
+        response = self.client.get('/api/wills/4?fields=id,subject')
+        self.assertEqual(response.get_json()['data'], {'id': 4, 'subject': 'will 4'})
+        response = self.client.get('/api/wills/4', headers={'If-None-Match': first.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.statements, [])
+
+    def test_will_update_invalidates(self):
+        """PUT 후 조회는 새 값"""
+        self.client.get('/api/wills/5')
+        response = self.client.put('/api/wills/5', json={'subject': 'will 5 (수정)'})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get('/api/wills/5')
+        self.assertEqual(response.get_json()['data']['subject'], 'will 5 (수정)')
+
+    def test_recipients_create_and_delete_invalidate(self):
+        """수신자 추가/삭제가 유언장별 수신자 목록 캐시에 바로 반영"""
+        self.assertEqual(self.client.get('/api/recipients/will/1').get_json()['count'], 25)
+        self.statements.clear()
+        self.assertEqual(self.client.get('/api/recipients/will/1').get_json()['count'], 25)
+        self.assertEqual(self.statements, [])
+
+        response = self.client.post('/api/recipients', json={'will_id': 1, 'recipient_email': 'new@test.local'})
+        self.assertEqual(response.status_code, 201)
+        recipient_id = response.get_json()['data']['id']
+        try:
+            self.assertEqual(self.client.get('/api/recipients/will/1').get_json()['count'], 26)
+        finally:
+            self.assertEqual(self.client.delete(f'/api/recipients/{recipient_id}').status_code, 200)
+        self.assertEqual(self.client.get('/api/recipients/will/1').get_json()['count'], 25)
+
+    def test_triggers_update_invalidates(self):
+        """트리거 수정이 사용자별 트리거 목록 캐시에 바로 반영, ?fields= 는 캐시 값에서 추림"""
+        self.client.get('/api/triggers/user/alice')
+        try:
+            self.client.put('/api/triggers/2', json={'trigger_value': '30'})
+            response = self.client.get('/api/triggers/user/alice?fields=trigger_id,trigger_value')
+            data = {trigger['trigger_id']: trigger['trigger_value'] for trigger in response.get_json()['data']}
+            self.assertEqual(data[2], '30')
+        finally:
+            self.client.put('/api/triggers/2', json={'trigger_value': None})
+
+    def test_stats_endpoint(self):
+        """GET /api/system/cache 로 엔티티별 hit/miss 확인"""
+        before = entity_cache.stats()['entities'].get('user', {'hits': 0, 'misses': 0})
+        self.client.get('/api/users/alice')
+        self.client.get('/api/users/alice')
+        response = self.client.get('/api/system/cache')
+        self.assertEqual(response.status_code, 200)
+        stats = response.get_json()['data']
+        self.assertTrue(stats['enabled'])
+        self.assertEqual(stats['entries'], 1)
+        self.assertEqual(stats['entities']['user']['hits'] - before['hits'], 1)
+        self.assertEqual(stats['entities']['user']['misses'] - before['misses'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
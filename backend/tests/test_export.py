@@ -0,0 +1,69 @@
+import unittest
+import csv
+import gzip
+import io
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlite_app import DISPATCH_LOG_COUNT, RECIPIENT_COUNT, get_app
+
+
+class TestStreamingExport(unittest.TestCase):
+    """NDJSON/CSV 스트리밍 내보내기 테스트"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = get_app().client()
+
+    def test_ndjson_by_default(self):
+        """Accept 가 없으면 NDJSON, 행마다 JSON 한 줄을 id 순서로 스트리밍"""
+        response = self.client.get('/api/dispatch-logs/export')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        self.assertTrue(response.content_type.startswith('application/x-ndjson'))
+        self.assertIn('dispatch_log.ndjson', response.headers['Content-Disposition'])
+
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual(len(rows), DISPATCH_LOG_COUNT)
+        self.assertEqual([row['id'] for row in rows], list(range(1, DISPATCH_LOG_COUNT + 1)))
+        self.assertEqual(rows[0]['sent_at'], '2026-01-01T12:00:00')
+
+    def test_csv_by_accept(self):
+        """Accept: text/csv 면 헤더 행이 있는 CSV"""
+        response = self.client.get('/api/recipients/export', headers={'Accept': 'text/csv'})
+        self.assertTrue(response.content_type.startswith('text/csv'))
+        rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+        self.assertEqual(len(rows), RECIPIENT_COUNT)
+        self.assertEqual(rows[1]['recipient_name'], '수신자1')
+
+    def test_gzip_stream(self):
+        """Accept-Encoding: gzip 이면 gzip 으로 압축해 스트리밍"""
+        response = self.client.get('/api/recipients/export?will_id=1&format=csv',
+                                   headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        text = gzip.decompress(response.get_data()).decode('utf-8')
+        self.assertEqual(len(text.splitlines()), RECIPIENT_COUNT + 1)
+
+        response = self.client.get('/api/recipients/export?gzip=0', headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_filter_by_will(self):
+        """will_id 로 한 유언장의 발송 로그만"""
+        response = self.client.get('/api/dispatch-logs/export?will_id=2')
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual(len(rows), DISPATCH_LOG_COUNT // 2)
+        self.assertTrue(all(row['will_id'] == 2 for row in rows))
+
+    def test_unacceptable_format(self):
+        """NDJSON/CSV 를 받을 수 없는 요청은 406"""
+        response = self.client.get('/api/recipients/export', headers={'Accept': 'text/html'})
+        self.assertEqual(response.status_code, 406)
+        response = self.client.get('/api/recipients/export?format=xml')
+        self.assertEqual(response.status_code, 406)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import json
+import sys
+import os
+
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlite_app import get_app
+from utils.entity_cache import entity_cache
+
+
+class TestSparseFieldsets(unittest.TestCase):
+    """?fields= 로 일부 컬럼만 조회/직렬화하는 테스트"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sqlite_app = get_app()
+        cls.client = cls.sqlite_app.client()
+
+    def setUp(self):
+        # DB 접근 형태를 확인하므로 엔티티 캐시는 끈다
+        entity_cache.enabled = False
+        self.statements = []
+        with self.sqlite_app.app.app_context():
+            self.engine = self.sqlite_app.db.engine
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+
+    def tearDown(self):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+        entity_cache.enabled = True
+
+    def _record(self, connection, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def get(self, url):
+        response = self.client.get(url)
+        return response.status_code, json.loads(response.data)
+
+    def selects_from(self, table):
+        return [sql for sql in self.statements if sql.lstrip().startswith('SELECT') and f'FROM {table}' in sql]
+
+    def test_will_list_without_body(self):
+        """fields 에 body 가 없으면 wills.body 를 SELECT 하지도, 응답에 넣지도 않음"""
+        status, data = self.get('/api/wills?fields=id,subject&limit=3')
+        self.assertEqual(status, 200)
+        self.assertEqual(data['data'][0], {'id': 1, 'subject': 'will 1'})
+        self.assertEqual(data['next_after'], 3)
+        selects = self.selects_from('wills')
+        self.assertEqual(len(selects), 1)
+        self.assertNotIn('wills.body', selects[0])
+
+    def test_full_payload_by_default(self):
+        """fields 가 없으면 기존 to_dict 전체"""
+        _, data = self.get('/api/wills/1')
+        self.assertEqual(data['data']['body'], '본문 1')
+        self.assertIn('wills.body', self.selects_from('wills')[-1])
+
+    def test_detail_endpoints(self):
+        """단건 조회도 요청한 키만, 응답 키 이름(trigger_id 등)으로 선택"""
+        _, data = self.get('/api/triggers/1?fields=trigger_id,trigger_date')
+        self.assertEqual(data['data'], {'trigger_id': 1, 'trigger_date': '2030-01-01'})
+        _, data = self.get('/api/users/alice?fields=grade')
+        self.assertEqual(data['data'], {'grade': 'Pre'})
+        _, data = self.get('/api/dispatch-logs/recipient/2?fields=id,status')
+        self.assertEqual(data['data'][0], {'id': 2, 'status': 'sent'})
+        self.assertNotIn('sent_at', self.selects_from('dispatch_log')[-1])
+
+    def test_unknown_field(self):
+        """모르는 필드(to_dict 에 없는 password_hash 포함)는 400"""
+        status, data = self.get('/api/users?fields=user_id,password_hash')
+        self.assertEqual(status, 400)
+        self.assertIn('password_hash', data['error'])
+        status, _ = self.get('/api/wills/1?fields=nope')
+        self.assertEqual(status, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from triggers import live_confirmation_trigger_scheduler as scheduler
+from triggers.leader_election import LeaderElector
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+class FakeLockServer:
+    """MySQL 이름 잠금(GET_LOCK)을 흉내내는 서버: 잠금 이름 -> 소유 커넥션"""
+
+    def __init__(self):
+        self.owners = {}
+        self.next_id = 1
+
+    def connect(self):
+        connection = FakeConnection(self, self.next_id)
+        self.next_id += 1
+        return connection
+
+
+class FakeConnection:
+    def __init__(self, server, connection_id):
+        self.server = server
+        self.connection_id = connection_id
+        self.closed = False
+        self.fail = False
+
+    def execute(self, statement, params=None):
+        if self.fail:
+            raise ConnectionError('lost')
+        sql = str(statement)
+        owners = self.server.owners
+        if 'GET_LOCK' in sql:
+            owner = owners.setdefault(params['name'], self.connection_id)
+            return FakeResult(1 if owner == self.connection_id else 0)
+        if 'IS_USED_LOCK' in sql:
+            return FakeResult(owners.get(params['name']) == self.connection_id)
+        if 'RELEASE_LOCK' in sql:
+            if owners.get(params['name']) == self.connection_id:
+                del owners[params['name']]
+            return FakeResult(1)
+        return FakeResult(None)
+
+    def commit(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def invalidate(self):
+        # 세션이 끊기면 서버가 그 세션의 잠금을 해제
+        self.closed = True
+        for name, owner in list(self.server.owners.items()):
+            if owner == self.connection_id:
+                del self.server.owners[name]
+
+    def close(self):
+        self.closed = True
+
+
+class TestLeaderElector(unittest.TestCase):
+    """GET_LOCK 기반 리더 선출 테스트 (heartbeat 를 직접 호출)"""
+
+    def setUp(self):
+        self.server = FakeLockServer()
+        self.first = LeaderElector(self.server, name='test_leader')
+        self.second = LeaderElector(self.server, name='test_leader')
+
+    def test_single_leader(self):
+        """잠금을 먼저 잡은 인스턴스만 리더"""
+        self.assertTrue(self.first.heartbeat())
+        self.assertFalse(self.second.heartbeat())
+        self.assertTrue(self.first.heartbeat())
+        self.assertFalse(self.second.heartbeat())
+
+    def test_standby_takes_over_after_release(self):
+        """리더가 잠금을 내려놓으면 대기 인스턴스가 다음 heartbeat 에 인계"""
+        self.first.heartbeat()
+        self.second.heartbeat()
+        self.first.release()
+        self.assertFalse(self.first.is_leader())
+        self.assertTrue(self.second.heartbeat())
+
+    def test_connection_error_demotes(self):
+        """커넥션 오류가 나면 리더에서 물러나고 세션을 끊어 잠금을 넘김"""
+        self.first.heartbeat()
+        self.first._connection.fail = True
+        self.assertFalse(self.first.heartbeat())
+        self.assertIsNone(self.first._connection)
+        self.assertTrue(self.second.heartbeat())
+
+    def test_lost_lock_is_detected(self):
+        """서버에서 잠금이 사라지면(세션 타임아웃 등) 리더가 아님을 인지"""
+        self.first.heartbeat()
+        self.server.owners.clear()
+        self.assertFalse(self.first.heartbeat())
+        self.assertFalse(self.first.is_leader())
+
+
+class TestOnceSingletonJobs(unittest.TestCase):
+    """--once 실행의 싱글톤 작업도 리더 잠금을 잡은 프로세스만 실행"""
+
+    def setUp(self):
+        self.server = FakeLockServer()
+        self.calls = []
+        self.originals = (scheduler.get_engine, scheduler.evaluate_inactivity_triggers,
+                          scheduler.release_unconfirmed_wills)
+        scheduler.get_engine = lambda: self.server
+        scheduler.evaluate_inactivity_triggers = lambda connection: self.calls.append('evaluate')
+        scheduler.release_unconfirmed_wills = lambda connection: self.calls.append('release')
+
+    def tearDown(self):
+        (scheduler.get_engine, scheduler.evaluate_inactivity_triggers,
+         scheduler.release_unconfirmed_wills) = self.originals
+
+    def test_skipped_while_another_process_leads(self):
+        """다른 프로세스가 잠금을 갖고 있으면 건너뛰고, 실행한 뒤에는 잠금을 내려놓음"""
+        other = LeaderElector(self.server)
+        self.assertTrue(other.heartbeat())
+        self.assertFalse(scheduler.run_singleton_jobs_once())
+        self.assertEqual(self.calls, [])
+
+        other.release()
+        self.assertTrue(scheduler.run_singleton_jobs_once())
+        self.assertEqual(self.calls, ['evaluate', 'release'])
+        self.assertEqual(self.server.owners, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+import sys
+import os
+
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlite_app import get_app
+from triggers import live_confirmation_trigger_scheduler as scheduler
+from triggers.email_outbox import DISPATCH_TYPE_LIVE_CONFIRMATION
+
+
+class FakeResult:
+    def __init__(self, rowcount=0, lastrowid=None):
+        self.rowcount = rowcount
+        self.lastrowid = lastrowid
+
+
+class FakeConnection:
+    """트리거 완료 UPDATE / dispatch_log INSERT / 아웃박스 INSERT 를 기록"""
+
+    def __init__(self):
+        self.next_log_id = 500
+        self.logs = []
+        self.outbox = []
+        self.commits = 0
+
+    def execute(self, statement, params=None):
+        sql = ' '.join(str(statement).split())
+        if sql.startswith('UPDATE triggers'):
+            return FakeResult(rowcount=len(params['ids']))
+        if sql.startswith('INSERT INTO dispatch_log'):
+            self.next_log_id += 1
+            self.logs.append(dict(params, id=self.next_log_id))
+            return FakeResult(rowcount=1, lastrowid=self.next_log_id)
+        if sql.startswith('INSERT INTO email_outbox'):
+            self.outbox.extend(params)
+        return FakeResult()
+
+    def commit(self):
+        self.commits += 1
+
+
+class TestConfirmationLink(unittest.TestCase):
+    """확인 링크는 아웃박스에 넣을 때 만든 dispatch_log 행의 임의 토큰을 담음"""
+
+    def test_link_carries_confirm_token(self):
+        """메일마다 토큰을 가진 dispatch_log 를 만들고, 링크에는 토큰을, 아웃박스 행에는 id 를 넣음"""
+        connection = FakeConnection()
+        scheduler.complete_and_enqueue(connection, 'token', {
+            3: [('a@test.local', 7, 'Gol')],
+            4: [('b@test.local', 8, None)],
+        })
+
+        self.assertEqual([log['will_id'] for log in connection.logs], [7, 8])
+        self.assertTrue(all(log['type'] == DISPATCH_TYPE_LIVE_CONFIRMATION for log in connection.logs))
+        first, second = connection.outbox
+        self.assertEqual((first['trigger_id'], first['will_id'], first['dispatch_log_id']), (3, 7, 501))
+        self.assertEqual((second['trigger_id'], second['will_id'], second['dispatch_log_id']), (4, 8, 502))
+        tokens = [log['confirm_token'] for log in connection.logs]
+        self.assertTrue(all(len(token) >= 32 for token in tokens))
+        self.assertNotEqual(tokens[0], tokens[1])
+        self.assertIn(f'/auth/liveconfirmation/{tokens[0]}/', first['body'])
+        self.assertIn(f'/auth/liveconfirmation/{tokens[1]}/', second['body'])
+        self.assertNotIn('/auth/liveconfirmation/501/', first['body'])
+        self.assertEqual(connection.commits, 1)
+
+
+class TestLiveConfirmationRoute(unittest.TestCase):
+    """확인 링크 클릭 라우트 테스트"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sqlite_app = get_app()
+        cls.client = cls.sqlite_app.client()
+
+    def setUp(self):
+        app = self.sqlite_app
+        with app.app.app_context():
+            self.confirm_token = 'test-confirm-token-' + self.id().rsplit('.', 1)[-1]
+            log = app.DispatchLog(will_id=2, recipient_id=None, status='sent', confirm_token=self.confirm_token)
+            app.db.session.add(log)
+            app.db.session.commit()
+            self.dispatch_log_id = log.id
+            self.engine = app.db.engine
+        self.statements = []
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+
+    def tearDown(self):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+        app = self.sqlite_app
+        with app.app.app_context():
+            app.db.session.delete(app.db.session.get(app.DispatchLog, self.dispatch_log_id))
+            app.db.session.commit()
+
+    def _record(self, connection, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+    def test_click_records_read_at_with_db_clock(self):
+        """클릭하면 read 상태가 되고 read_at 은 애플리케이션 시계가 아닌 DB 시각으로 기록"""
+        response = self.client.get(f'/auth/liveconfirmation/{self.confirm_token}/')
+        self.assertEqual(response.status_code, 200)
+
+        update, parameters = next(
+            (statement, parameters) for statement, parameters in self.statements
+            if statement.startswith('UPDATE dispatch_log')
+        )
+        self.assertIn('read_at=CURRENT_TIMESTAMP', update)
+        self.assertEqual(list(parameters), ['read', self.dispatch_log_id])
+
+        app = self.sqlite_app
+        with app.app.app_context():
+            log = app.db.session.get(app.DispatchLog, self.dispatch_log_id)
+            self.assertEqual(log.status, 'read')
+            self.assertIsNotNone(log.read_at)
+
+    def test_unknown_link(self):
+        """없는 토큰은 404"""
+        self.assertEqual(self.client.get('/auth/liveconfirmation/no-such-token/').status_code, 404)
+
+    def test_dispatch_log_id_is_not_a_link(self):
+        """순차 id 로는 확인 처리되지 않음"""
+        self.assertEqual(self.client.get(f'/auth/liveconfirmation/{self.dispatch_log_id}/').status_code, 404)
+        app = self.sqlite_app
+        with app.app.app_context():
+            self.assertEqual(app.db.session.get(app.DispatchLog, self.dispatch_log_id).status, 'sent')
+
+
+if __name__ == '__main__':
+    unittest.main()
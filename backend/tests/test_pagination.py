@@ -0,0 +1,77 @@
+import unittest
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlite_app import get_app
+from utils.pagination import PaginationError, parse_page_request
+
+
+class TestParsePageRequest(unittest.TestCase):
+    """페이지 파라미터 파싱 테스트"""
+
+    def test_defaults_and_cap(self):
+        """limit 기본값과 상한"""
+        page_request = parse_page_request({}, default_limit=50, max_limit=200)
+        self.assertEqual((page_request.after, page_request.limit, page_request.count), (None, 50, None))
+        self.assertEqual(parse_page_request({'limit': '100000'}, max_limit=200).limit, 200)
+        self.assertEqual(parse_page_request({'count': 'true'}).count, 'exact')
+
+    def test_invalid_values(self):
+        """잘못된 after/limit/count 는 PaginationError"""
+        for args in ({'after': 'x'}, {'limit': '0'}, {'limit': 'ten'}, {'count': 'maybe'}):
+            with self.assertRaises(PaginationError):
+                parse_page_request(args)
+
+
+class TestKeysetPagination(unittest.TestCase):
+    """목록 API keyset 페이지네이션 테스트"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = get_app().client()
+
+    def get(self, url):
+        response = self.client.get(url)
+        return response.status_code, json.loads(response.data)
+
+    def test_walk_pages_with_cursor(self):
+        """next_after 를 따라가면 빠짐없이 id 순서로 모든 행을 받음"""
+        ids = []
+        after = ''
+        while True:
+            status, data = self.get(f'/api/recipients?limit=10&after={after}')
+            self.assertEqual(status, 200)
+            self.assertEqual(data['count'], len(data['data']))
+            ids.extend(row['id'] for row in data['data'])
+            if not data['has_more']:
+                self.assertIsNone(data['next_after'])
+                break
+            after = data['next_after']
+        self.assertEqual(ids, list(range(1, 26)))
+        self.assertNotIn('total', data)
+
+    def test_count_on_request(self):
+        """count=exact 일 때만 전체 개수, SQLite 에서 estimate 는 exact 로 대체"""
+        _, data = self.get('/api/recipients?limit=5&count=exact')
+        self.assertEqual((data['count'], data['total'], data['next_after']), (5, 25, 5))
+        _, data = self.get('/api/recipients?limit=5&after=20&count=estimate')
+        self.assertEqual((data['count'], data['total'], data['has_more']), (5, 25, False))
+
+    def test_filtered_wills(self):
+        """user_id 필터와 함께 페이지네이션, total 도 필터 기준"""
+        _, data = self.get('/api/wills?user_id=bob&count=estimate')
+        self.assertEqual([row['id'] for row in data['data']], [3, 6])
+        self.assertEqual(data['total'], 2)
+
+    def test_invalid_parameters(self):
+        """잘못된 파라미터는 400"""
+        status, data = self.get('/api/wills?after=abc')
+        self.assertEqual(status, 400)
+        self.assertFalse(data['success'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from triggers import live_confirmation_trigger_scheduler as scheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestIdleBackoff(unittest.TestCase):
+    """유휴 시 대기 시간 조절 테스트"""
+
+    def test_doubles_until_maximum_and_resets(self):
+        """할 일이 없으면 두 배씩 늘고 최대값에서 멈추며, 일이 생기면 처음으로"""
+        backoff = scheduler.IdleBackoff(5, 30)
+        self.assertEqual([backoff.next_wait() for _ in range(5)], [5, 10, 20, 30, 30])
+        backoff.reset()
+        self.assertEqual(backoff.next_wait(), 5)
+
+
+class TestCatchUp(unittest.TestCase):
+    """catch-up 모드 판단 및 진행률 테스트"""
+
+    def test_should_catch_up(self):
+        """backlog 크기나 지연 중 하나라도 임계값 이상이면 catch-up"""
+        self.assertFalse(scheduler.should_catch_up(10, 60))
+        self.assertTrue(scheduler.should_catch_up(scheduler.CATCHUP_BACKLOG_THRESHOLD, 0))
+        self.assertTrue(scheduler.should_catch_up(1, scheduler.CATCHUP_LAG_SECONDS))
+
+    def test_progress_rate_and_eta(self):
+        """처리 속도로 남은 시간 추정, 로그 주기마다 남은 수를 DB 에서 다시 셈"""
+        clock = FakeClock()
+        progress = scheduler.CatchUpProgress(1000, log_seconds=10, clock=clock)
+        self.assertIsNone(progress.eta_seconds())
+
+        clock.now = 5.0
+        progress.advance(250)
+        self.assertEqual(progress.remaining, 750)
+        self.assertEqual(progress.rate(), 50.0)
+        self.assertEqual(progress.eta_seconds(), 15.0)
+
+        original = scheduler.count_due_backlog
+        scheduler.count_due_backlog = lambda connection: (600, None)
+        try:
+            clock.now = 10.0
+            with self.assertLogs('live_confirmation_scheduler', level='INFO') as logs:
+                progress.advance(100, connection=object())
+        finally:
+            scheduler.count_due_backlog = original
+        self.assertEqual(progress.remaining, 600)
+        self.assertIn('350 processed, 600 remaining', logs.output[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import smtplib
+import socket
+import tempfile
+import urllib.request
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from triggers import scheduler_metrics
+from triggers.scheduler_metrics import MetricsRegistry, merge_snapshots, render_prometheus, error_class
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """스케줄러 메트릭 레지스트리 테스트"""
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counters_and_gauges(self):
+        """counter 는 누적, gauge 는 마지막 값, label 별로 분리"""
+        self.registry.inc('outbox_emails_total', 3, status='sent')
+        self.registry.inc('outbox_emails_total', 2, status='sent')
+        self.registry.inc('outbox_emails_total', status='dead')
+        self.registry.set_gauge('scheduler_due_backlog', 10)
+        self.registry.set_gauge('scheduler_due_backlog', 4)
+        snapshot = self.registry.snapshot()
+        self.assertEqual(snapshot['counters'], {
+            'outbox_emails_total{status="sent"}': 5,
+            'outbox_emails_total{status="dead"}': 1,
+        })
+        self.assertEqual(snapshot['gauges'], {'scheduler_due_backlog': 4})
+
+    def test_histogram_buckets(self):
+        """관측값은 처음 맞는 버킷에 들어가고 합계/개수가 누적됨"""
+        for value in (0.002, 0.2, 0.2, 100.0):
+            self.registry.observe('smtp_send_seconds', value, buckets=(0.01, 0.5, 10.0))
+        histogram = self.registry.snapshot()['histograms']['smtp_send_seconds']
+        self.assertEqual(histogram['counts'], [1, 2, 0])
+        self.assertEqual(histogram['count'], 4)
+        self.assertAlmostEqual(histogram['sum'], 100.402)
+
+    def test_merge_and_render(self):
+        """프로세스별 스냅샷 합치기: counter/histogram 합계, gauge 최대값"""
+        other = MetricsRegistry()
+        for registry, backlog in ((self.registry, 3), (other, 7)):
+            registry.inc('scheduler_triggers_processed_total', 10)
+            registry.set_gauge('scheduler_due_backlog', backlog)
+            registry.observe('scheduler_cycle_seconds', 0.3, buckets=(0.1, 1.0))
+        merged = merge_snapshots([self.registry.snapshot(), other.snapshot()])
+        self.assertEqual(merged['counters']['scheduler_triggers_processed_total'], 20)
+        self.assertEqual(merged['gauges']['scheduler_due_backlog'], 7)
+
+        text = render_prometheus(merged)
+        self.assertIn('# TYPE scheduler_triggers_processed_total counter', text)
+        self.assertIn('scheduler_cycle_seconds_bucket{le="0.1"} 0', text)
+        self.assertIn('scheduler_cycle_seconds_bucket{le="1.0"} 2', text)
+        self.assertIn('scheduler_cycle_seconds_bucket{le="+Inf"} 2', text)
+        self.assertIn('scheduler_cycle_seconds_count 2', text)
+
+    def test_error_class(self):
+        """실패 원인 분류"""
+        self.assertEqual(error_class(smtplib.SMTPDataError(451, b'later')), 'smtp_4xx')
+        self.assertEqual(error_class(smtplib.SMTPRecipientsRefused({'a@test.local': (550, b'no')})), 'smtp_5xx')
+        self.assertEqual(error_class(socket.timeout()), 'connection')
+        self.assertEqual(error_class(ValueError('x')), 'ValueError')
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+    """stats 파일 + HTTP 엔드포인트 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.original_dir = scheduler_metrics.METRICS_DIR
+        scheduler_metrics.METRICS_DIR = self.tmp.name
+        scheduler_metrics.metrics.reset()
+
+    def tearDown(self):
+        scheduler_metrics.METRICS_DIR = self.original_dir
+        scheduler_metrics.metrics.reset()
+        self.tmp.cleanup()
+
+    def test_stats_file_is_served(self):
+        """워커가 쓴 stats 파일을 HTTP /metrics 로 노출"""
+        scheduler_metrics.metrics.inc('scheduler_triggers_processed_total', 42)
+        scheduler_metrics.write_stats_file(os.path.join(self.tmp.name, 'scheduler-worker-0.json'))
+
+        server = scheduler_metrics.serve_metrics(0)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+                body = response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertIn('scheduler_triggers_processed_total 42', body)
+
+
+if __name__ == '__main__':
+    unittest.main()
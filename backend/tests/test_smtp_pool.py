@@ -0,0 +1,100 @@
+import smtplib
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.smtp_sink import SMTPSink
+from triggers.smtp_pool import SMTPConfig, SMTPConnectionPool
+
+
+class TestSMTPConnectionPool(unittest.TestCase):
+    """SMTPConnectionPool 테스트 (로컬 SMTP 싱크 사용)"""
+
+    def setUp(self):
+        self.sink = SMTPSink().start()
+        self.pool = SMTPConnectionPool(SMTPConfig(self.sink.host, self.sink.port, pool_size=2))
+
+    def tearDown(self):
+        self.pool.close()
+        self.sink.stop()
+
+    def send(self, count):
+        for i in range(count):
+            self.pool.send('dms@test.local', [f'user{i}@test.local'], f'Subject: t\r\n\r\nbody {i}')
+
+    def test_reuses_session(self):
+        """여러 메시지를 하나의 세션으로 발송"""
+        self.send(10)
+        self.assertEqual(self.sink.messages, 10)
+        self.assertEqual(self.sink.connections, 1)
+
+    def test_reconnects_after_disconnect(self):
+        """서버 연결이 끊기면 재연결 후 재시도"""
+        self.send(1)
+        for session in self.pool._sessions:
+            session.server.close()
+        self.send(1)
+        self.assertEqual(self.sink.messages, 2)
+        self.assertEqual(self.sink.connections, 2)
+
+    def test_recycles_session_after_max_messages(self):
+        """세션당 최대 메시지 수를 넘으면 새 세션 사용"""
+        self.pool.config.max_messages_per_session = 3
+        self.send(7)
+        self.assertEqual(self.sink.messages, 7)
+        self.assertEqual(self.sink.connections, 3)
+
+    def test_credentials_without_auth_opt_in(self):
+        """SMTP_USER/SMTP_PASS 가 있어도 SMTP_AUTH 를 켜지 않으면 AUTH 없는 릴레이에 그대로 발송"""
+        pool = SMTPConnectionPool(SMTPConfig(self.sink.host, self.sink.port, user='dms', password='secret'))
+        try:
+            pool.send('dms@test.local', ['user@test.local'], 'Subject: t\r\n\r\nbody')
+        finally:
+            pool.close()
+        self.assertEqual(self.sink.messages, 1)
+
+    def test_auth_opt_in(self):
+        """SMTP_AUTH=1 이면 로그인을 시도하고 (AUTH 없는 싱크는 거부), 자격 증명 없이 켜면 설정 오류"""
+        config = SMTPConfig(self.sink.host, self.sink.port, user='dms', password='secret', auth=True)
+        pool = SMTPConnectionPool(config)
+        try:
+            with self.assertRaises(smtplib.SMTPNotSupportedError):
+                pool.send('dms@test.local', ['user@test.local'], 'Subject: t\r\n\r\nbody')
+        finally:
+            pool.close()
+        self.assertEqual(self.sink.messages, 0)
+        with self.assertRaises(ValueError):
+            SMTPConfig('smtp.test.local', 25, auth=True)
+
+    def test_env_flags_default_off(self):
+        """SMTP_AUTH / SMTP_STARTTLS 는 기본 꺼짐, '1' 이나 'true' 로 켬"""
+        original = {name: os.environ.get(name) for name in ('SMTP_USER', 'SMTP_PASS', 'SMTP_AUTH', 'SMTP_STARTTLS')}
+        try:
+            os.environ.update(SMTP_USER='dms', SMTP_PASS='secret')
+            os.environ.pop('SMTP_AUTH', None)
+            os.environ.pop('SMTP_STARTTLS', None)
+            config = SMTPConfig.from_env()
+            self.assertFalse(config.auth)
+            self.assertFalse(config.starttls)
+            os.environ.update(SMTP_AUTH='1', SMTP_STARTTLS='true')
+            config = SMTPConfig.from_env()
+            self.assertTrue(config.auth)
+            self.assertTrue(config.starttls)
+            self.assertTrue(config.for_relay('relay.test.local', 25).auth)
+        finally:
+            for name, value in original.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+    def test_config_repr_hides_password(self):
+        """설정 repr 에 비밀번호가 노출되지 않음"""
+        config = SMTPConfig('smtp.test.local', 25, user='dms', password='secret')
+        self.assertNotIn('secret', repr(config))
+
+
+if __name__ == '__main__':
+    unittest.main()
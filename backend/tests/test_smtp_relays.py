@@ -0,0 +1,96 @@
+import unittest
+import smtplib
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.smtp_sink import SMTPSink
+from triggers.smtp_pool import SMTPConfig, parse_relays
+from triggers.smtp_relays import SMTPRelayPool
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSMTPRelayPool(unittest.TestCase):
+    """다중 SMTP 릴레이 부하 분산/장애 조치 테스트 (로컬 SMTP 싱크 두 대 사용)"""
+
+    def setUp(self):
+        self.sinks = [SMTPSink().start(), SMTPSink().start()]
+        self.clock = FakeClock()
+        self.pool = None
+
+    def tearDown(self):
+        if self.pool is not None:
+            self.pool.close()
+        for sink in self.sinks:
+            sink.stop()
+
+    def make_pool(self, weights=(1, 1), **kwargs):
+        relays = [(sink.host, sink.port, weight) for sink, weight in zip(self.sinks, weights)]
+        config = SMTPConfig(self.sinks[0].host, self.sinks[0].port, pool_size=2, timeout=2, relays=relays)
+        self.pool = SMTPRelayPool(config, clock=self.clock, **kwargs)
+        return self.pool
+
+    def send(self, count):
+        for i in range(count):
+            self.pool.send('dms@test.local', [f'user{i}@test.local'], f'Subject: t\r\n\r\nbody {i}')
+
+    def test_least_outstanding_spreads_by_weight(self):
+        """진행 중 발송이 같으면 가중치 대비 보낸 양이 적은 릴레이를 선택"""
+        self.make_pool(weights=(1, 1))
+        self.send(10)
+        self.assertEqual([sink.messages for sink in self.sinks], [5, 5])
+
+    def test_weighted_round_robin(self):
+        """가중치 3:1 round-robin"""
+        self.make_pool(weights=(3, 1), strategy='round_robin')
+        self.send(8)
+        self.assertEqual([sink.messages for sink in self.sinks], [6, 2])
+
+    def test_failover_and_ejection(self):
+        """릴레이 하나가 죽어도 다른 릴레이로 모두 발송되고, 죽은 릴레이는 제외됨"""
+        pool = self.make_pool(max_failures=2)
+        self.sinks[1].stop()
+        self.send(10)
+        self.assertEqual(self.sinks[0].messages, 10)
+        self.assertFalse(pool.relays[1].is_available())
+
+    def test_ejected_relay_is_readmitted_after_probe(self):
+        """제외 시간이 지나고 probe(접속 + NOOP)에 성공하면 다시 투입"""
+        pool = self.make_pool(max_failures=1, eject_seconds=10)
+        port = self.sinks[1].port
+        self.sinks[1].stop()
+        self.send(2)
+        self.assertFalse(pool.relays[1].is_available())
+
+        pool.check_ejected()  # 아직 제외 시간 안
+        self.assertFalse(pool.relays[1].is_available())
+        self.sinks[1] = SMTPSink(port=port).start()
+        self.clock.now = 11
+        pool.check_ejected()
+        self.assertTrue(pool.relays[1].is_available())
+
+    def test_message_errors_do_not_fail_over(self):
+        """수신 거부(5xx)는 메시지 문제이므로 다른 릴레이로 보내지 않고 그대로 올림"""
+        for sink in self.sinks:
+            sink.refuse = {'gone@test.local': 550}
+        pool = self.make_pool(max_failures=1)
+        with self.assertRaises(smtplib.SMTPRecipientsRefused):
+            pool.send('dms@test.local', ['gone@test.local'], 'Subject: t\r\n\r\nbody')
+        self.assertTrue(all(relay.is_available() for relay in pool.relays))
+
+    def test_parse_relays(self):
+        """SMTP_RELAYS 파싱: 포트/가중치 생략 가능"""
+        self.assertEqual(parse_relays('postfix1:2525=3, postfix2'), [('postfix1', 2525, 3), ('postfix2', 25, 1)])
+        self.assertIsNone(parse_relays(''))
+
+
+if __name__ == '__main__':
+    unittest.main()
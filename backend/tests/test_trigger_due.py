@@ -0,0 +1,41 @@
+import unittest
+import sys
+import os
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.trigger_due import compute_due_at, is_valid_timezone
+
+
+class TestComputeDueAt(unittest.TestCase):
+    """트리거 발송 예정 시각(UTC) 계산 테스트"""
+
+    def test_date_trigger_is_next_local_midnight_in_utc(self):
+        """사용자 시간대의 trigger_date 다음 날 00:00 을 UTC 로 변환"""
+        self.assertEqual(compute_due_at(date(2025, 3, 9), timezone_name='Asia/Seoul'), datetime(2025, 3, 9, 15, 0))
+        self.assertEqual(compute_due_at(date(2025, 3, 9), timezone_name='UTC'), datetime(2025, 3, 10, 0, 0))
+
+    def test_dst_is_applied(self):
+        """서머타임 적용 시간대는 날짜별 오프셋을 사용"""
+        self.assertEqual(compute_due_at(date(2025, 1, 14), timezone_name='America/New_York'), datetime(2025, 1, 15, 5, 0))
+        self.assertEqual(compute_due_at(date(2025, 7, 14), timezone_name='America/New_York'), datetime(2025, 7, 15, 4, 0))
+
+    def test_triggered_is_due_now(self):
+        """발동된 트리거는 즉시 due"""
+        now = datetime(2025, 3, 10, 1, 2, 3)
+        self.assertEqual(compute_due_at(date(2030, 1, 1), True, 'Asia/Seoul', now=now), now)
+
+    def test_no_date_and_not_triggered(self):
+        """날짜도 없고 발동되지 않았으면 예정 시각 없음"""
+        self.assertIsNone(compute_due_at(None))
+
+    def test_unknown_timezone_falls_back_to_default(self):
+        """잘못된 시간대는 기본 시간대로 계산"""
+        self.assertFalse(is_valid_timezone('Mars/Olympus'))
+        self.assertTrue(is_valid_timezone('Asia/Seoul'))
+        self.assertEqual(compute_due_at(date(2025, 3, 9), timezone_name='Mars/Olympus'), compute_due_at(date(2025, 3, 9)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,268 @@
+import unittest
+from collections import namedtuple
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, text
+
+from test_config import TestConfig
+from triggers import live_confirmation_trigger_scheduler as scheduler
+from triggers import will_release
+from triggers.email_outbox import (
+    DISPATCH_TYPE_LIVE_CONFIRMATION, DISPATCH_TYPE_WILL_RELEASE, enqueue_emails, outbox_message,
+)
+
+WillRow = namedtuple('WillRow', 'id subject body user_id firstname lastname grade')
+PendingRow = namedtuple('PendingRow', 'id recipient_id recipient_email recipient_name')
+
+
+class FakeResult:
+    def __init__(self, rows=(), rowcount=0):
+        self.rows = list(rows)
+        self.rowcount = rowcount
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    """recipients 테이블을 흉내내 fan-out 쿼리에 응답하고 실행한 문장을 기록"""
+
+    def __init__(self, recipient_count):
+        self.pending = [
+            PendingRow(1000 + i, i, f"r{i}@test.local", f"수신자{i}" if i % 2 else None)
+            for i in range(recipient_count)
+        ]
+        self.statements = []
+        self.outbox = []
+
+    def execute(self, statement, params=None):
+        sql = ' '.join(str(statement).split())
+        self.statements.append(sql)
+        if sql.startswith('SELECT w.id'):
+            return FakeResult([WillRow(7, '마지막 인사', '고마웠어요', 'owner', '길동', '홍', 'Gol')])
+        if sql.startswith('INSERT IGNORE INTO dispatch_log'):
+            return FakeResult(rowcount=len(self.pending))
+        if sql.startswith('SELECT d.id'):
+            remaining = [row for row in self.pending if row.id > params['after_id']]
+            return FakeResult(remaining[:params['batch_size']])
+        if sql.startswith('INSERT IGNORE INTO email_outbox'):
+            self.outbox.extend(params)
+        return FakeResult()
+
+    def commit(self):
+        pass
+
+
+class TestWillReleaseFanOut(unittest.TestCase):
+    """유언장 공개 fan-out 테스트"""
+
+    def test_fan_out_batches_without_n_plus_one(self):
+        """수신자 수와 무관하게 배치 수만큼만 쿼리하고 dispatch_log 는 한 문장으로 생성"""
+        connection = FakeConnection(2500)
+        total = will_release.fan_out_will(connection, 7, trigger_id=3, batch_size=1000)
+
+        self.assertEqual(total, 2500)
+        self.assertEqual(len(connection.outbox), 2500)
+        inserts = [sql for sql in connection.statements if sql.startswith('INSERT IGNORE INTO')]
+        self.assertEqual(len(inserts), 1 + 3)  # dispatch_log 1 + 아웃박스 배치 3
+        self.assertEqual(sum(sql.startswith('SELECT d.id') for sql in connection.statements), 4)
+        self.assertTrue(connection.statements[-1].startswith('UPDATE wills SET released_at'))
+
+    def test_outbox_rows_point_at_dispatch_log(self):
+        """아웃박스 행은 미리 만든 dispatch_log 를 가리키고 수신자별로 렌더링됨"""
+        connection = FakeConnection(2)
+        original = will_release.WILL_RELEASE_GREET_BY_NAME
+        will_release.WILL_RELEASE_GREET_BY_NAME = True
+        try:
+            will_release.fan_out_will(connection, 7, trigger_id=3)
+        finally:
+            will_release.WILL_RELEASE_GREET_BY_NAME = original
+
+        first, second = connection.outbox
+        self.assertEqual(first['dispatch_log_id'], 1000)
+        self.assertEqual(first['dispatch_type'], DISPATCH_TYPE_WILL_RELEASE)
+        self.assertEqual(first['recipient_id'], 0)
+        self.assertEqual(first['trigger_id'], 3)
+        self.assertEqual(first['priority'], 1)  # 주인 등급(Gol) 순서
+        self.assertEqual(first['subject'], '마지막 인사')
+        self.assertTrue(first['body'].startswith('안녕하세요'))
+        self.assertTrue(second['body'].startswith('수신자1 님께'))
+        self.assertIn('홍길동 님이', second['body'])
+        self.assertIn('고마웠어요', second['body'])
+
+    def test_identical_bodies_without_names(self):
+        """이름 인사말을 끄면 모든 수신자의 본문이 같아 도메인별로 묶어 보낼 수 있음"""
+        connection = FakeConnection(3)
+        will_release.fan_out_will(connection, 7)
+        self.assertEqual(len({row['body'] for row in connection.outbox}), 1)
+
+
+# fan-out / 미응답 판정 / 트리거 예약 SQL 이 읽고 쓰는 테이블만 세션 임시 테이블로 만든다 (실제 테이블을 가림)
+MYSQL_TEMP_TABLES = [
+    """CREATE TEMPORARY TABLE UserInfo (
+        id INT PRIMARY KEY AUTO_INCREMENT, user_id VARCHAR(50) NOT NULL, email VARCHAR(255),
+        firstname VARCHAR(50), lastname VARCHAR(50), grade VARCHAR(10), last_seen_at DATETIME
+    )""",
+    """CREATE TEMPORARY TABLE wills (
+        id INT PRIMARY KEY AUTO_INCREMENT, user_id VARCHAR(50) NOT NULL, subject VARCHAR(255), body TEXT,
+        released_at DATETIME NULL
+    )""",
+    """CREATE TEMPORARY TABLE triggers (
+        id INT PRIMARY KEY AUTO_INCREMENT, user_id VARCHAR(50) NOT NULL,
+        status ENUM('pending', 'completed', 'failed') DEFAULT 'pending',
+        updated_at DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+        claim_token VARCHAR(36), claim_expires_at DATETIME, due_at DATETIME
+    )""",
+    """CREATE TEMPORARY TABLE recipients (
+        id INT PRIMARY KEY AUTO_INCREMENT, will_id INT NOT NULL, recipient_email VARCHAR(255),
+        recipient_name VARCHAR(100)
+    )""",
+    """CREATE TEMPORARY TABLE dispatch_log (
+        id INT PRIMARY KEY AUTO_INCREMENT, will_id INT NOT NULL, recipient_id INT NULL, sent_at DATETIME,
+        delivered_at DATETIME, read_at DATETIME,
+        status ENUM('pending', 'sent', 'delivered', 'read', 'failed') DEFAULT 'pending', type TINYINT NOT NULL, confirm_token VARCHAR(64) NULL,
+        UNIQUE INDEX uq_dispatch_log_will_recipient_type (will_id, recipient_id, type),
+        UNIQUE INDEX uq_dispatch_log_confirm_token (confirm_token)
+    )""",
+    """CREATE TEMPORARY TABLE email_outbox (
+        id BIGINT PRIMARY KEY AUTO_INCREMENT, trigger_id INT NULL, will_id INT NOT NULL, recipient_id INT NULL,
+        dispatch_log_id INT NULL, dispatch_type TINYINT NOT NULL DEFAULT 1, priority TINYINT NOT NULL DEFAULT 3,
+        to_email VARCHAR(255) NOT NULL, subject VARCHAR(255), body MEDIUMTEXT,
+        status ENUM('pending', 'sending', 'sent', 'dead') NOT NULL DEFAULT 'pending', sent_at DATETIME,
+        UNIQUE INDEX idx_outbox_dispatch_log (dispatch_log_id)
+    )""",
+]
+
+
+class TestWillReleaseMySQL(unittest.TestCase):
+    """테스트 MySQL(TestConfig) 에서 실제 SQL 로 확인 (접속할 수 없으면 건너뜀)"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine(TestConfig.SQLALCHEMY_DATABASE_URI, connect_args={'connect_timeout': 2})
+        try:
+            cls.engine.connect().close()
+        except Exception as e:
+            cls.engine.dispose()
+            raise unittest.SkipTest(f'test MySQL unavailable: {type(e).__name__}')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.engine.dispose()
+
+    def setUp(self):
+        self.connection = self.engine.connect()
+        for statement in MYSQL_TEMP_TABLES:
+            self.connection.execute(text(statement))
+        self.connection.execute(text("""
+            INSERT INTO UserInfo (user_id, email, grade, last_seen_at)
+            VALUES ('owner', 'owner@test.local', 'Gol', NOW() - INTERVAL 10 DAY)
+        """))
+        self.connection.execute(text("INSERT INTO wills (id, user_id, subject, body) VALUES (7, 'owner', '마지막 인사', '고마웠어요')"))
+        self.connection.execute(text("""
+            INSERT INTO recipients (will_id, recipient_email, recipient_name)
+            VALUES (7, 'a@test.local', 'A'), (7, 'b@test.local', 'B'), (7, 'c@test.local', 'C')
+        """))
+        self.connection.commit()
+
+    def tearDown(self):
+        # 세션을 끊으면 임시 테이블도 사라짐
+        self.connection.invalidate()
+        self.connection.close()
+
+    def count(self, sql):
+        value = self.connection.execute(text(sql)).scalar()
+        self.connection.commit()
+        return value
+
+    def test_repeated_fan_out_writes_one_message_per_recipient(self):
+        """두 번 fan-out 하거나 같은 배치를 다시 기록해도 수신자마다 dispatch_log / 아웃박스 한 건"""
+        self.assertEqual(will_release.fan_out_will(self.connection, 7), 3)
+        self.connection.execute(text("UPDATE wills SET released_at = NULL WHERE id = 7"))
+        self.assertEqual(will_release.fan_out_will(self.connection, 7), 0)
+
+        # 다른 워커가 같은 pending 배치를 동시에 읽어 기록하는 경우
+        rows = self.connection.execute(text("SELECT id, recipient_id FROM dispatch_log ORDER BY id")).fetchall()
+        enqueue_emails(self.connection, [
+            outbox_message('dup@test.local', 's', 'b', 7, recipient_id=row.recipient_id,
+                           dispatch_type=DISPATCH_TYPE_WILL_RELEASE, dispatch_log_id=row.id)
+            for row in rows
+        ], ignore_duplicates=True)
+        self.connection.commit()
+
+        self.assertEqual(self.count("SELECT COUNT(*) FROM dispatch_log"), 3)
+        self.assertEqual(self.count("SELECT COUNT(*) FROM email_outbox"), 3)
+        self.assertEqual(self.count("SELECT COUNT(*) FROM email_outbox WHERE to_email = 'dup@test.local'"), 0)
+
+    def test_claim_skips_triggers_without_will(self):
+        """유언장이 없는 사용자의 트리거는 예약하지 않고 pending 으로 두고, 사용자가 없는 트리거만 failed"""
+        self.connection.execute(text("INSERT INTO UserInfo (user_id, email) VALUES ('nowill', 'nowill@test.local')"))
+        self.connection.execute(text("""
+            INSERT INTO triggers (id, user_id, due_at) VALUES
+            (1, 'owner', UTC_TIMESTAMP() - INTERVAL 1 HOUR),
+            (2, 'nowill', UTC_TIMESTAMP() - INTERVAL 1 HOUR),
+            (3, 'ghost', UTC_TIMESTAMP() - INTERVAL 1 HOUR)
+        """))
+        self.connection.commit()
+
+        self.assertEqual(sorted(scheduler.claim_due_triggers(self.connection, 'token')), [1, 3])
+        rows = self.connection.execute(text("SELECT id, status, claim_token FROM triggers ORDER BY id")).fetchall()
+        self.connection.commit()
+        self.assertEqual([tuple(row) for row in rows], [
+            (1, 'pending', 'token'), (2, 'pending', None), (3, 'failed', None),
+        ])
+
+        # 유언장을 만들면 다음 예약에서 가져감
+        self.connection.execute(text("INSERT INTO wills (user_id, subject, body) VALUES ('nowill', 's', 'b')"))
+        self.connection.commit()
+        self.assertEqual(scheduler.claim_due_triggers(self.connection, 'token2'), [2])
+
+    def send_confirmation(self, hours_ago):
+        """hours_ago 시간 전에 발송된 live confirmation (링크용 dispatch_log + 아웃박스 행), dispatch_log id 반환"""
+        dispatch_log_id = self.connection.execute(text("""
+            INSERT INTO dispatch_log (will_id, recipient_id, sent_at, status, type)
+            VALUES (7, NULL, NOW() - INTERVAL :hours HOUR, 'sent', :type)
+        """), {"hours": hours_ago, "type": DISPATCH_TYPE_LIVE_CONFIRMATION}).lastrowid
+        self.connection.execute(text("""
+            INSERT INTO email_outbox (trigger_id, will_id, dispatch_log_id, dispatch_type, to_email, status, sent_at)
+            VALUES (3, 7, :dispatch_log_id, :type, 'owner@test.local', 'sent', NOW() - INTERVAL :hours HOUR)
+        """), {"dispatch_log_id": dispatch_log_id, "type": DISPATCH_TYPE_LIVE_CONFIRMATION, "hours": hours_ago})
+        self.connection.commit()
+        return dispatch_log_id
+
+    def click(self, dispatch_log_id, hours_ago):
+        """확인 링크 클릭 (라우트처럼 DB 시계로 read_at 기록)"""
+        self.connection.execute(text("""
+            UPDATE dispatch_log SET read_at = NOW() - INTERVAL :hours HOUR, status = 'read' WHERE id = :id
+        """), {"id": dispatch_log_id, "hours": hours_ago})
+        self.connection.commit()
+
+    def test_unanswered_confirmation_releases_will(self):
+        """grace 가 지나도록 링크를 누르지 않으면 공개"""
+        self.send_confirmation(hours_ago=will_release.WILL_RELEASE_GRACE_HOURS + 1)
+        self.assertEqual(will_release.find_unconfirmed_wills(self.connection), [(7, 3)])
+        self.assertEqual(will_release.release_unconfirmed_wills(self.connection), 1)
+        self.assertEqual(self.count("SELECT COUNT(*) FROM email_outbox WHERE dispatch_type = 2"), 3)
+
+    def test_click_within_grace_stops_release(self):
+        """grace 안에 링크를 누르면 공개하지 않음"""
+        grace = will_release.WILL_RELEASE_GRACE_HOURS
+        self.click(self.send_confirmation(hours_ago=grace + 1), hours_ago=grace - 10)
+        self.assertEqual(will_release.find_unconfirmed_wills(self.connection), [])
+        self.assertEqual(will_release.release_unconfirmed_wills(self.connection), 0)
+        self.assertEqual(self.count("SELECT COUNT(*) FROM email_outbox WHERE dispatch_type = 2"), 0)
+
+    def test_click_before_send_result_is_recorded(self):
+        """발송 결과(sent_at) 기록보다 먼저 눌렀어도 그 메일의 링크면 응답으로 봄"""
+        grace = will_release.WILL_RELEASE_GRACE_HOURS
+        self.click(self.send_confirmation(hours_ago=grace + 1), hours_ago=grace + 2)
+        self.assertEqual(will_release.find_unconfirmed_wills(self.connection), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+수신 도메인별 발송 속도 제한 (token bucket)
+- 도메인마다 bucket 하나: 초당 rate 개 토큰이 차고 burst 개까지 모임, 수신자 1명 = 토큰 1개
+- 토큰이 없는 도메인의 메시지는 기다리지 않고 아웃박스로 돌려보내(next_attempt_at 만 미룸)
+  다른 도메인 발송을 막지 않음
+- 4xx(421 포함) 응답을 받으면 그 도메인의 rate 를 절반으로 줄이고(최소 min_rate),
+  성공할 때마다 설정값까지 조금씩 되돌림 (AIMD)
+- 설정
+  SMTP_DOMAIN_RATE / SMTP_DOMAIN_BURST : 기본 초당 발송 수 / 최대 burst (발송 프로세스 하나 기준)
+  SMTP_DOMAIN_RATES                    : 도메인별 rate, 예) "gmail.com=5,naver.com=20"
+  SMTP_DOMAIN_MIN_RATE                 : 4xx 백오프 하한
+  (rate/burst 는 모두 0 보다 커야 하며, 아니면 만들 때 ValueError)
+"""
+
+import logging
+import os
+import threading
+import time
+
+from triggers.scheduler_metrics import metrics
+
+logger = logging.getLogger("live_confirmation_scheduler.throttle")
+
+# 성공한 트랜잭션마다 설정 rate 의 이 비율만큼 회복
+RECOVERY_FRACTION = 0.05
+
+
+def require_positive(name, value):
+    """value 가 0 보다 큰지 확인 (rate 0 은 대기 시간 계산에서 0 으로 나누게 됨)"""
+    if not value > 0:
+        raise ValueError(f"{name} must be greater than 0, got {value!r}")
+    return value
+
+
+def parse_domain_rates(value):
+    """'gmail.com=5,naver.com=20' -> {'gmail.com': 5.0, 'naver.com': 20.0}"""
+    rates = {}
+    for item in (value or '').split(','):
+        domain, _, rate = item.partition('=')
+        if domain.strip() and rate.strip():
+            rates[domain.strip().lower()] = float(rate)
+    return rates
+
+
+class TokenBucket:
+    """초당 rate 개씩 차고 burst 개까지 모이는 토큰 버킷"""
+
+    def __init__(self, rate, burst, clock=time.monotonic):
+        require_positive('rate', rate)
+        require_positive('burst', burst)
+        self.configured_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens=1):
+        """토큰을 가져가면 0.0, 부족하면 가져갈 수 있을 때까지 남은 시간(초)을 반환합니다.
+
+        burst 보다 큰 요청은 버킷이 가득 찼을 때 한 번에 허용한다 (묶음 발송 하나가 영원히 막히지 않도록).
+        """
+        self._refill()
+        needed = min(tokens, self.burst)
+        if self.tokens >= needed:
+            self.tokens -= tokens
+            return 0.0
+        return (needed - self.tokens) / self.rate
+
+
+class DomainThrottle:
+    """도메인별 TokenBucket 모음 (스레드 안전)"""
+
+    def __init__(self, default_rate=10.0, burst=20.0, domain_rates=None, min_rate=0.2, clock=time.monotonic):
+        # 잘못된 설정은 발송 중 스레드가 죽기 전에 여기서 알 수 있도록
+        require_positive('SMTP_DOMAIN_RATE', default_rate)
+        require_positive('SMTP_DOMAIN_BURST', burst)
+        require_positive('SMTP_DOMAIN_MIN_RATE', min_rate)
+        for domain, rate in (domain_rates or {}).items():
+            require_positive(f'SMTP_DOMAIN_RATES[{domain}]', rate)
+        self.default_rate = default_rate
+        self.burst = burst
+        self.domain_rates = domain_rates or {}
+        self.min_rate = min_rate
+        self.clock = clock
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            default_rate=float(os.environ.get('SMTP_DOMAIN_RATE', '10')),
+            burst=float(os.environ.get('SMTP_DOMAIN_BURST', '20')),
+            domain_rates=parse_domain_rates(os.environ.get('SMTP_DOMAIN_RATES')),
+            min_rate=float(os.environ.get('SMTP_DOMAIN_MIN_RATE', '0.2')),
+        )
+
+    def _bucket(self, domain):
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            rate = self.domain_rates.get(domain, self.default_rate)
+            bucket = self._buckets[domain] = TokenBucket(rate, max(self.burst, 1.0), self.clock)
+        return bucket
+
+    def acquire(self, domain, count=1):
+        """domain 으로 count 명에게 보낼 토큰을 가져옵니다. 0.0 이면 발송, 아니면 그만큼 뒤에 다시 시도."""
+        with self._lock:
+            return self._bucket(domain).try_acquire(count)
+
+    def on_throttled(self, domain):
+        """4xx 응답: rate 를 절반으로 (최소 min_rate)"""
+        with self._lock:
+            bucket = self._bucket(domain)
+            rate = max(self.min_rate, bucket.rate / 2)
+            if rate != bucket.rate:
+                logger.warning(f"Throttling {domain}: {bucket.rate:.2f} -> {rate:.2f} msg/s after 4xx")
+            bucket.rate = rate
+        metrics.set_gauge('smtp_domain_rate', rate, domain=domain)
+
+    def on_success(self, domain):
+        """성공: 설정 rate 까지 조금씩 회복"""
+        with self._lock:
+            bucket = self._bucket(domain)
+            if bucket.rate >= bucket.configured_rate:
+                return
+            bucket.rate = min(bucket.configured_rate, bucket.rate + bucket.configured_rate * RECOVERY_FRACTION)
+            rate = bucket.rate
+        metrics.set_gauge('smtp_domain_rate', rate, domain=domain)
+
+    def rate(self, domain):
+        with self._lock:
+            return self._bucket(domain).rate
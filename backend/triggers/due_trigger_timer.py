@@ -0,0 +1,161 @@
+"""
+pending 트리거의 발송 예정 시각을 메모리 min-heap 으로 관리하는 타이머
+- 시작 시 발송 예정 시각이 가장 이른 pending 트리거를 최대 capacity 개까지 적재
+  (server-side cursor 로 청크 단위 스트리밍, backlog 가 수백만 건이어도 메모리 일정)
+- 이후 triggers.updated_at 커서로 변경분만 증분 반영
+- 적재 범위(horizon) 밖의 트리거는 범위 안의 트리거가 모두 처리된 뒤 다시 적재
+- 커서가 놓친 변경(커서보다 늦게 커밋된 행)에 대비해 RELOAD_SECONDS 마다 전체를 다시 적재
+- 스케줄러는 다음 예정 시각까지만 sleep 하면 됨
+- 예정 시각은 triggers.due_at (UTC, 저장 시 계산) 을 그대로 사용
+"""
+
+import heapq
+import os
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+# 메모리에 올릴 최대 트리거 수
+TIMER_CAPACITY = int(os.environ.get('SCHEDULER_TIMER_CAPACITY', '10000'))
+# server-side cursor 로 한 번에 받아올 행 수
+STREAM_CHUNK_SIZE = int(os.environ.get('SCHEDULER_STREAM_CHUNK_SIZE', '1000'))
+STREAM_OPTIONS = {"stream_results": True, "yield_per": STREAM_CHUNK_SIZE}
+# 증분 반영과 별개로 (status, due_at) 쿼리로 전체를 다시 적재하는 주기(초)
+RELOAD_SECONDS = float(os.environ.get('SCHEDULER_TIMER_RELOAD_SECONDS', '300'))
+
+
+class DueTriggerTimer:
+    """트리거 ID별 발송 예정 시각(due) 타이머
+
+    heap 에는 (due, trigger_id) 가 들어가며, 트리거가 변경/완료되면 새 항목을
+    push 하고 이전 항목은 pop 시점에 버린다 (lazy deletion).
+
+    capacity 개를 넘는 pending 트리거가 있으면 가장 이른 capacity 개만 들고
+    마지막으로 적재한 due 를 horizon 으로 기억한다. horizon 이후의 트리거는
+    메모리에 없지만 모두 horizon 보다 늦으므로 다음 예정 시각 계산에는 영향이 없다.
+
+    updated_at 은 UPDATE 실행 시각이라 커서보다 이른 값으로 늦게 커밋된 행은
+    증분 조회에 걸리지 않는다. 그런 행도 reload_seconds 안에는 반영되도록
+    주기적으로 load() 를 다시 실행한다.
+    """
+
+    def __init__(self, capacity=None, reload_seconds=None, clock=time.monotonic):
+        self.capacity = capacity or TIMER_CAPACITY
+        self.reload_seconds = RELOAD_SECONDS if reload_seconds is None else reload_seconds
+        self._clock = clock
+        self._reload_at = None
+        self._heap = []
+        self._due_by_id = {}
+        self._cursor = None
+        self._horizon = None
+        self._clock_offset = timedelta(0)
+
+    def now(self):
+        """DB 서버 시계 기준 현재 UTC 시각"""
+        return datetime.now() + self._clock_offset
+
+    def __len__(self):
+        return len(self._due_by_id)
+
+    def load(self, connection):
+        """발송 예정 시각이 가장 이른 pending 트리거를 적재하고 변경 커서를 초기화합니다.
+
+        due_at 은 UTC, updated_at 커서는 DB 세션 시간대(NOW()) 기준이다.
+        (status, due_at) 인덱스 순서대로 server-side cursor 로 읽으므로 정렬이나
+        전체 결과 버퍼링이 없다.
+        """
+        db_now, db_utc_now = connection.execute(text("SELECT NOW(), UTC_TIMESTAMP()")).fetchone()
+        self._clock_offset = db_utc_now - datetime.now()
+
+        self._heap = []
+        self._due_by_id = {}
+        self._horizon = None
+        self._cursor = db_now
+        self._reload_at = self._clock() + self.reload_seconds
+        result = connection.execute(text("""
+            SELECT id, due_at, updated_at FROM triggers
+            WHERE status = 'pending' AND due_at IS NOT NULL
+            ORDER BY due_at
+            LIMIT :capacity
+        """), {"capacity": self.capacity}, execution_options=STREAM_OPTIONS)
+        last_due = None
+        for trigger_id, due_at, updated_at in result:
+            self._due_by_id[trigger_id] = due_at
+            self._heap.append((due_at, trigger_id))
+            last_due = due_at
+            if updated_at and updated_at > self._cursor:
+                self._cursor = updated_at
+        connection.commit()
+
+        if len(self._due_by_id) >= self.capacity:
+            self._horizon = last_due
+        heapq.heapify(self._heap)
+
+    def refresh(self, connection):
+        """마지막 커서 이후 변경된 트리거만 조회해 heap 에 반영합니다.
+
+        같은 초에 커밋된 변경을 놓치지 않도록 커서와 같은 시각도 다시 읽는다
+        (같은 트리거를 다시 반영해도 결과는 동일).
+        """
+        if (self._cursor is None or self._clock() >= self._reload_at
+                or (self._horizon is not None and self.next_due() is None)):
+            # 처음이거나, 전체를 다시 읽을 주기가 됐거나,
+            # 적재 범위 안의 트리거를 모두 처리해 다음 범위를 읽을 차례
+            self.load(connection)
+            return 0
+
+        result = connection.execute(text("""
+            SELECT id, due_at, status, updated_at FROM triggers
+            WHERE updated_at >= :cursor
+        """), {"cursor": self._cursor}, execution_options=STREAM_OPTIONS)
+        changed = 0
+        for trigger_id, due_at, status, updated_at in result:
+            if status == 'pending':
+                self._set(trigger_id, due_at)
+            else:
+                self._due_by_id.pop(trigger_id, None)
+            if updated_at and updated_at > self._cursor:
+                self._cursor = updated_at
+            changed += 1
+        connection.commit()
+        return changed
+
+    def _set(self, trigger_id, due):
+        if due is None or (self._horizon is not None and due > self._horizon):
+            # 예정 시각이 없거나 적재 범위 밖: 범위를 다시 읽을 때 반영된다
+            self._due_by_id.pop(trigger_id, None)
+            return
+        if self._due_by_id.get(trigger_id) == due:
+            return
+        self._due_by_id[trigger_id] = due
+        heapq.heappush(self._heap, (due, trigger_id))
+
+    def next_due(self):
+        """가장 이른 발송 예정 시각 (없으면 None)"""
+        while self._heap:
+            due, trigger_id = self._heap[0]
+            if self._due_by_id.get(trigger_id) == due:
+                return due
+            heapq.heappop(self._heap)  # 변경/완료된 트리거의 오래된 항목
+        return None
+
+    def has_due(self, now=None):
+        due = self.next_due()
+        return due is not None and due <= (now or self.now())
+
+    def due_backlog(self, now=None):
+        """(이미 due 된 트리거 수, 그중 가장 이른 예정 시각)
+
+        적재 범위가 잘려 있으면(horizon) 트리거 수는 capacity 를 넘지 않는 하한값이다.
+        """
+        now = now or self.now()
+        due = [due_at for due_at in self._due_by_id.values() if due_at <= now]
+        return len(due), (min(due) if due else None)
+
+    def seconds_until_next_due(self, now=None):
+        """다음 예정 시각까지 남은 초 (이미 지났으면 0, 예정된 트리거가 없으면 None)"""
+        due = self.next_due()
+        if due is None:
+            return None
+        return max(0.0, (due - (now or self.now())).total_seconds())
@@ -0,0 +1,494 @@
+"""
+이메일 아웃박스 (email_outbox 테이블)
+- 스케줄러는 트리거 상태 전이와 같은 트랜잭션에서 아웃박스 행만 기록 (enqueue_emails)
+- 별도 발송 워커가 아웃박스를 비우며 SMTP 로 발송 (drain_outbox)
+- SMTP 4xx/연결 오류는 지수 백오프 후 재시도, 5xx 는 dead-letter 처리
+- 발송 중(sending) 행은 visibility timeout 이 지나면 다른 워커가 다시 가져감
+- 같은 도메인/같은 내용 수신자는 한 SMTP 트랜잭션으로 묶고, 도메인별 token bucket 으로 속도 제한
+"""
+
+import math
+import os
+import random
+import smtplib
+import time
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import text, bindparam
+
+from triggers.domain_throttle import DomainThrottle
+from triggers.email_templates import MessageSkeleton
+from triggers.smtp_pool import SMTPConfig
+from triggers.smtp_relays import SMTPRelayPool
+from triggers.scheduler_metrics import metrics, error_class
+
+logger = logging.getLogger("live_confirmation_scheduler.outbox")
+
+# dispatch_log.type 값
+DISPATCH_TYPE_LIVE_CONFIRMATION = 1
+DISPATCH_TYPE_WILL_RELEASE = 2
+
+# 발송 레인: 레인마다 발송 워커를 따로 두어 대량 유언장 공개가 몇 분 안에 만료되는
+# live confirmation 링크를 늦추지 않게 한다. 레인 이름 -> dispatch_type (우선순위 순)
+LANE_CONFIRMATION = 'confirmation'
+LANE_RELEASE = 'release'
+LANES = {
+    LANE_CONFIRMATION: DISPATCH_TYPE_LIVE_CONFIRMATION,
+    LANE_RELEASE: DISPATCH_TYPE_WILL_RELEASE,
+}
+LANE_BY_DISPATCH_TYPE = {dispatch_type: lane for lane, dispatch_type in LANES.items()}
+
+# 레인 안에서는 멤버십 등급 순으로 발송 (email_outbox.priority, 작을수록 먼저)
+GRADE_PRIORITY = {'Pre': 0, 'Gol': 1, 'Sta': 2}
+DEFAULT_PRIORITY = len(GRADE_PRIORITY)
+
+
+def grade_priority(grade):
+    return GRADE_PRIORITY.get(grade, DEFAULT_PRIORITY)
+
+# 아웃박스 발송 설정
+OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE', '200'))
+OUTBOX_VISIBILITY_SECONDS = int(os.environ.get('OUTBOX_VISIBILITY_SECONDS', '300'))
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS', '8'))
+OUTBOX_BACKOFF_BASE_SECONDS = float(os.environ.get('OUTBOX_BACKOFF_BASE_SECONDS', '30'))
+OUTBOX_BACKOFF_MAX_SECONDS = float(os.environ.get('OUTBOX_BACKOFF_MAX_SECONDS', '3600'))
+
+# SMTP 설정은 시작 시 한 번만 읽는다
+SMTP_CONFIG = SMTPConfig.from_env()
+_smtp_pool = None
+_smtp_pool_pid = None
+_message_skeleton = None
+# 수신 도메인별 발송 속도 제한 (발송 프로세스마다 따로 관리)
+_domain_throttle = None
+_domain_throttle_pid = None
+
+
+def get_message_skeleton():
+    """발신자 헤더까지 미리 만든 메시지 틀 (SMTP_CONFIG 가 바뀌면 새로 만든다)"""
+    global _message_skeleton
+    if _message_skeleton is None or _message_skeleton.sender != SMTP_CONFIG.user:
+        _message_skeleton = MessageSkeleton(SMTP_CONFIG.user)
+    return _message_skeleton
+
+
+def get_smtp_pool():
+    """프로세스별 SMTP 릴레이/커넥션 풀 (fork 된 워커는 소켓을 공유하지 않도록 새로 만든다)"""
+    global _smtp_pool, _smtp_pool_pid
+    if _smtp_pool is None or _smtp_pool_pid != os.getpid():
+        _smtp_pool = SMTPRelayPool(SMTP_CONFIG)
+        _smtp_pool_pid = os.getpid()
+        logger.info(f"SMTP pool created: {SMTP_CONFIG!r}")
+    return _smtp_pool
+
+
+def get_domain_throttle():
+    global _domain_throttle, _domain_throttle_pid
+    if _domain_throttle is None or _domain_throttle_pid != os.getpid():
+        _domain_throttle = DomainThrottle.from_env()
+        _domain_throttle_pid = os.getpid()
+    return _domain_throttle
+
+
+# 이메일 발송 함수
+def send_email(to_email, subject, body):
+    return send_group_email([to_email], subject, body)
+
+
+def send_group_email(to_emails, subject, body):
+    """같은 메시지를 한 SMTP 트랜잭션(RCPT TO 여러 번)으로 발송합니다.
+
+    일부 수신자만 거부되면 {주소: (코드, 응답)} dict 를 반환하고,
+    전원 거부되거나 트랜잭션이 실패하면 예외를 올린다.
+    """
+    msg = get_message_skeleton().build(to_emails, subject, body)
+
+    try:
+        refused = get_smtp_pool().send(SMTP_CONFIG.user, to_emails, msg)
+        logger.debug(f"[SMTP] sent to {len(to_emails)} recipients ({to_emails[0]}...)")
+        return refused or {}
+    except Exception as e:
+        logger.error(f"[SMTP ERROR] {type(e).__name__}: {e}")
+        raise
+
+
+# 트랜잭션당 수신자 수 histogram 버킷
+RECIPIENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 500)
+
+# 동시 SMTP 발송 수 (기본: 릴레이 수 x 릴레이당 SMTP 풀 크기)
+SEND_CONCURRENCY = int(os.environ.get(
+    'SCHEDULER_SEND_CONCURRENCY', str(SMTP_CONFIG.pool_size * len(SMTP_CONFIG.relays))
+))
+_send_executor = None
+_send_executor_pid = None
+
+
+def get_send_executor():
+    """프로세스별 발송 스레드 풀"""
+    global _send_executor, _send_executor_pid
+    if _send_executor is None or _send_executor_pid != os.getpid():
+        _send_executor = ThreadPoolExecutor(max_workers=SEND_CONCURRENCY, thread_name_prefix='smtp-send')
+        _send_executor_pid = os.getpid()
+    return _send_executor
+
+
+def timed_send_group_email(to_emails, subject, body):
+    """send_group_email 을 실행하고 (걸린 시간(초), 거부된 수신자 dict) 를 반환합니다."""
+    started = time.perf_counter()
+    refused = send_group_email(to_emails, subject, body)
+    return time.perf_counter() - started, refused
+
+
+def recipient_domain(email):
+    return email.rpartition('@')[2].lower()
+
+
+def group_by_domain(messages, max_recipients=None):
+    """수신 도메인과 제목/본문이 같은 메시지를 max_recipients 개씩 묶은 목록
+
+    묶인 메시지는 한 SMTP 트랜잭션으로 발송된다. 내용이 다르면 따로 발송한다.
+    """
+    if max_recipients is None:
+        max_recipients = SMTP_CONFIG.max_recipients_per_message
+    max_recipients = max(1, max_recipients)
+    groups = {}
+    for message in messages:
+        key = (recipient_domain(message.to_email), message.subject, message.body)
+        groups.setdefault(key, []).append(message)
+    return [
+        group[offset:offset + max_recipients]
+        for group in groups.values()
+        for offset in range(0, len(group), max_recipients)
+    ]
+
+
+def percentile(values, pct):
+    """정렬된 값에서 nearest-rank 백분위수"""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    rank = max(0, min(len(values) - 1, math.ceil(pct / 100.0 * len(values)) - 1))
+    return values[rank]
+
+
+def is_permanent_failure(error):
+    """SMTP 5xx 응답이면 재시도해도 소용없는 실패(dead-letter)로 본다."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        return bool(codes) and all(500 <= code < 600 for code in codes)
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 500 <= error.smtp_code < 600
+    return False
+
+
+def backoff_seconds(attempts):
+    """attempts 번째 실패 후 다음 시도까지의 대기 시간 (지수 백오프 + 10% jitter)"""
+    delay = min(OUTBOX_BACKOFF_MAX_SECONDS, OUTBOX_BACKOFF_BASE_SECONDS * (2 ** max(0, attempts - 1)))
+    return delay * (1 + random.uniform(0, 0.1))
+
+
+# 모든 값을 바인드 파라미터로 두어야 PyMySQL executemany 가 multi-row INSERT 한 문장으로 보낸다
+INSERT_OUTBOX_SQL = """
+    INSERT INTO email_outbox
+        (trigger_id, will_id, recipient_id, dispatch_log_id, dispatch_type, priority, to_email, subject, body)
+    VALUES
+        (:trigger_id, :will_id, :recipient_id, :dispatch_log_id, :dispatch_type, :priority, :to_email, :subject, :body)
+"""
+INSERT_OUTBOX_IGNORE_SQL = INSERT_OUTBOX_SQL.replace('INSERT INTO', 'INSERT IGNORE INTO', 1)
+INSERT_DISPATCH_LOG_SQL = """
+    INSERT INTO dispatch_log (will_id, recipient_id, sent_at, status, type)
+    VALUES (:will_id, :recipient_id, :sent_at, :status, :type)
+"""
+
+
+def outbox_message(to_email, subject, body, will_id, trigger_id=None, recipient_id=None,
+                   dispatch_type=DISPATCH_TYPE_LIVE_CONFIRMATION, dispatch_log_id=None, grade=None):
+    """enqueue_emails 에 넘길 아웃박스 행
+
+    dispatch_log_id 가 있으면 발송 결과를 새 dispatch_log 행 대신 그 행에 기록한다.
+    grade 는 유언장 주인(UserInfo.grade)의 등급으로 레인 안의 발송 순서를 정한다.
+    """
+    return {
+        "trigger_id": trigger_id,
+        "will_id": will_id,
+        "recipient_id": recipient_id,
+        "dispatch_log_id": dispatch_log_id,
+        "dispatch_type": dispatch_type,
+        "priority": grade_priority(grade),
+        "to_email": to_email,
+        "subject": subject,
+        "body": body,
+    }
+
+
+def enqueue_emails(connection, messages, ignore_duplicates=False):
+    """아웃박스에 메시지를 기록합니다. 커밋은 호출자의 트랜잭션에 맡긴다.
+
+    ignore_duplicates 이면 이미 아웃박스에 있는 dispatch_log_id (유니크 키) 는 INSERT IGNORE 로 건너뛴다.
+    """
+    if messages:
+        connection.execute(text(INSERT_OUTBOX_IGNORE_SQL if ignore_duplicates else INSERT_OUTBOX_SQL), messages)
+
+
+def claim_outbox_batch(connection, lock_token, batch_size=OUTBOX_BATCH_SIZE,
+                       visibility_seconds=OUTBOX_VISIBILITY_SECONDS, lane=None):
+    """발송할 아웃박스 행을 lock_token 으로 예약하고 행 목록을 반환합니다.
+
+    예약된 행은 status='sending' 이 되고 next_attempt_at 이 visibility timeout
+    만큼 미뤄진다. 발송 워커가 그 안에 결과를 기록하지 못하면 (장애 등)
+    next_attempt_at 이 지나 다른 워커가 다시 가져간다.
+    lane 을 주면 그 레인의 행만, 아니면 레인 우선순위 순으로 가져오고
+    레인 안에서는 등급(priority), 오래된 순서로 가져온다 (idx_outbox_lane).
+    """
+    if lane is None:
+        lane_filter, order = "", "dispatch_type, priority, next_attempt_at"
+    else:
+        lane_filter, order = "AND dispatch_type = :dispatch_type", "priority, next_attempt_at"
+    rows = connection.execute(text(f"""
+        SELECT id FROM email_outbox
+        WHERE status IN ('pending', 'sending')
+        {lane_filter}
+        AND next_attempt_at <= NOW()
+        ORDER BY {order}
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    """), {"batch_size": batch_size, "dispatch_type": LANES.get(lane)}).fetchall()
+    outbox_ids = [row[0] for row in rows]
+    if not outbox_ids:
+        connection.commit()
+        return []
+
+    connection.execute(
+        text("""
+            UPDATE email_outbox
+            SET status='sending', lock_token=:token, attempts=attempts + 1,
+                next_attempt_at = NOW() + INTERVAL :visibility SECOND
+            WHERE id IN :ids
+        """).bindparams(bindparam('ids', expanding=True)),
+        {"token": lock_token, "visibility": visibility_seconds, "ids": outbox_ids}
+    )
+    messages = connection.execute(text("""
+        SELECT id, will_id, recipient_id, dispatch_log_id, dispatch_type, to_email, subject, body, attempts,
+            TIMESTAMPDIFF(MICROSECOND, created_at, NOW()) / 1000000 AS queued_seconds
+        FROM email_outbox WHERE lock_token = :token
+        ORDER BY id
+    """), {"token": lock_token}).fetchall()
+    connection.commit()  # 예약 확정 및 행 잠금 해제
+    return messages
+
+
+def recipient_errors(group, error):
+    """트랜잭션 오류를 수신자(메시지)별 오류로 나눈다.
+
+    SMTPRecipientsRefused 는 수신자마다 거부 코드가 다르므로 그 수신자의 응답만 담아
+    재시도/dead-letter 판단이 수신자별로 이뤄지게 한다.
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return {
+            message.id: smtplib.SMTPRecipientsRefused({message.to_email: error.recipients[message.to_email]})
+            for message in group if message.to_email in error.recipients
+        }
+    return {message.id: error for message in group}
+
+
+def is_throttling_error(error):
+    """4xx 응답(421 포함): 수신 서버가 속도를 줄이라는 신호로 본다."""
+    return error_class(error) == 'smtp_4xx'
+
+
+def send_outbox_batch(messages):
+    """예약한 메시지를 발송 스레드 풀로 동시에 발송하고 결과를 분류합니다.
+
+    같은 도메인에 같은 내용인 메시지는 group_by_domain 으로 묶어 한 트랜잭션으로 보내고,
+    결과(거부 코드)는 수신자별로 나눠 분류한다. 도메인 token bucket 에 토큰이 없는
+    묶음은 보내지 않고 deferred 로 돌려 다른 도메인 발송을 막지 않는다.
+    (sent, retry, dead, deferred, latencies) 를 반환한다. sent 는 메시지 행 목록,
+    retry/dead 는 (메시지 행, 오류) 목록, deferred 는 (메시지 행, 대기 초) 목록,
+    latencies 는 트랜잭션별 시간.
+    """
+    executor = get_send_executor()
+    throttle = get_domain_throttle()
+    groups, deferred = [], []
+    for group in group_by_domain(messages):
+        wait = throttle.acquire(recipient_domain(group[0].to_email), len(group))
+        if wait:
+            deferred.extend((message, wait) for message in group)
+        else:
+            groups.append(group)
+    futures = [
+        executor.submit(
+            timed_send_group_email, [message.to_email for message in group], group[0].subject, group[0].body
+        )
+        for group in groups
+    ]
+
+    sent, retry, dead, latencies = [], [], [], []
+    for group, future in zip(groups, futures):
+        metrics.observe('smtp_recipients_per_transaction', len(group), buckets=RECIPIENT_BUCKETS)
+        try:
+            latency, refused = future.result()
+            latencies.append(latency)
+            errors = recipient_errors(group, smtplib.SMTPRecipientsRefused(refused)) if refused else {}
+        except Exception as e:
+            errors = recipient_errors(group, e)
+
+        domain = recipient_domain(group[0].to_email)
+        if any(is_throttling_error(error) for error in errors.values()):
+            throttle.on_throttled(domain)
+        else:
+            throttle.on_success(domain)
+
+        for message in group:
+            error = errors.get(message.id)
+            if error is None:
+                sent.append(message)
+                continue
+            metrics.inc('smtp_failures_total', error_class=error_class(error))
+            if is_permanent_failure(error) or message.attempts >= OUTBOX_MAX_ATTEMPTS:
+                logger.error(f"Outbox {message.id} dead-lettered after {message.attempts} attempts: {error}")
+                dead.append((message, error))
+            else:
+                logger.warning(f"Outbox {message.id} send failed (attempt {message.attempts}), will retry: {error}")
+                retry.append((message, error))
+    return sent, retry, dead, deferred, latencies
+
+
+def dispatch_log_params(message, sent_at, status):
+    return {
+        "will_id": message.will_id,
+        "recipient_id": message.recipient_id,  # live confirmation 은 NULL (유니크 키에서 제외)
+        "sent_at": sent_at,
+        "status": status,
+        "type": message.dispatch_type,
+    }
+
+
+def record_outbox_results(connection, lock_token, sent, retry, dead, deferred=()):
+    """발송 결과를 한 트랜잭션으로 기록합니다.
+
+    - 발송 성공: 한 번의 UPDATE 로 sent 처리, dispatch_log 'sent' 일괄 INSERT
+    - 재시도: 행별 백오프 시각으로 pending 복귀
+    - 속도 제한으로 미룬 행: 시도 횟수를 되돌리고 토큰이 찰 시각으로 pending 복귀
+    - dead-letter: dead 처리, dispatch_log 'failed' 기록
+    lock_token 이 일치하는 행만 갱신하므로 visibility timeout 이 지나 다른 워커가
+    가져간 행의 상태를 덮어쓰지 않는다.
+    """
+    sent_at = connection.execute(text("SELECT NOW()")).scalar()
+    if sent:
+        connection.execute(
+            text("""
+                UPDATE email_outbox
+                SET status='sent', sent_at=:sent_at, lock_token=NULL, last_error=NULL
+                WHERE id IN :ids AND lock_token=:token
+            """).bindparams(bindparam('ids', expanding=True)),
+            {"ids": [message.id for message in sent], "sent_at": sent_at, "token": lock_token}
+        )
+    if retry:
+        connection.execute(
+            text("""
+                UPDATE email_outbox
+                SET status='pending', lock_token=NULL, last_error=:error,
+                    next_attempt_at = NOW() + INTERVAL :delay SECOND
+                WHERE id=:id AND lock_token=:token
+            """),
+            [
+                {"id": message.id, "error": str(error)[:500], "delay": int(backoff_seconds(message.attempts)), "token": lock_token}
+                for message, error in retry
+            ]
+        )
+    if deferred:
+        connection.execute(
+            text("""
+                UPDATE email_outbox
+                SET status='pending', lock_token=NULL, attempts=GREATEST(attempts - 1, 0),
+                    next_attempt_at = NOW() + INTERVAL :delay SECOND
+                WHERE id=:id AND lock_token=:token
+            """),
+            [{"id": message.id, "delay": max(1, math.ceil(wait)), "token": lock_token} for message, wait in deferred]
+        )
+    if dead:
+        connection.execute(
+            text("""
+                UPDATE email_outbox
+                SET status='dead', lock_token=NULL, last_error=:error
+                WHERE id=:id AND lock_token=:token
+            """),
+            [{"id": message.id, "error": str(error)[:500], "token": lock_token} for message, error in dead]
+        )
+
+    # dispatch_log 기록: 미리 만든 행(live confirmation 링크, will release fan-out)은 상태만 갱신, 나머지는 일괄 INSERT
+    # 기록 전에 확인 링크를 이미 눌렀으면(read_at) 'read' 상태를 덮어쓰지 않음
+    failed = [message for message, _ in dead]
+    log_rows = [dispatch_log_params(message, sent_at, 'sent') for message in sent if not message.dispatch_log_id]
+    log_rows += [dispatch_log_params(message, sent_at, 'failed') for message in failed if not message.dispatch_log_id]
+    if log_rows:
+        connection.execute(text(INSERT_DISPATCH_LOG_SQL), log_rows)
+    for status, messages in (('sent', sent), ('failed', failed)):
+        dispatch_log_ids = [message.dispatch_log_id for message in messages if message.dispatch_log_id]
+        if dispatch_log_ids:
+            connection.execute(
+                text("""
+                    UPDATE dispatch_log SET status = IF(read_at IS NULL, :status, status), sent_at = :sent_at
+                    WHERE id IN :ids
+                """)
+                .bindparams(bindparam('ids', expanding=True)),
+                {"ids": dispatch_log_ids, "status": status, "sent_at": sent_at}
+            )
+    connection.commit()  # 트랜잭션 커밋
+
+
+def observe_lane_latency(sent, claimed_at):
+    """레인별 대기 시간(생성 -> 예약)과 전달 시간(생성 -> 발송 완료)을 histogram 에 기록"""
+    send_seconds = time.perf_counter() - claimed_at
+    for message in sent:
+        lane = LANE_BY_DISPATCH_TYPE.get(message.dispatch_type, 'other')
+        queued = max(0.0, float(message.queued_seconds or 0))
+        metrics.observe('outbox_queue_seconds', queued, lane=lane)
+        metrics.observe('outbox_delivery_seconds', queued + send_seconds, lane=lane)
+        metrics.inc('outbox_lane_sent_total', lane=lane)
+
+
+def drain_outbox(connection, worker_id, batch_size=OUTBOX_BATCH_SIZE, lane=None):
+    """발송할 메시지가 없을 때까지 아웃박스를 배치 단위로 비웁니다. 발송 성공 건수를 반환합니다.
+
+    lane 을 주면 그 레인의 메시지만 발송한다.
+    """
+    total = 0
+    latencies = []
+    started = time.perf_counter()
+    while True:
+        lock_token = uuid.uuid4().hex
+        with metrics.timer('outbox_db_seconds', stage='claim'):
+            messages = claim_outbox_batch(connection, lock_token, batch_size, lane=lane)
+        if not messages:
+            break
+        claimed_at = time.perf_counter()
+        with metrics.timer('outbox_send_batch_seconds'):
+            sent, retry, dead, deferred, batch_latencies = send_outbox_batch(messages)
+        observe_lane_latency(sent, claimed_at)
+        try:
+            with metrics.timer('outbox_db_seconds', stage='record'):
+                record_outbox_results(connection, lock_token, sent, retry, dead, deferred)
+        except Exception as e:
+            # 기록에 실패한 행은 visibility timeout 후 다시 발송된다 (at-least-once)
+            logger.error(f"Failed to record outbox results: {type(e).__name__}: {e}")
+            metrics.inc('outbox_record_failures_total')
+            connection.rollback()
+        total += len(sent)
+        latencies.extend(batch_latencies)
+        for status, rows in (('sent', sent), ('retry', retry), ('dead', dead), ('deferred', deferred)):
+            if rows:
+                metrics.inc('outbox_emails_total', len(rows), status=status)
+        for latency in batch_latencies:
+            metrics.observe('smtp_send_seconds', latency)
+
+    if latencies:
+        elapsed = time.perf_counter() - started
+        metrics.set_gauge('outbox_emails_per_second', total / elapsed)
+        logger.info(
+            f"Outbox drained (worker {worker_id}, lane {lane or 'all'}): {total} sent in {elapsed:.2f}s "
+            f"({total / elapsed:.1f} emails/s), send latency p50={percentile(latencies, 50) * 1000:.0f}ms "
+            f"p99={percentile(latencies, 99) * 1000:.0f}ms, concurrency={SEND_CONCURRENCY}"
+        )
+    return total
@@ -1,11 +1,146 @@
+"""
+이메일 템플릿 레지스트리
+- 템플릿은 등록할 때 Jinja2 로 한 번만 컴파일해 캐시 (메일마다 문자열 치환/파싱 반복 없음)
+- 변수가 없는 제목은 등록 시 미리 렌더링
+- render_batch 로 여러 수신자의 메시지를 한 번에 렌더링
+- MessageSkeleton 은 고정 헤더(MIME-Version/Content-Type/From)를 미리 만들어 두고
+  메시지마다 Subject/To/본문만 채워 넣음 (MIMEText 를 매번 새로 만들지 않음)
+새 템플릿은 register_template 으로 추가하면 되고 스케줄러 코드는 건드릴 필요가 없다.
+"""
+
+import base64
+from email.header import Header
+from functools import lru_cache
+
+from jinja2 import Environment, StrictUndefined, meta
+
+# 평문 메일이므로 autoescape 하지 않음, 빠진 변수는 빈 문자열 대신 오류
+_env = Environment(autoescape=False, undefined=StrictUndefined, keep_trailing_newline=True)
+
+LIVE_CONFIRMATION = 'live_confirmation'
+WILL_RELEASE = 'will_release'
+
 live_confirmation_subject = "Dead Man's Switch 로그인 링크 안내"
 live_confirmation_body = (
 	"안녕하세요!\n\n"
 	"이 이메일에는 Dead Man's Switch 비밀 로그인 링크가 포함되어 있습니다. 로그인하려면 아래 링크를 클릭하세요. 이 링크는 본인만 사용해야 하며, 다른 사람과 공유하지 마세요. 누군가에게 노출되면 계정에 접근할 수 있습니다.\n\n"
 	"로그인 링크:\n"
-	"https://$url$/auth/liveconfirmation/$willid$/\n\n"
+	"https://{{ base_url }}/auth/liveconfirmation/{{ confirm_token }}/\n\n"
 	"이 링크는 요청 후 몇 분 이내에 만료되며, 만약 동작하지 않는다면 새로 요청해야 할 수 있습니다.\n\n"
 	"로그인 링크를 요청하지 않았다면 이 이메일을 무시하셔도 됩니다.\n\n"
 	"감사합니다!\n"
 	"Dead Man's Switch 팀 드림"
 )
+
+will_release_subject = '{{ subject or "Dead Man\'s Switch 유언장" }}'
+will_release_body = (
+	"{% if recipient_name %}{{ recipient_name }} 님께{% else %}안녕하세요{% endif %},\n\n"
+	"{{ owner_name }} 님이 Dead Man's Switch 에 남긴 메시지를 전달해 드립니다.\n"
+	"본인 확인 요청에 일정 기간 응답이 없어 미리 지정된 수신자분들께 발송되었습니다.\n\n"
+	"----------------------------------------\n"
+	"{{ body }}\n"
+	"----------------------------------------\n\n"
+	"Dead Man's Switch 팀 드림"
+)
+
+
+class EmailTemplate:
+    """컴파일된 제목/본문 템플릿"""
+
+    def __init__(self, name, subject, body):
+        self.name = name
+        self.subject_template = _env.from_string(subject)
+        self.body_template = _env.from_string(body)
+        # 제목에 변수가 없으면 한 번만 렌더링해 모든 메시지가 같은 문자열을 공유
+        if meta.find_undeclared_variables(_env.parse(subject)):
+            self.static_subject = None
+        else:
+            self.static_subject = self.subject_template.render()
+
+    def render(self, **context):
+        """(subject, body) 를 반환합니다."""
+        subject = self.static_subject
+        if subject is None:
+            subject = self.subject_template.render(context)
+        return subject, self.body_template.render(context)
+
+    def render_batch(self, contexts, **common):
+        """contexts 의 각 dict(수신자별 값)에 common 을 합쳐 렌더링한 (subject, body) 목록"""
+        subject_render = self.subject_template.render
+        body_render = self.body_template.render
+        static_subject = self.static_subject
+        rendered = []
+        for context in contexts:
+            values = dict(common, **context) if common else context
+            subject = static_subject if static_subject is not None else subject_render(values)
+            rendered.append((subject, body_render(values)))
+        return rendered
+
+
+_templates = {}
+
+
+def register_template(name, subject, body):
+    """템플릿을 컴파일해 레지스트리에 등록합니다. 같은 이름이면 교체."""
+    template = _templates[name] = EmailTemplate(name, subject, body)
+    return template
+
+
+def get_template(name):
+    try:
+        return _templates[name]
+    except KeyError:
+        raise KeyError(f"Unknown email template: {name}") from None
+
+
+def render_template(name, **context):
+    return get_template(name).render(**context)
+
+
+def render_batch(name, contexts, **common):
+    return get_template(name).render_batch(contexts, **common)
+
+
+register_template(LIVE_CONFIRMATION, live_confirmation_subject, live_confirmation_body)
+register_template(WILL_RELEASE, will_release_subject, will_release_body)
+
+
+@lru_cache(maxsize=256)
+def _encoded_header(value):
+    """비 ASCII 헤더 값은 RFC 2047 인코딩 (같은 제목이 반복되므로 캐시)
+
+    사용자가 입력한 제목의 줄바꿈은 헤더 주입이 되지 않도록 공백으로 바꾼다.
+    """
+    value = ' '.join(value.splitlines())
+    if value.isascii():
+        return value
+    return Header(value, 'utf-8').encode()
+
+
+class MessageSkeleton:
+    """고정 헤더를 미리 만들어 둔 text/plain UTF-8 메시지 빌더
+
+    MIMEText(body) 가 만드는 것과 같은 형식(utf-8, base64)의 문자열을 반환한다.
+    """
+
+    def __init__(self, sender):
+        self.sender = sender
+        self._head = (
+            'Content-Type: text/plain; charset="utf-8"\n'
+            'MIME-Version: 1.0\n'
+            'Content-Transfer-Encoding: base64\n'
+        )
+        self._from = f"From: {_encoded_header(sender)}\n" if sender else ''
+
+    def build(self, to_email, subject, body):
+        """to_email 이 여러 명이면 서로의 주소가 보이지 않도록 To 는 undisclosed-recipients 로 둔다."""
+        if not isinstance(to_email, str):
+            to_email = to_email[0] if len(to_email) == 1 else 'undisclosed-recipients:;'
+        return (
+            f"{self._head}"
+            f"Subject: {_encoded_header(subject)}\n"
+            f"{self._from}"
+            f"To: {to_email}\n"
+            f"\n"
+            f"{base64.encodebytes(body.encode('utf-8')).decode('ascii')}"
+        )
@@ -0,0 +1,131 @@
+"""
+MySQL GET_LOCK() 기반 스케줄러 리더 선출
+- 여러 호스트/프로세스에서 스케줄러를 띄워도 싱글톤이어야 하는 작업
+  (inactivity 평가 등)은 잠금을 가진 리더 한 곳에서만 실행
+- 잠금은 전용 커넥션(세션)에 묶이므로 리더 프로세스가 죽으면 MySQL 이 즉시 해제하고,
+  호스트가 통째로 사라져도 짧게 잡은 세션 wait_timeout 이 지나면 해제됨
+- 대기(standby) 인스턴스는 heartbeat 주기마다 GET_LOCK(name, 0) 을 시도해 몇 초 안에 인계받음
+- 추가 인프라 없이 기존 MySQL 만 사용
+"""
+
+import logging
+import os
+import threading
+
+from sqlalchemy import text
+
+from triggers.scheduler_metrics import metrics
+
+logger = logging.getLogger("live_confirmation_scheduler.leader")
+
+LEADER_LOCK_NAME = os.environ.get('SCHEDULER_LEADER_LOCK', 'dms_scheduler_leader')
+LEADER_HEARTBEAT_SECONDS = float(os.environ.get('SCHEDULER_LEADER_HEARTBEAT_SECONDS', '2'))
+# 리더 세션이 이 시간 동안 조용하면 MySQL 이 세션을 끊어 잠금을 해제 (heartbeat 보다 충분히 길게)
+LEADER_SESSION_TIMEOUT = int(os.environ.get('SCHEDULER_LEADER_SESSION_TIMEOUT', '10'))
+
+
+class LeaderElector:
+    """GET_LOCK 을 잡은 프로세스만 리더로 인정
+
+    start() 로 띄운 heartbeat 스레드가 heartbeat_seconds 마다 heartbeat() 를 실행한다.
+    스케줄러 루프가 오래 sleep 하거나 catch-up 중이어도 세션이 유지되도록 루프와 분리했다.
+    - 대기 중: GET_LOCK(name, 0) 시도
+    - 리더: IS_USED_LOCK(name) = CONNECTION_ID() 로 잠금을 아직 갖고 있는지 확인
+    커넥션 오류가 나면 즉시 리더에서 물러난다. is_leader() 는 마지막 결과만 읽는다.
+    """
+
+    def __init__(self, engine, name=LEADER_LOCK_NAME, heartbeat_seconds=LEADER_HEARTBEAT_SECONDS,
+                 session_timeout=LEADER_SESSION_TIMEOUT):
+        self.engine = engine
+        self.name = name
+        self.heartbeat_seconds = heartbeat_seconds
+        self.session_timeout = session_timeout
+        self._connection = None
+        self._leader = False
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def is_leader(self):
+        return self._leader
+
+    def start(self):
+        """heartbeat 스레드 시작 (첫 선출 시도는 바로 실행)"""
+        self.heartbeat()
+        self._thread = threading.Thread(target=self._run, name='leader-heartbeat', daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stopped.wait(self.heartbeat_seconds):
+            self.heartbeat()
+
+    def heartbeat(self):
+        with self._lock:
+            if self._stopped.is_set():
+                return self._leader
+            self._heartbeat()
+        return self._leader
+
+    def _heartbeat(self):
+        try:
+            connection = self._get_connection()
+            if self._leader:
+                still_leader = connection.execute(
+                    text("SELECT IS_USED_LOCK(:name) = CONNECTION_ID()"), {"name": self.name}
+                ).scalar()
+                if not still_leader:
+                    self._set_leader(False, "lock no longer held")
+            else:
+                acquired = connection.execute(text("SELECT GET_LOCK(:name, 0)"), {"name": self.name}).scalar()
+                if acquired == 1:
+                    self._set_leader(True, "lock acquired")
+            connection.commit()
+        except Exception as e:
+            logger.error(f"[LEADER ERROR] {type(e).__name__}: {e}")
+            self._close()
+            if self._leader:
+                self._set_leader(False, "connection lost")
+
+    def release(self):
+        """종료 시 잠금을 바로 넘겨 대기 인스턴스가 기다리지 않게 한다."""
+        self._stopped.set()
+        with self._lock:
+            self._release()
+
+    def _release(self):
+        if self._connection is not None and self._leader:
+            try:
+                self._connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": self.name})
+                self._connection.commit()
+            except Exception as e:
+                logger.error(f"[LEADER ERROR] {type(e).__name__}: {e}")
+        if self._leader:
+            self._set_leader(False, "released")
+        self._close()
+
+    def _get_connection(self):
+        if self._connection is None:
+            # 풀에 돌려주지 않는 전용 세션: 잠금의 수명 = 이 세션의 수명
+            self._connection = self.engine.connect()
+            self._connection.execute(text(f"SET SESSION wait_timeout = {int(self.session_timeout)}"))
+            self._connection.commit()
+        return self._connection
+
+    def _close(self):
+        if self._connection is not None:
+            try:
+                # 세션을 끊어 서버 쪽 잠금도 확실히 해제 (풀에 돌려주지 않음)
+                self._connection.invalidate()
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+    def _set_leader(self, leader, reason):
+        self._leader = leader
+        metrics.set_gauge('scheduler_is_leader', 1 if leader else 0)
+        if leader:
+            logger.info(f"Became scheduler leader ({self.name}): {reason}")
+        else:
+            logger.warning(f"Lost scheduler leadership ({self.name}): {reason}")
@@ -1,114 +1,569 @@
-from multiprocessing import context
+import argparse
+import multiprocessing
+import socket
 import time
-import ssl
-import smtplib
-from email.mime.text import MIMEText
-from datetime import datetime
+import uuid
+from datetime import datetime, timedelta
 import os
-from dotenv import load_dotenv
+import secrets
 
-# Flask app과 db를 import
 import sys
 from pathlib import Path
 
 import logging
-sys.path.append(str(Path(__file__).resolve().parent.parent))
-from app.app import app, db
-
-# .env 환경변수 로드
-load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'))
+from sqlalchemy import text, bindparam
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+# 웹 앱(app.app) 대신 .env/Config 와 DB 엔진만 적재하는 경량 부트스트랩
+from triggers.worker_db import get_engine, reset_inherited_engine
 
-from backend.triggers.email_templates import live_confirmation_subject, live_confirmation_body
+from triggers.email_templates import LIVE_CONFIRMATION, render_batch
+from triggers.due_trigger_timer import DueTriggerTimer
+from triggers.email_outbox import DISPATCH_TYPE_LIVE_CONFIRMATION, outbox_message, enqueue_emails, drain_outbox, LANES
+from triggers.leader_election import LeaderElector
+from triggers.will_release import release_unconfirmed_wills
+from triggers.scheduler_metrics import metrics, error_class, start_metrics_reporter, write_stats_file, serve_metrics
 
 # 로거 설정
 logger = logging.getLogger("live_confirmation_scheduler")
 logging.basicConfig(level=logging.INFO)
 
-# 이메일 발송 함수 (간단 예시)
-def send_email(to_email, subject, body):
-    smtp_host = os.environ.get('SMTP_HOST')
-    smtp_port = int(os.environ.get('SMTP_PORT'))
-    smtp_user = os.environ.get('SMTP_USER')
-    smtp_pass = os.environ.get('SMTP_PASS')
-    logger.info(f"[SMTP_HOST]  {smtp_host}")
-    logger.info(f"[SMTP_PORT]  {smtp_port}")
-    logger.info(f"[SMTP_USER]  {smtp_user}")
-    logger.info(f"[SMTP_PASS]  {smtp_pass}")    
-
-    msg = MIMEText(body)
-    msg['Subject'] = subject
-    msg['From'] = smtp_user
-    msg['To'] = to_email
-    logger.info(f"[subject]  {subject}")
-    logger.info(f"[From]  {smtp_user}")
-    logger.info(f"[to_email]  {to_email}")
+# 워커 예약(claim) 설정
+CLAIM_BATCH_SIZE = int(os.environ.get('SCHEDULER_CLAIM_BATCH_SIZE', '100'))
+CLAIM_LEASE_SECONDS = int(os.environ.get('SCHEDULER_CLAIM_LEASE_SECONDS', '300'))
 
+# 트리거 변경분(updated_at) 반영 주기 (변경이 없으면 MAX_REFRESH_SECONDS 까지 두 배씩 늘림)
+REFRESH_SECONDS = float(os.environ.get('SCHEDULER_REFRESH_SECONDS', '5'))
+MAX_REFRESH_SECONDS = float(os.environ.get('SCHEDULER_MAX_REFRESH_SECONDS', '30'))
 
-    try:
+# catch-up 모드: 장애/배포 후 due backlog 가 쌓이면 쉬지 않고 큰 배치로 오래된 것부터 처리
+CATCHUP_BACKLOG_THRESHOLD = int(os.environ.get('SCHEDULER_CATCHUP_BACKLOG', '1000'))
+CATCHUP_LAG_SECONDS = float(os.environ.get('SCHEDULER_CATCHUP_LAG_SECONDS', '900'))
+CATCHUP_BATCH_SIZE = int(os.environ.get('SCHEDULER_CATCHUP_BATCH_SIZE', '500'))
+CATCHUP_LOG_SECONDS = float(os.environ.get('SCHEDULER_CATCHUP_LOG_SECONDS', '10'))
 
-#        context = ssl.SSLContext(ssl.PROTOCOL_TLS)  # TLS 1.0~1.2 허용
-#        context = ssl._create_unverified_context()
-        context = ssl.create_default_context()
+# inactivity 트리거 평가 주기
+INACTIVITY_EVAL_SECONDS = float(os.environ.get('SCHEDULER_INACTIVITY_EVAL_SECONDS', '60'))
 
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-        #    server.starttls(context=context)
-        #    server.login(smtp_user, smtp_pass)
-            server.sendmail(smtp_user, [to_email], msg.as_string())
-            logger.info(f"after sendmail")
-    except Exception as e:
-        logger.error(f"[SMTP ERROR] {type(e).__name__}: {e}")
-        raise
+# 아웃박스가 비었을 때 발송 워커 대기 시간 (계속 비어 있으면 OUTBOX_MAX_POLL_SECONDS 까지 늘림)
+OUTBOX_POLL_SECONDS = float(os.environ.get('OUTBOX_POLL_SECONDS', '1'))
+OUTBOX_MAX_POLL_SECONDS = float(os.environ.get('OUTBOX_MAX_POLL_SECONDS', '10'))
+
+
+class IdleBackoff:
+    """할 일이 없을 때 대기 시간을 base 부터 두 배씩 maximum 까지 늘리고, 일이 생기면 base 로 되돌림"""
+
+    def __init__(self, base, maximum):
+        self.base = base
+        self.maximum = max(base, maximum)
+        self.current = base
+
+    def reset(self):
+        self.current = self.base
+
+    def next_wait(self):
+        wait = self.current
+        self.current = min(self.maximum, self.current * 2)
+        return wait
+
+
+def claim_due_triggers(connection, claim_token, batch_size=CLAIM_BATCH_SIZE, lease_seconds=CLAIM_LEASE_SECONDS):
+    """발송 시점이 지난 pending 트리거 배치를 claim_token 으로 예약합니다.
+
+    다른 워커가 잠근 행은 SKIP LOCKED 로 건너뛰고, 예약되지 않았거나 lease 가
+    만료된 행만 가져오므로 여러 스케줄러 프로세스가 동시에 실행되어도 같은
+    트리거를 중복 발송하지 않습니다. 이번에 잠근 트리거 ID 목록(failed 로 표시한 것 포함)을 반환합니다.
+
+    due_at(UTC)은 저장 시 미리 계산되어 있으므로 idx_triggers_status_due
+    (status, due_at) 인덱스 range scan 만으로 오래된 순서대로 읽는다.
+
+    아직 유언장이 없는 사용자의 트리거는 예약하지 않고 pending 으로 남겨 두므로
+    유언장을 만들면 다음 주기에 처리된다. 사용자 자체가 없는 트리거만 처리할 수
+    없으므로 같은 트랜잭션에서 failed 로 표시한다 (lease 마다 다시 예약되지 않도록).
+    """
+    rows = connection.execute(text("""
+        SELECT t.id FROM triggers t
+        WHERE t.status = 'pending'
+        AND t.due_at <= UTC_TIMESTAMP()
+        AND (t.claim_expires_at IS NULL OR t.claim_expires_at < NOW())
+        AND (
+            EXISTS (SELECT 1 FROM wills w WHERE w.user_id = t.user_id)
+            OR NOT EXISTS (SELECT 1 FROM UserInfo u WHERE u.user_id = t.user_id)
+        )
+        ORDER BY t.due_at
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    """), {"batch_size": batch_size}).fetchall()
+    trigger_ids = [row[0] for row in rows]
+
+    if trigger_ids:
+        orphaned = connection.execute(
+            text("""
+                UPDATE triggers t
+                SET t.status = 'failed', t.claim_token = NULL, t.claim_expires_at = NULL, t.updated_at = NOW(6)
+                WHERE t.id IN :ids
+                AND NOT EXISTS (SELECT 1 FROM UserInfo u WHERE u.user_id = t.user_id)
+            """).bindparams(bindparam('ids', expanding=True)),
+            {"ids": trigger_ids}
+        ).rowcount
+        if orphaned:
+            logger.warning(f"Marked {orphaned} triggers failed: no matching user")
+            metrics.inc('scheduler_triggers_failed_total', orphaned)
+        connection.execute(
+            text("""
+                UPDATE triggers
+                SET claim_token = :token, claim_expires_at = NOW() + INTERVAL :lease SECOND
+                WHERE id IN :ids AND status = 'pending'
+            """).bindparams(bindparam('ids', expanding=True)),
+            {"token": claim_token, "lease": lease_seconds, "ids": trigger_ids}
+        )
+    connection.commit()  # 예약 확정 및 행 잠금 해제
+    return trigger_ids
+
+
+# inactivity 트리거: trigger_value 는 비활동 허용 일수 (예: '30')
+INACTIVITY_DAYS_PATTERN = '^[1-9][0-9]*$'
+
+
+def evaluate_inactivity_triggers(connection):
+    """마지막 활동(last_seen_at) 이후 trigger_value 일이 지난 inactivity 트리거를 발동 상태로 표시합니다.
+
+    가장 짧은 비활동 허용 일수보다 오래 비활동한 사용자만 idx_userinfo_last_seen
+    범위 스캔으로 찾은 뒤 트리거별 일수로 다시 거른다. 표시된 트리거는
+    is_triggered = TRUE, due_at = 현재 시각(UTC)이 되어 claim_due_triggers 가 바로 가져간다.
+    발동 표시한 트리거 수를 반환합니다.
+    """
+    min_days = connection.execute(text("""
+        SELECT MIN(CAST(trigger_value AS UNSIGNED)) FROM triggers
+        WHERE status = 'pending' AND trigger_type = 'inactivity' AND is_triggered = FALSE
+        AND trigger_value REGEXP :pattern
+    """), {"pattern": INACTIVITY_DAYS_PATTERN}).scalar()
+    if not min_days:
+        connection.commit()
+        return 0
 
+    result = connection.execute(text("""
+        UPDATE UserInfo u
+        JOIN triggers t ON t.user_id = u.user_id
+        SET t.is_triggered = TRUE, t.last_checked = NOW(), t.due_at = UTC_TIMESTAMP()
+        WHERE u.last_seen_at < NOW() - INTERVAL :min_days DAY
+        AND t.status = 'pending' AND t.trigger_type = 'inactivity' AND t.is_triggered = FALSE
+        AND t.trigger_value REGEXP :pattern
+        AND u.last_seen_at < NOW() - INTERVAL CAST(t.trigger_value AS UNSIGNED) DAY
+    """), {"min_days": int(min_days), "pattern": INACTIVITY_DAYS_PATTERN})
+    connection.commit()
+    if result.rowcount:
+        logger.info(f"Inactivity evaluator fired {result.rowcount} triggers")
+    return result.rowcount
 
-# 트리거 조회 및 이메일 발송
 
-def process_email_triggers():
-    logger.info(f"Trigger email processing started at {datetime.now()}")
+def release_claim(connection, trigger_id, claim_token):
+    """기록에 실패한 트리거의 예약을 해제해 다음 주기에 다시 처리되도록 합니다."""
+    connection.execute(
+        text("UPDATE triggers SET claim_token=NULL, claim_expires_at=NULL WHERE id=:id AND claim_token=:token"),
+        {"id": trigger_id, "token": claim_token}
+    )
+    connection.commit()
 
+
+# 트리거 조회 및 아웃박스 기록
+
+# live confirmation 링크가 가리킬 dispatch_log 행 (주인에게 보내는 메일이므로 recipient_id 는 NULL)
+# 링크에는 순차 id 대신 추측할 수 없는 confirm_token 을 넣는다 (id 를 나열해 남의 유언장 공개를 막지 못하도록)
+INSERT_CONFIRMATION_LOG_SQL = """
+    INSERT INTO dispatch_log (will_id, recipient_id, status, type, confirm_token)
+    VALUES (:will_id, NULL, 'pending', :type, :confirm_token)
+"""
+
+
+def new_confirm_token():
+    """확인 링크용 임의 토큰 (URL-safe 43자)"""
+    return secrets.token_urlsafe(32)
+
+def process_claimed_triggers(connection, claim_token):
+    """claim_token 으로 예약한 트리거들의 live confirmation 이메일을 아웃박스에 기록합니다.
+
+    SMTP 발송은 아웃박스 발송 워커(run_sender)가 따로 수행하므로 여기서는
+    트리거 상태 전이, 확인 링크용 dispatch_log 와 아웃박스 INSERT 를 한 트랜잭션으로 커밋하기만 한다.
+    처리한 트리거 수를 반환합니다.
+    """
     query = """
-        SELECT t.id, t.user_id, t.trigger_date, u.email, w.id as will_id, u.id as clientid
+        SELECT t.id, t.user_id, t.trigger_date, u.email, w.id as will_id, u.id as clientid, u.grade
         FROM triggers t
         JOIN UserInfo u ON t.user_id = u.user_id
         JOIN wills w ON t.user_id = w.user_id
-        where status = 'pending'
-        and trigger_date < CURDATE()
+        where t.claim_token = :token
+        and t.status = 'pending'
+        ORDER BY t.id
     """
 
+    result = connection.execute(text(query), {"token": claim_token})
+    rows = result.fetchall()
+
+    confirmations_by_trigger = {}
+    for row in rows:
+        trigger_id, user_id, trigger_date, email, will_id, userid, grade = row
+        logger.info(f"Queue live confirmation email to {email} for trigger {trigger_id}")
+        confirmations_by_trigger.setdefault(trigger_id, []).append((email, will_id, grade))
 
-    with app.app_context():
-        with db.engine.connect() as connection:
-            result = connection.execute(db.text(query))
-            rows = result.fetchall()
-            for row in rows:
-                trigger_id, user_id, trigger_date, email, will_id, userid = row
+    try:
+        complete_and_enqueue(connection, claim_token, confirmations_by_trigger)
+    except Exception as e:
+        logger.error(f"Batch state update failed, retrying per trigger: {type(e).__name__}: {e}")
+        rollback_quietly(connection)
+        for trigger_id, confirmations in confirmations_by_trigger.items():
+            try:
+                complete_and_enqueue(connection, claim_token, {trigger_id: confirmations})
+            except Exception as row_err:
+                logger.error(f"Failed to process trigger {trigger_id}: {row_err}")
+                rollback_quietly(connection)
                 try:
-                    # live confirmation email 발송 (실제 발송은 주석 처리)
-                    # 동적 URL/WillID 치환
-                    base_url = os.environ.get('BASE_URL', 'localhost:5000')
-                    body = live_confirmation_body.replace('$url$', base_url).replace('$willid$', str(will_id))
-                    logger.info(f"[before] Would send live confirmation email to {email} for trigger {trigger_id}")
-                    send_email(email, live_confirmation_subject, body)
-                    logger.info(f"[After] Would send live confirmation email to {email} for trigger {trigger_id}")
-                    connection.execute(db.text("UPDATE triggers SET status='completed', updated_at=NOW() WHERE id=:id"), {"id": trigger_id})
-
-                    # dispatch_log 기록 추가
-                    connection.execute(
-                        db.text("""
-                            INSERT INTO dispatch_log (will_id, recipient_id, sent_at, status, type)
-                            VALUES (:will_id, 0, NOW(), 'sent', 1)
-                        """),
-                        {"will_id": row[4]}
-                    )
-                    connection.commit()  # 트랜잭션 커밋
-                except Exception as e:
-                    logger.error(f"Failed to process trigger {trigger_id}: {e}")
-                    try:
-                        connection.rollback()
-                    except Exception as rollback_err:
-                        logger.error(f"[ROLLBACK ERROR] {type(rollback_err).__name__}: {rollback_err}")
+                    release_claim(connection, trigger_id, claim_token)
+                except Exception as release_err:
+                    logger.error(f"Failed to release trigger {trigger_id}: {release_err}")
+                    rollback_quietly(connection)
+    return len(confirmations_by_trigger)
 
-if __name__ == "__main__":
+
+def complete_and_enqueue(connection, claim_token, confirmations_by_trigger):
+    """트리거 completed 처리, 확인 링크용 dispatch_log 생성, 아웃박스 일괄 INSERT 를 한 트랜잭션으로 커밋합니다.
+
+    confirmations_by_trigger 는 {trigger_id: [(email, will_id, grade), ...]}.
+    dispatch_log 는 메일마다 임의 확인 토큰과 함께 INSERT 해 id 를 받고 (링크에는 토큰, 아웃박스 행에는 id),
+    렌더링 후 아웃박스는 한 번에 INSERT 한다. 발송 결과는 그 dispatch_log 행에 기록된다.
+    """
+    if not confirmations_by_trigger:
+        connection.commit()
+        return
+    trigger_ids = sorted(confirmations_by_trigger)
+    updated = connection.execute(
+        text("""
+            UPDATE triggers
+            SET status='completed', claim_token=NULL, claim_expires_at=NULL, updated_at=NOW(6)
+            WHERE id IN :ids AND claim_token=:token
+        """).bindparams(bindparam('ids', expanding=True)),
+        {"ids": trigger_ids, "token": claim_token}
+    )
+    if updated.rowcount != len(trigger_ids):
+        # lease 가 만료돼 다른 워커가 가져간 트리거는 그 워커가 기록하도록 롤백
+        raise RuntimeError(
+            f"Claim lost on {len(trigger_ids) - updated.rowcount} of {len(trigger_ids)} triggers (lease expired?)"
+        )
+
+    confirmations = [
+        (trigger_id, email, will_id, grade)
+        for trigger_id in trigger_ids
+        for email, will_id, grade in confirmations_by_trigger[trigger_id]
+    ]
+    confirm_tokens = [new_confirm_token() for _ in confirmations]
+    dispatch_log_ids = [
+        connection.execute(text(INSERT_CONFIRMATION_LOG_SQL), {
+            "will_id": will_id, "type": DISPATCH_TYPE_LIVE_CONFIRMATION, "confirm_token": confirm_token,
+        }).lastrowid
+        for (_, _, will_id, _), confirm_token in zip(confirmations, confirm_tokens)
+    ]
+    # 동적 URL/확인 토큰은 컴파일된 템플릿으로 한 번에 렌더링
+    base_url = os.environ.get('BASE_URL', 'localhost:5000')
+    rendered = render_batch(
+        LIVE_CONFIRMATION, [{"confirm_token": confirm_token} for confirm_token in confirm_tokens], base_url=base_url
+    )
+    enqueue_emails(connection, [
+        outbox_message(email, subject, body, will_id, trigger_id=trigger_id, dispatch_log_id=dispatch_log_id,
+                       grade=grade)
+        for (trigger_id, email, will_id, grade), dispatch_log_id, (subject, body)
+        in zip(confirmations, dispatch_log_ids, rendered)
+    ])
+    connection.commit()  # 트랜잭션 커밋
+
+
+def rollback_quietly(connection):
+    try:
+        connection.rollback()
+    except Exception as rollback_err:
+        logger.error(f"[ROLLBACK ERROR] {type(rollback_err).__name__}: {rollback_err}")
+
+
+def count_due_backlog(connection):
+    """(due 된 pending 트리거 수, 가장 오래된 due_at) — idx_triggers_status_due range scan"""
+    count, oldest_due = connection.execute(text("""
+        SELECT COUNT(*), MIN(due_at) FROM triggers
+        WHERE status = 'pending' AND due_at <= UTC_TIMESTAMP()
+    """)).fetchone()
+    connection.commit()
+    return int(count), oldest_due
+
+
+def should_catch_up(backlog, lag_seconds):
+    """backlog 가 임계값 이상이거나 가장 오래 밀린 트리거의 지연이 길면 catch-up 모드"""
+    return backlog >= CATCHUP_BACKLOG_THRESHOLD or lag_seconds >= CATCHUP_LAG_SECONDS
+
+
+class CatchUpProgress:
+    """catch-up 진행률과 남은 시간(ETA) 로그
+
+    남은 수는 처리한 만큼 줄이되, log_seconds 마다 DB 에서 다시 센다
+    (다른 워커가 처리한 몫과 새로 due 된 트리거를 반영).
+    """
+
+    def __init__(self, backlog, log_seconds=CATCHUP_LOG_SECONDS, clock=time.monotonic):
+        self.clock = clock
+        self.log_seconds = log_seconds
+        self.started = clock()
+        self.initial = backlog
+        self.remaining = backlog
+        self.processed = 0
+        self._next_log = self.started + log_seconds
+
+    def rate(self):
+        elapsed = self.clock() - self.started
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def eta_seconds(self):
+        rate = self.rate()
+        return self.remaining / rate if rate else None
+
+    def advance(self, processed, connection=None):
+        self.processed += processed
+        self.remaining = max(0, self.remaining - processed)
+        if self.clock() >= self._next_log:
+            if connection is not None:
+                self.remaining = count_due_backlog(connection)[0]
+            self._next_log = self.clock() + self.log_seconds
+            self.log()
+
+    def log(self):
+        eta = self.eta_seconds()
+        done = 100.0 * self.processed / max(1, self.processed + self.remaining)
+        logger.info(
+            f"Catch-up: {self.processed} processed, {self.remaining} remaining ({done:.0f}% done), "
+            f"{self.rate():.0f} triggers/s, ETA {'unknown' if eta is None else timedelta(seconds=int(eta))}"
+        )
+        metrics.set_gauge('scheduler_catch_up_remaining', self.remaining)
+        metrics.set_gauge('scheduler_catch_up_eta_seconds', eta or 0.0)
+
+
+def process_email_triggers(worker_id=None, batch_size=CLAIM_BATCH_SIZE, progress=None):
+    """예약 가능한 트리거가 없을 때까지 배치 단위로 예약하고 아웃박스에 기록합니다.
+
+    due 집합 전체를 읽지 않고 batch_size 개씩 예약 -> 렌더링 -> 아웃박스 기록을
+    반복하므로 backlog 크기와 관계없이 메모리 사용량이 일정하다. 예약은 due_at
+    순서라 오래 밀린 트리거부터 처리된다. progress(CatchUpProgress)를 주면
+    배치마다 진행률을 갱신한다.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    logger.info(f"Trigger email processing started at {datetime.now()} (worker {worker_id})")
+
+    total = 0
+    with metrics.timer('scheduler_cycle_seconds'), get_engine().connect() as connection:
+        while True:
+            claim_token = uuid.uuid4().hex
+            with metrics.timer('scheduler_claim_seconds'):
+                trigger_ids = claim_due_triggers(connection, claim_token, batch_size)
+            if not trigger_ids:
+                break
+            logger.info(f"Worker {worker_id} claimed {len(trigger_ids)} triggers")
+            metrics.inc('scheduler_triggers_claimed_total', len(trigger_ids))
+            processed = process_claimed_triggers(connection, claim_token)
+            metrics.inc('scheduler_triggers_processed_total', processed)
+            total += processed
+            if progress is not None:
+                progress.advance(processed, connection)
+    metrics.set_gauge('scheduler_last_cycle_timestamp', time.time())
+    return total
+
+
+def process_outbox(worker_id=None, lane=None):
+    """아웃박스에 쌓인 메시지를 발송합니다. lane 이 없으면 레인 우선순위 순으로 모두 발송."""
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    with get_engine().connect() as connection:
+        return drain_outbox(connection, worker_id, lane=lane)
+
+
+def record_backlog(timer, now):
+    """due 트리거 backlog 크기와 가장 오래 밀린 트리거의 지연(초)을 gauge 로 기록하고 반환"""
+    backlog, oldest_due = timer.due_backlog(now)
+    lag_seconds = (now - oldest_due).total_seconds() if oldest_due else 0.0
+    metrics.set_gauge('scheduler_due_backlog', backlog)
+    metrics.set_gauge('scheduler_oldest_due_lag_seconds', lag_seconds)
+    return backlog, lag_seconds
+
+
+def catch_up(worker_id=None):
+    """밀린 due 트리거를 큰 배치로 쉬지 않고 처리하고 진행률/ETA 를 로그로 남깁니다."""
+    with get_engine().connect() as connection:
+        backlog, oldest_due = count_due_backlog(connection)
+    logger.info(f"Entering catch-up mode: {backlog} due triggers, oldest due at {oldest_due} UTC")
+    metrics.set_gauge('scheduler_catch_up', 1)
+    progress = CatchUpProgress(backlog)
+    try:
+        process_email_triggers(worker_id, batch_size=CATCHUP_BATCH_SIZE, progress=progress)
+    finally:
+        metrics.set_gauge('scheduler_catch_up', 0)
+        metrics.set_gauge('scheduler_catch_up_remaining', 0)
+    logger.info(
+        f"Catch-up finished: {progress.processed} triggers in "
+        f"{progress.clock() - progress.started:.0f}s ({progress.rate():.0f} triggers/s), back to steady state"
+    )
+    return progress.processed
+
+
+def run_singleton_jobs_once():
+    """--once 용 inactivity 평가와 유언장 공개: 리더 잠금(GET_LOCK)을 잡은 프로세스만 실행
+
+    --workers N --once 로 동시에 뜬 워커나 다른 호스트의 --once 실행과 겹쳐도
+    한 곳에서만 실행되고, 잠금을 잡지 못한 워커는 건너뛰고 트리거/아웃박스 처리만 한다.
+    실행했으면 True 를 반환합니다.
+    """
+    elector = LeaderElector(get_engine())
+    try:
+        if not elector.heartbeat():
+            logger.info("Leader lock held elsewhere, skipping inactivity evaluation and will release")
+            return False
+        with get_engine().connect() as connection:
+            evaluate_inactivity_triggers(connection)
+            release_unconfirmed_wills(connection)
+        return True
+    finally:
+        elector.release()
+
+
+def run_worker(interval, once=False, refresh_seconds=REFRESH_SECONDS):
+    """스케줄러 워커 루프
+
+    매 주기마다 전체 테이블을 조회하는 대신 DueTriggerTimer 로 다음 발송 예정
+    시각까지 대기한다. 새로 생성/수정된 트리거는 refresh_seconds 마다 updated_at
+    커서로 증분 반영하되 변경이 없으면 MAX_REFRESH_SECONDS 까지 간격을 늘린다.
+    커서가 놓친 변경은 타이머가 RELOAD_SECONDS 마다 전체를 다시 적재해 반영한다.
+    처리하지 못하고 남아 있는 트리거는 interval 후 재시도한다.
+    due backlog 가 크거나 오래 밀려 있으면 catch-up 모드로 쉬지 않고 처리한다.
+    싱글톤이어야 하는 inactivity 평가와 유언장 공개(fan-out)는 GET_LOCK 리더로 선출된 워커(전체 호스트 중 하나)만
+    실행하고, 트리거 예약/발송은 SKIP LOCKED 로 중복이 막히므로 모든 워커가 나눠 처리한다.
+    once 이면 (리더 잠금을 잡은 경우에만 싱글톤 작업을 실행한 뒤) due 트리거와 아웃박스를 한 번씩 비우고 종료한다.
+    """
+    if multiprocessing.parent_process() is not None:
+        reset_inherited_engine()
+    if once:
+        run_singleton_jobs_once()
+        with get_engine().connect() as connection:
+            backlog, _ = count_due_backlog(connection)
+        if should_catch_up(backlog, 0.0):
+            catch_up()
+        else:
+            process_email_triggers()
+        process_outbox()
+        write_stats_file()
+        return
+
+    start_metrics_reporter()
+    elector = LeaderElector(get_engine()).start()
+    timer = DueTriggerTimer()
+    refresh_backoff = IdleBackoff(refresh_seconds, MAX_REFRESH_SECONDS)
+    retry_at = None
+    next_evaluation = 0.0
+    try:
+        while True:
+            try:
+                with get_engine().connect() as connection:
+                    if elector.is_leader() and time.monotonic() >= next_evaluation:
+                        if evaluate_inactivity_triggers(connection):
+                            refresh_backoff.reset()
+                        release_unconfirmed_wills(connection)
+                        next_evaluation = time.monotonic() + INACTIVITY_EVAL_SECONDS
+                    if timer.refresh(connection):
+                        refresh_backoff.reset()
+
+                now = timer.now()
+                backlog, lag_seconds = record_backlog(timer, now)
+                if timer.has_due(now) and (retry_at is None or now >= retry_at):
+                    if should_catch_up(backlog, lag_seconds):
+                        catch_up()
+                    else:
+                        process_email_triggers()
+                    refresh_backoff.reset()
+                    with get_engine().connect() as connection:
+                        timer.refresh(connection)
+                    # 기록에 실패했거나 다른 워커가 처리 중인 트리거는 interval 후에 다시 시도
+                    now = timer.now()
+                    retry_at = now + timedelta(seconds=interval) if timer.has_due(now) else None
+
+                wait = timer.seconds_until_next_due(now)
+                if retry_at is not None:
+                    wait = max(wait or 0.0, (retry_at - now).total_seconds())
+                refresh_wait = refresh_backoff.next_wait()
+                wait = refresh_wait if wait is None else min(wait, refresh_wait)
+            except Exception as e:
+                logger.error(f"[SCHEDULER ERROR] {type(e).__name__}: {e}")
+                metrics.inc('scheduler_errors_total', stage='worker', error_class=error_class(e))
+                wait = interval
+            time.sleep(wait)
+    finally:
+        elector.release()
+
+
+def run_sender(poll_seconds=OUTBOX_POLL_SECONDS, lane=None):
+    """아웃박스 발송 워커 루프: 아웃박스를 비우고, 비어 있으면 poll_seconds 부터 점점 길게 대기
+
+    lane 을 주면 그 레인 전용 워커가 된다 (레인마다 프로세스/SMTP 세션이 따로라
+    대량 유언장 공개가 live confirmation 발송을 기다리게 하지 않음).
+    """
+    if multiprocessing.parent_process() is not None:
+        reset_inherited_engine()
+    start_metrics_reporter()
+    poll_backoff = IdleBackoff(poll_seconds, OUTBOX_MAX_POLL_SECONDS)
     while True:
-        process_email_triggers()
-        time.sleep(60)  # 1분마다 실행 (원하는 주기로 조정)
+        try:
+            if process_outbox(lane=lane):
+                poll_backoff.reset()
+        except Exception as e:
+            logger.error(f"[SENDER ERROR] {type(e).__name__}: {e}")
+            metrics.inc('scheduler_errors_total', stage='sender', error_class=error_class(e))
+        time.sleep(poll_backoff.next_wait())
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Live confirmation trigger scheduler")
+    parser.add_argument('--workers', type=int, default=1, help='병렬로 실행할 트리거 워커 프로세스 수 (기본 1)')
+    parser.add_argument('--senders', type=int, default=1, help='레인마다 띄울 아웃박스 발송 워커 프로세스 수 (기본 1)')
+    parser.add_argument('--confirmation-senders', type=int, default=None,
+                        help='live confirmation 레인 발송 워커 수 (기본 --senders)')
+    parser.add_argument('--release-senders', type=int, default=None,
+                        help='유언장 공개 레인 발송 워커 수 (기본 --senders)')
+    parser.add_argument('--interval', type=int, default=60, help='남은 트리거 재시도 주기(초) (기본 60)')
+    parser.add_argument('--refresh', type=float, default=REFRESH_SECONDS, help='트리거 변경분 반영 주기(초)')
+    parser.add_argument('--once', action='store_true', help='한 번만 처리하고 종료')
+    parser.add_argument('--metrics-port', type=int, default=int(os.environ.get('SCHEDULER_METRICS_PORT', '0')),
+                        help='워커 메트릭을 합쳐 노출할 로컬 HTTP 포트 (0 이면 stats 파일만 기록)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.once and args.workers <= 1:
+        run_worker(args.interval, args.once, args.refresh)
+        return
+
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(args.interval, args.once, args.refresh), name=f"scheduler-worker-{i}")
+        for i in range(args.workers)
+    ]
+    if not args.once:
+        # --once 이면 각 트리거 워커가 아웃박스까지 비우고 종료한다
+        lane_senders = {
+            'confirmation': args.confirmation_senders,
+            'release': args.release_senders,
+        }
+        processes += [
+            multiprocessing.Process(target=run_sender, kwargs={'lane': lane}, name=f"outbox-sender-{lane}-{i}")
+            for lane in LANES
+            for i in range(args.senders if lane_senders.get(lane) is None else lane_senders[lane])
+        ]
+    for process in processes:
+        process.start()
+    if args.metrics_port:
+        serve_metrics(args.metrics_port)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+스케줄러 메트릭 (counter / gauge / histogram)
+- 프로세스마다 메모리 레지스트리(metrics)에 기록하고, reporter 스레드가
+  SCHEDULER_METRICS_FLUSH_SECONDS 마다 SCHEDULER_METRICS_DIR/<프로세스 이름>.json 으로 저장
+- SCHEDULER_METRICS_PORT(또는 --metrics-port)를 주면 부모 프로세스가 모든 워커의
+  stats 파일을 합쳐 http://127.0.0.1:<port>/metrics (Prometheus text) 와
+  /metrics.json 으로 노출
+- 합칠 때 counter/histogram 은 합계, gauge 는 프로세스 중 최대값
+"""
+
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger("live_confirmation_scheduler.metrics")
+
+METRICS_DIR = os.environ.get(
+    'SCHEDULER_METRICS_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'logs', 'metrics')
+)
+METRICS_FLUSH_SECONDS = float(os.environ.get('SCHEDULER_METRICS_FLUSH_SECONDS', '10'))
+# 이 시간 이상 갱신되지 않은 stats 파일(종료된 프로세스)은 합치지 않음
+METRICS_STALE_SECONDS = float(os.environ.get('SCHEDULER_METRICS_STALE_SECONDS', str(METRICS_FLUSH_SECONDS * 6)))
+
+# 초 단위 latency 버킷
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def series_key(name, labels):
+    """Prometheus 형식 시계열 이름: name{label="value",...}"""
+    if not labels:
+        return name
+    rendered = ','.join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    return f"{name}{{{rendered}}}"
+
+
+def split_series_key(key):
+    """series_key 의 역: (name, '{...}' 또는 '')"""
+    index = key.find('{')
+    return (key, '') if index < 0 else (key[:index], key[index:])
+
+
+class MetricsRegistry:
+    """스레드 안전한 프로세스 로컬 메트릭 저장소"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counters = {}
+            self._gauges = {}
+            self._histograms = {}
+
+    def inc(self, name, amount=1, **labels):
+        key = series_key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def set_gauge(self, name, value, **labels):
+        key = series_key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name, value, buckets=DEFAULT_BUCKETS, **labels):
+        key = series_key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {
+                    'buckets': list(buckets), 'counts': [0] * len(buckets), 'sum': 0.0, 'count': 0,
+                }
+            for index, bound in enumerate(histogram['buckets']):
+                if value <= bound:
+                    histogram['counts'][index] += 1
+                    break
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """with 블록 실행 시간을 histogram 에 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'gauges': dict(self._gauges),
+                'histograms': {
+                    key: dict(histogram, counts=list(histogram['counts']))
+                    for key, histogram in self._histograms.items()
+                },
+            }
+
+
+metrics = MetricsRegistry()
+
+
+def error_class(error):
+    """실패 원인 분류: smtp_4xx / smtp_5xx / connection / 예외 클래스 이름"""
+    code = getattr(error, 'smtp_code', None)
+    if code is None and hasattr(error, 'recipients'):
+        codes = [code for code, _ in error.recipients.values()]
+        code = max(codes) if codes else None
+    if isinstance(code, int) and 400 <= code < 600:
+        return f"smtp_{code // 100}xx"
+    if isinstance(error, (OSError, ConnectionError)):
+        return 'connection'
+    return type(error).__name__
+
+
+# ---- stats 파일 ----
+
+_reporter_pid = None
+
+
+def stats_file_path(process_name=None):
+    return os.path.join(METRICS_DIR, f"{process_name or multiprocessing.current_process().name}.json")
+
+
+def write_stats_file(path=None):
+    """현재 레지스트리를 stats 파일로 저장 (임시 파일 후 rename 으로 원자적 교체)"""
+    path = path or stats_file_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    payload = dict(metrics.snapshot(), pid=os.getpid(), updated_at=time.time())
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+
+def start_metrics_reporter(flush_seconds=METRICS_FLUSH_SECONDS):
+    """프로세스(fork 된 워커 포함)마다 stats 파일 저장 스레드를 하나씩 띄운다."""
+    global _reporter_pid
+    if _reporter_pid == os.getpid():
+        return
+    if _reporter_pid is not None:
+        metrics.reset()  # 부모에게서 상속된 값은 버림
+    _reporter_pid = os.getpid()
+    path = stats_file_path()
+
+    def run():
+        while True:
+            time.sleep(flush_seconds)
+            try:
+                write_stats_file(path)
+            except Exception as e:
+                logger.error(f"[METRICS ERROR] {type(e).__name__}: {e}")
+
+    threading.Thread(target=run, name='metrics-reporter', daemon=True).start()
+
+
+def merge_snapshots(snapshots):
+    merged = {'counters': {}, 'gauges': {}, 'histograms': {}}
+    for snapshot in snapshots:
+        for key, value in snapshot.get('counters', {}).items():
+            merged['counters'][key] = merged['counters'].get(key, 0) + value
+        for key, value in snapshot.get('gauges', {}).items():
+            merged['gauges'][key] = max(value, merged['gauges'].get(key, value))
+        for key, histogram in snapshot.get('histograms', {}).items():
+            target = merged['histograms'].get(key)
+            if target is None or target['buckets'] != histogram['buckets']:
+                merged['histograms'][key] = dict(histogram, counts=list(histogram['counts']))
+                continue
+            target['counts'] = [a + b for a, b in zip(target['counts'], histogram['counts'])]
+            target['sum'] += histogram['sum']
+            target['count'] += histogram['count']
+    return merged
+
+
+def read_stats_files(directory=None, stale_seconds=METRICS_STALE_SECONDS):
+    """살아 있는 프로세스들의 stats 파일을 읽어 합칩니다."""
+    directory = directory or METRICS_DIR
+    snapshots = []
+    now = time.time()
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if now - snapshot.get('updated_at', 0) <= stale_seconds:
+            snapshots.append(snapshot)
+    return merge_snapshots(snapshots)
+
+
+def render_prometheus(snapshot):
+    """합친 스냅샷을 Prometheus text exposition 형식으로 변환"""
+    lines = []
+    for kind, section in (('counter', 'counters'), ('gauge', 'gauges')):
+        typed = set()
+        for key in sorted(snapshot[section]):
+            name, _ = split_series_key(key)
+            if name not in typed:
+                lines.append(f"# TYPE {name} {kind}")
+                typed.add(name)
+            lines.append(f"{key} {snapshot[section][key]}")
+
+    typed = set()
+    for key in sorted(snapshot['histograms']):
+        histogram = snapshot['histograms'][key]
+        name, labels = split_series_key(key)
+        if name not in typed:
+            lines.append(f"# TYPE {name} histogram")
+            typed.add(name)
+        label_prefix = labels[1:-1] + ',' if labels else ''
+        cumulative = 0
+        for bound, count in zip(histogram['buckets'], histogram['counts']):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{label_prefix}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{label_prefix}le="+Inf"}} {histogram["count"]}')
+        lines.append(f"{name}_sum{labels} {histogram['sum']}")
+        lines.append(f"{name}_count{labels} {histogram['count']}")
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == '/metrics':
+            body = render_prometheus(read_stats_files()).encode()
+            content_type = 'text/plain; version=0.0.4'
+        elif self.path == '/metrics.json':
+            body = json.dumps(read_stats_files()).encode()
+            content_type = 'application/json'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+def serve_metrics(port, host='127.0.0.1'):
+    """stats 파일을 합쳐 노출하는 로컬 HTTP 서버를 데몬 스레드로 시작합니다."""
+    server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    logger.info(f"Scheduler metrics at http://{host}:{server.server_address[1]}/metrics")
+    return server
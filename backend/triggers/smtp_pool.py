@@ -0,0 +1,216 @@
+"""
+SMTP 커넥션 풀
+- 설정(SMTP_*)은 시작 시 한 번만 읽음
+- 운영 릴레이(postfix)는 AUTH 없이 받으므로 기본은 로그인/STARTTLS 없이 접속
+  SMTP_AUTH=1 (SMTP_USER/SMTP_PASS 필요), SMTP_STARTTLS=1 로 명시적으로 켠 경우에만 사용
+- N개의 장기 세션을 재사용해 메시지마다 TCP/EHLO 핸드셰이크를 반복하지 않음
+- 오래 쉰 세션은 NOOP 으로 상태 확인, 421/끊김/타임아웃이면 재연결 후 재시도
+"""
+
+import os
+import queue
+import smtplib
+import socket
+import ssl
+import threading
+import time
+import logging
+
+from triggers.scheduler_metrics import metrics
+
+logger = logging.getLogger("live_confirmation_scheduler.smtp")
+
+# 재연결 후 다시 보내도 되는 오류 (세션 문제이지 메시지 문제가 아님)
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, socket.timeout, ConnectionError)
+
+
+def env_flag(name, default='false'):
+    """'1' / 'true' / 'yes' / 'on' 이면 True"""
+    return os.environ.get(name, default).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class SMTPConfig:
+    """SMTP 접속 설정"""
+
+    def __init__(self, host, port, user=None, password=None, starttls=False, auth=False,
+                 pool_size=4, timeout=30, idle_check_seconds=30, max_messages_per_session=500,
+                 max_recipients_per_message=50, relays=None):
+        if auth and not (user and password):
+            raise ValueError('SMTP_AUTH requires SMTP_USER and SMTP_PASS')
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        # 켜져 있을 때만 login (user/password 가 있어도 기본은 AUTH 없이 접속)
+        self.auth = auth
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.idle_check_seconds = idle_check_seconds
+        self.max_messages_per_session = max_messages_per_session
+        # 같은 도메인/같은 내용 수신자를 한 SMTP 트랜잭션(RCPT TO 여러 번)으로 묶을 최대 수 (1 이면 묶지 않음)
+        self.max_recipients_per_message = max_recipients_per_message
+        # [(host, port, weight), ...] — 없으면 host/port 한 곳 (SMTPRelayPool 참고)
+        self.relays = relays or [(host, port, 1)]
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            host=os.environ.get('SMTP_HOST', 'localhost'),
+            port=int(os.environ.get('SMTP_PORT', '25')),
+            user=os.environ.get('SMTP_USER'),
+            password=os.environ.get('SMTP_PASS'),
+            starttls=env_flag('SMTP_STARTTLS'),
+            auth=env_flag('SMTP_AUTH'),
+            pool_size=int(os.environ.get('SMTP_POOL_SIZE', '4')),
+            timeout=float(os.environ.get('SMTP_TIMEOUT', '30')),
+            idle_check_seconds=float(os.environ.get('SMTP_IDLE_CHECK_SECONDS', '30')),
+            max_messages_per_session=int(os.environ.get('SMTP_MAX_MESSAGES_PER_SESSION', '500')),
+            max_recipients_per_message=int(os.environ.get('SMTP_MAX_RECIPIENTS_PER_MESSAGE', '50')),
+            relays=parse_relays(os.environ.get('SMTP_RELAYS'), default_port=int(os.environ.get('SMTP_PORT', '25'))),
+        )
+
+    def for_relay(self, host, port):
+        """같은 설정으로 릴레이 한 곳에 접속하는 설정"""
+        return SMTPConfig(
+            host, port, user=self.user, password=self.password, starttls=self.starttls, auth=self.auth,
+            pool_size=self.pool_size, timeout=self.timeout, idle_check_seconds=self.idle_check_seconds,
+            max_messages_per_session=self.max_messages_per_session,
+            max_recipients_per_message=self.max_recipients_per_message,
+        )
+
+    def __repr__(self):
+        # 비밀번호는 로그에 남기지 않는다
+        return (
+            f"SMTPConfig(host={self.host!r}, port={self.port}, user={self.user!r}, auth={self.auth}, starttls={self.starttls}, "
+            f"pool_size={self.pool_size}, relays={len(self.relays)})"
+        )
+
+
+def parse_relays(value, default_port=25):
+    """'postfix1:25=3,postfix2=1' -> [('postfix1', 25, 3), ('postfix2', 25, 1)] (없으면 None)"""
+    relays = []
+    for item in (value or '').split(','):
+        address, _, weight = item.strip().partition('=')
+        if not address:
+            continue
+        host, _, port = address.partition(':')
+        relays.append((host, int(port) if port else default_port, max(1, int(weight)) if weight else 1))
+    return relays or None
+
+
+class _Session:
+    """풀에서 관리하는 SMTP 세션 하나"""
+
+    def __init__(self, config):
+        self.config = config
+        self.server = None
+        self.messages_sent = 0
+        self.last_used = 0.0
+
+    def connect(self):
+        config = self.config
+        with metrics.timer('smtp_connect_seconds'):
+            server = smtplib.SMTP(config.host, config.port, timeout=config.timeout)
+            if config.starttls:
+                server.starttls(context=ssl.create_default_context())
+            if config.auth:
+                server.login(config.user, config.password)
+        metrics.inc('smtp_connections_total')
+        self.server = server
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+    def close(self):
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except Exception:
+            try:
+                self.server.close()
+            except Exception:
+                pass
+        self.server = None
+
+    def ensure_healthy(self):
+        """연결이 없거나, 재활용 한도를 넘었거나, NOOP 에 실패하면 새로 연결"""
+        if self.server is not None and self.messages_sent >= self.config.max_messages_per_session:
+            self.close()
+        if self.server is not None and time.monotonic() - self.last_used > self.config.idle_check_seconds:
+            try:
+                code, _ = self.server.noop()
+                if code != 250:
+                    self.close()
+            except (smtplib.SMTPException, OSError):
+                self.close()
+        if self.server is None:
+            self.connect()
+
+    def sendmail(self, from_addr, to_addrs, message):
+        refused = self.server.sendmail(from_addr, to_addrs, message)
+        self.messages_sent += 1
+        self.last_used = time.monotonic()
+        return refused
+
+
+class SMTPConnectionPool:
+    """스레드 안전한 SMTP 세션 풀
+
+    세션은 필요할 때 만들어지고 최대 pool_size 개까지 유지된다.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(config.pool_size)
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            session = _Session(self.config)
+            with self._lock:
+                self._sessions.append(session)
+            return session
+
+    def _release(self, session):
+        self._idle.put(session)
+        self._slots.release()
+
+    def send(self, from_addr, to_addrs, message):
+        """메시지 하나를 발송합니다. 세션 오류면 한 번 재연결해 재시도합니다.
+
+        수신 거부된 주소 dict 를 반환합니다 (smtplib.SMTP.sendmail 과 동일).
+        """
+        session = self._acquire()
+        try:
+            for attempt in (1, 2):
+                try:
+                    session.ensure_healthy()
+                    return session.sendmail(from_addr, to_addrs, message)
+                except RECONNECT_ERRORS as e:
+                    session.close()
+                    if attempt == 2:
+                        raise
+                    logger.warning(f"[SMTP RECONNECT] {type(e).__name__}: {e}")
+                except smtplib.SMTPResponseException as e:
+                    # 421: 서버가 세션을 닫겠다는 응답 -> 새 세션으로 재시도
+                    if e.smtp_code != 421:
+                        raise
+                    session.close()
+                    if attempt == 2:
+                        raise
+                    logger.warning(f"[SMTP RECONNECT] 421 {e.smtp_error!r}")
+        finally:
+            self._release(session)
+
+    def close(self):
+        """모든 세션을 닫습니다 (프로세스 종료 시 호출)."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
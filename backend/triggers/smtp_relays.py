@@ -0,0 +1,219 @@
+"""
+SMTP 릴레이 여러 대로 부하 분산 + 장애 조치
+- SMTP_RELAYS="postfix1:25=3,postfix2:25=1" 처럼 릴레이와 가중치를 지정 (없으면 SMTP_HOST/SMTP_PORT 한 곳)
+- 릴레이마다 SMTPConnectionPool 하나 (세션 수는 릴레이당 SMTP_POOL_SIZE)
+- 선택 방식 SMTP_RELAY_STRATEGY
+  least_outstanding (기본) : (진행 중 발송 수 + 1) / 가중치 가 가장 작은 릴레이
+  round_robin              : smooth weighted round-robin
+- 연결 오류/421 이 SMTP_RELAY_MAX_FAILURES 번 연속되면 SMTP_RELAY_EJECT_SECONDS 동안 제외하고
+  (다시 제외될 때마다 두 배, 최대 SMTP_RELAY_MAX_EJECT_SECONDS) 같은 메시지는 다른 릴레이로 재시도
+- 제외 시간이 지난 릴레이는 health check 스레드가 접속 + NOOP 에 성공해야 다시 투입
+- 모든 릴레이가 제외되면 가장 먼저 풀리는 릴레이로 보내 본다 (전체 발송 중단 방지)
+"""
+
+import logging
+import os
+import smtplib
+import threading
+import time
+
+from triggers.scheduler_metrics import metrics
+from triggers.smtp_pool import RECONNECT_ERRORS, SMTPConnectionPool, _Session
+
+logger = logging.getLogger("live_confirmation_scheduler.smtp")
+
+RELAY_STRATEGY = os.environ.get('SMTP_RELAY_STRATEGY', 'least_outstanding')
+RELAY_MAX_FAILURES = int(os.environ.get('SMTP_RELAY_MAX_FAILURES', '3'))
+RELAY_EJECT_SECONDS = float(os.environ.get('SMTP_RELAY_EJECT_SECONDS', '10'))
+RELAY_MAX_EJECT_SECONDS = float(os.environ.get('SMTP_RELAY_MAX_EJECT_SECONDS', '300'))
+RELAY_HEALTH_SECONDS = float(os.environ.get('SMTP_RELAY_HEALTH_SECONDS', '5'))
+
+
+def is_relay_failure(error):
+    """메시지 문제가 아니라 릴레이(연결) 문제인 오류: 다른 릴레이로 다시 보내도 된다.
+
+    smtplib.SMTPException 도 OSError 의 하위 클래스이므로 SMTP 응답 오류를 먼저 가른다.
+    """
+    if isinstance(error, (smtplib.SMTPConnectError,) + RECONNECT_ERRORS):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code == 421
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+class Relay:
+    """릴레이 한 대와 그 상태"""
+
+    def __init__(self, config, weight=1):
+        self.config = config
+        self.name = f"{config.host}:{config.port}"
+        self.weight = weight
+        self.pool = SMTPConnectionPool(config)
+        self.outstanding = 0
+        self.sent = 0
+        self.current_weight = 0  # smooth weighted round-robin 용
+        self.failures = 0
+        self.ejections = 0
+        self.ejected_until = None
+
+    def is_available(self):
+        return self.ejected_until is None
+
+    def probe(self):
+        """접속 + NOOP 으로 릴레이가 살아났는지 확인"""
+        session = _Session(self.config)
+        try:
+            session.connect()
+            code, _ = session.server.noop()
+            return code == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+        finally:
+            session.close()
+
+
+class SMTPRelayPool:
+    """SMTPConnectionPool 과 같은 send()/close() 를 제공하는 다중 릴레이 풀"""
+
+    def __init__(self, config, strategy=RELAY_STRATEGY, max_failures=RELAY_MAX_FAILURES,
+                 eject_seconds=RELAY_EJECT_SECONDS, max_eject_seconds=RELAY_MAX_EJECT_SECONDS,
+                 health_seconds=RELAY_HEALTH_SECONDS, clock=time.monotonic):
+        self.config = config
+        self.relays = [Relay(config.for_relay(host, port), weight) for host, port, weight in config.relays]
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.eject_seconds = eject_seconds
+        self.max_eject_seconds = max_eject_seconds
+        self.health_seconds = health_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._health_thread = None
+        for relay in self.relays:
+            metrics.set_gauge('smtp_relay_healthy', 1, relay=relay.name)
+
+    # ---- 선택 ----
+
+    def _choose(self, exclude):
+        candidates = [relay for relay in self.relays if relay.is_available() and relay not in exclude]
+        if not candidates:
+            # 모두 제외됐으면 가장 먼저 풀리는 릴레이로 시도
+            remaining = [relay for relay in self.relays if relay not in exclude]
+            if not remaining:
+                return None
+            return min(remaining, key=lambda relay: relay.ejected_until or 0.0)
+        if self.strategy == 'round_robin':
+            total = sum(relay.weight for relay in candidates)
+            for relay in candidates:
+                relay.current_weight += relay.weight
+            chosen = max(candidates, key=lambda relay: relay.current_weight)
+            chosen.current_weight -= total
+            return chosen
+        # 진행 중 발송이 같으면 지금까지 보낸 양(가중치 대비)이 적은 릴레이
+        return min(candidates, key=lambda relay: ((relay.outstanding + 1) / relay.weight, relay.sent / relay.weight))
+
+    def _acquire(self, exclude):
+        with self._lock:
+            relay = self._choose(exclude)
+            if relay is not None:
+                relay.outstanding += 1
+            return relay
+
+    # ---- 상태 ----
+
+    def _record_success(self, relay):
+        with self._lock:
+            relay.outstanding -= 1
+            relay.sent += 1
+            relay.failures = 0
+            relay.ejections = 0
+            recovered = not relay.is_available()
+        if recovered:
+            # 모두 제외된 상태에서 보내 본 릴레이가 응답했으면 바로 다시 투입
+            self._readmit(relay)
+
+    def _record_failure(self, relay, error):
+        with self._lock:
+            relay.outstanding -= 1
+            relay.failures += 1
+            if relay.failures < self.max_failures or not relay.is_available():
+                return
+            relay.ejections += 1
+            seconds = min(self.max_eject_seconds, self.eject_seconds * 2 ** (relay.ejections - 1))
+            relay.ejected_until = self.clock() + seconds
+        logger.warning(f"[SMTP RELAY] ejecting {relay.name} for {seconds:.0f}s after {relay.failures} failures: {error}")
+        metrics.inc('smtp_relay_ejections_total', relay=relay.name)
+        metrics.set_gauge('smtp_relay_healthy', 0, relay=relay.name)
+        relay.pool.close()
+        self._start_health_check()
+
+    def _readmit(self, relay):
+        with self._lock:
+            relay.ejected_until = None
+            relay.failures = 0
+        logger.info(f"[SMTP RELAY] {relay.name} is healthy again")
+        metrics.set_gauge('smtp_relay_healthy', 1, relay=relay.name)
+
+    def check_ejected(self):
+        """제외 시간이 지난 릴레이를 probe 해 살아 있으면 다시 투입, 아니면 제외 연장"""
+        now = self.clock()
+        for relay in self.relays:
+            if relay.ejected_until is None or relay.ejected_until > now:
+                continue
+            if relay.probe():
+                self._readmit(relay)
+            else:
+                with self._lock:
+                    relay.ejections += 1
+                    relay.ejected_until = now + min(
+                        self.max_eject_seconds, self.eject_seconds * 2 ** (relay.ejections - 1)
+                    )
+
+    def _start_health_check(self):
+        with self._lock:
+            if self._health_thread is not None and self._health_thread.is_alive():
+                return
+            self._health_thread = threading.Thread(target=self._run_health_check, name='smtp-relay-health', daemon=True)
+            self._health_thread.start()
+
+    def _run_health_check(self):
+        # 제외된 릴레이가 있는 동안만 동작
+        while not self._stopped.wait(self.health_seconds):
+            self.check_ejected()
+            if all(relay.is_available() for relay in self.relays):
+                return
+
+    # ---- 발송 ----
+
+    def send(self, from_addr, to_addrs, message):
+        """릴레이를 골라 발송하고, 릴레이 장애면 다른 릴레이로 다시 보냅니다.
+
+        수신 거부된 주소 dict 를 반환합니다 (smtplib.SMTP.sendmail 과 동일).
+        메시지 자체의 오류(5xx, 421 이 아닌 4xx)는 그대로 올린다.
+        """
+        tried = []
+        last_error = None
+        while True:
+            relay = self._acquire(tried)
+            if relay is None:
+                raise last_error
+            tried.append(relay)
+            try:
+                refused = relay.pool.send(from_addr, to_addrs, message)
+            except Exception as e:
+                if not is_relay_failure(e):
+                    self._record_success(relay)  # 릴레이는 정상 응답함
+                    raise
+                self._record_failure(relay, e)
+                last_error = e
+                logger.warning(f"[SMTP RELAY] {relay.name} failed ({type(e).__name__}: {e}), trying another relay")
+                continue
+            self._record_success(relay)
+            metrics.inc('smtp_relay_sends_total', relay=relay.name)
+            return refused
+
+    def close(self):
+        """모든 릴레이 세션을 닫고 health check 를 멈춥니다."""
+        self._stopped.set()
+        for relay in self.relays:
+            relay.pool.close()
@@ -0,0 +1,170 @@
+"""
+유언장 공개(will release) fan-out
+- live confirmation 메일을 보낸 뒤 WILL_RELEASE_GRACE_HOURS 동안 사용자가 로그인/활동(last_seen_at)하거나
+  확인 링크(dispatch_log.read_at)를 누르지 않으면 그 유언장을 수신자 전원에게 발송
+  링크는 메일을 아웃박스에 넣을 때 만든 dispatch_log 행(email_outbox.dispatch_log_id)을 가리키고,
+  read_at 과 sent_at 은 모두 DB NOW() 로 기록하므로 같은 시계로 비교한다
+  (그 메일의 링크이거나, 같은 유언장의 다른 확인 링크를 그 메일 발송 이후에 눌렀으면 응답으로 봄)
+- 수신자별 dispatch_log 행은 INSERT ... SELECT 한 문장으로 일괄 생성
+- 아웃박스 기록은 dispatch_log id keyset 으로 WILL_RELEASE_BATCH_SIZE 명씩 진행:
+  배치마다 SELECT 1번 + render_batch + multi-row INSERT 1번 (수신자 수만큼 쿼리하지 않음)
+- 배치마다 커밋하고 이미 아웃박스에 기록된 dispatch_log 는 건너뛰므로,
+  중간에 실패해도 다시 실행하면 남은 수신자부터 이어서 기록 (wills.released_at 은 모두 기록한 뒤 표시)
+- 동시에 두 번 fan-out 되어도 dispatch_log (will_id, recipient_id, type) 와
+  email_outbox (dispatch_log_id) 유니크 키 + INSERT IGNORE 로 수신자마다 한 통만 기록
+- 발송은 기존 아웃박스 발송 워커가 배치 단위로 수행하고 결과는 미리 만든 dispatch_log 행에 기록
+"""
+
+import logging
+import os
+
+from sqlalchemy import text
+
+from triggers.email_outbox import DISPATCH_TYPE_LIVE_CONFIRMATION, DISPATCH_TYPE_WILL_RELEASE, outbox_message, enqueue_emails
+from triggers.email_templates import WILL_RELEASE, render_batch
+from triggers.scheduler_metrics import metrics, error_class
+
+logger = logging.getLogger("live_confirmation_scheduler.release")
+
+# live confirmation 발송 후 응답을 기다리는 시간
+WILL_RELEASE_GRACE_HOURS = int(os.environ.get('WILL_RELEASE_GRACE_HOURS', '72'))
+# 이보다 오래된 live confirmation 은 다시 보지 않음 (grace 이후 추가로 살펴보는 기간)
+WILL_RELEASE_LOOKBACK_HOURS = int(os.environ.get('WILL_RELEASE_LOOKBACK_HOURS', '720'))
+# 아웃박스에 한 번에 기록할 수신자 수
+WILL_RELEASE_BATCH_SIZE = int(os.environ.get('WILL_RELEASE_BATCH_SIZE', '1000'))
+# 한 번의 평가에서 공개할 최대 유언장 수
+WILL_RELEASE_MAX_WILLS = int(os.environ.get('WILL_RELEASE_MAX_WILLS', '100'))
+# 인사말에 수신자 이름을 넣을지 여부. 넣지 않으면 본문이 모두 같아 같은 도메인 수신자를
+# 한 SMTP 트랜잭션으로 묶어 보낼 수 있다 (email_outbox.group_by_domain)
+WILL_RELEASE_GREET_BY_NAME = os.environ.get('WILL_RELEASE_GREET_BY_NAME', 'false').lower() == 'true'
+
+
+def find_unconfirmed_wills(connection, grace_hours=WILL_RELEASE_GRACE_HOURS,
+                           lookback_hours=WILL_RELEASE_LOOKBACK_HOURS, limit=WILL_RELEASE_MAX_WILLS):
+    """live confirmation 에 응답하지 않은 미공개 유언장의 (will_id, trigger_id) 목록
+
+    idx_outbox_type_status_sent (dispatch_type, status, sent_at) 범위 스캔으로
+    grace 가 지난 live confirmation 발송 건만 읽는다.
+    """
+    rows = connection.execute(text("""
+        SELECT o.will_id, MAX(o.trigger_id) AS trigger_id
+        FROM email_outbox o
+        JOIN wills w ON w.id = o.will_id
+        JOIN UserInfo u ON u.user_id = w.user_id
+        WHERE o.dispatch_type = :live_confirmation AND o.status = 'sent'
+        AND o.sent_at >= NOW() - INTERVAL :window HOUR
+        AND o.sent_at < NOW() - INTERVAL :grace HOUR
+        AND w.released_at IS NULL
+        AND u.last_seen_at < o.sent_at
+        AND NOT EXISTS (
+            SELECT 1 FROM dispatch_log d
+            WHERE d.will_id = o.will_id AND d.type = :live_confirmation AND d.read_at IS NOT NULL
+            AND (d.id = o.dispatch_log_id OR d.read_at >= o.sent_at)
+        )
+        GROUP BY o.will_id
+        ORDER BY o.will_id
+        LIMIT :limit
+    """), {
+        "live_confirmation": DISPATCH_TYPE_LIVE_CONFIRMATION,
+        "grace": grace_hours,
+        "window": grace_hours + lookback_hours,
+        "limit": limit,
+    }).fetchall()
+    connection.commit()
+    return [(row.will_id, row.trigger_id) for row in rows]
+
+
+def owner_display_name(firstname, lastname, user_id):
+    name = f"{lastname or ''}{firstname or ''}".strip()
+    return name or user_id
+
+
+def fan_out_will(connection, will_id, trigger_id=None, batch_size=WILL_RELEASE_BATCH_SIZE):
+    """유언장 하나를 수신자 전원의 아웃박스 메시지로 펼칩니다. 아웃박스에 기록한 메시지 수를 반환합니다.
+
+    1. 수신자별 dispatch_log(pending) 일괄 INSERT IGNORE ... SELECT (이미 있는 수신자는 건너뜀)
+    2. 아직 아웃박스에 없는 dispatch_log 를 id 순으로 batch_size 개씩 읽어 렌더링 후 일괄 INSERT
+    3. wills.released_at 표시
+    """
+    will = connection.execute(text("""
+        SELECT w.id, w.subject, w.body, u.user_id, u.firstname, u.lastname, u.grade
+        FROM wills w
+        JOIN UserInfo u ON u.user_id = w.user_id
+        WHERE w.id = :will_id
+    """), {"will_id": will_id}).fetchone()
+    if will is None:
+        connection.commit()
+        return 0
+
+    # uq_dispatch_log_will_recipient_type 에 걸리는(이미 있는) 수신자는 IGNORE 로 건너뜀
+    created = connection.execute(text("""
+        INSERT IGNORE INTO dispatch_log (will_id, recipient_id, status, type)
+        SELECT r.will_id, r.id, 'pending', :type
+        FROM recipients r
+        WHERE r.will_id = :will_id
+    """), {"will_id": will_id, "type": DISPATCH_TYPE_WILL_RELEASE}).rowcount
+    connection.commit()
+    logger.info(f"Releasing will {will_id} (trigger {trigger_id}): {created} dispatch_log rows created")
+
+    common = {
+        "subject": will.subject,
+        "body": will.body or '',
+        "owner_name": owner_display_name(will.firstname, will.lastname, will.user_id),
+    }
+    total = 0
+    after_id = 0
+    while True:
+        rows = connection.execute(text("""
+            SELECT d.id, r.id AS recipient_id, r.recipient_email, r.recipient_name
+            FROM dispatch_log d
+            JOIN recipients r ON r.id = d.recipient_id
+            WHERE d.will_id = :will_id AND d.type = :type AND d.status = 'pending'
+            AND d.id > :after_id
+            AND NOT EXISTS (SELECT 1 FROM email_outbox o WHERE o.dispatch_log_id = d.id)
+            ORDER BY d.id
+            LIMIT :batch_size
+        """), {
+            "will_id": will_id, "type": DISPATCH_TYPE_WILL_RELEASE, "after_id": after_id, "batch_size": batch_size,
+        }).fetchall()
+        if not rows:
+            break
+
+        rendered = render_batch(WILL_RELEASE, [
+            {"recipient_name": row.recipient_name if WILL_RELEASE_GREET_BY_NAME else None} for row in rows
+        ], **common)
+        enqueue_emails(connection, [
+            outbox_message(
+                row.recipient_email, subject, body, will_id, trigger_id=trigger_id, recipient_id=row.recipient_id,
+                dispatch_type=DISPATCH_TYPE_WILL_RELEASE, dispatch_log_id=row.id, grade=will.grade,
+            )
+            for row, (subject, body) in zip(rows, rendered)
+        ], ignore_duplicates=True)
+        connection.commit()
+        total += len(rows)
+        after_id = rows[-1].id
+
+    connection.execute(
+        text("UPDATE wills SET released_at = NOW() WHERE id = :will_id AND released_at IS NULL"),
+        {"will_id": will_id}
+    )
+    connection.commit()
+    metrics.inc('will_release_emails_total', total)
+    logger.info(f"Will {will_id} fanned out to {total} recipients")
+    return total
+
+
+def release_unconfirmed_wills(connection):
+    """응답 없는 유언장을 찾아 수신자들에게 fan-out 합니다. 공개한 유언장 수를 반환합니다."""
+    released = 0
+    for will_id, trigger_id in find_unconfirmed_wills(connection):
+        try:
+            fan_out_will(connection, will_id, trigger_id)
+            released += 1
+        except Exception as e:
+            # 다음 평가 때 남은 수신자부터 이어서 기록된다
+            logger.error(f"Failed to release will {will_id}: {type(e).__name__}: {e}")
+            metrics.inc('scheduler_errors_total', stage='will_release', error_class=error_class(e))
+            connection.rollback()
+    if released:
+        metrics.inc('will_releases_total', released)
+    return released
@@ -0,0 +1,39 @@
+"""
+스케줄러/발송 워커 전용 경량 DB 부트스트랩
+- app.app 을 import 하면 Flask 앱, 모든 블루프린트/라우트 클로저, 로깅 설정,
+  시작 시 SELECT 1 연결 테스트까지 실행되지만 워커에 필요한 것은 DB 엔진뿐
+- .env 와 Config 의 접속 URI 만 읽어 SQLAlchemy 엔진을 만든다
+- 워커는 raw SQL(text) 만 사용하므로 ORM 모델/메타데이터도 적재하지 않음
+"""
+
+import os
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine
+
+load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'))
+
+from config import Config  # .env 로드 후에 import 해야 접속 URI 가 결정됨
+
+# Flask-SQLAlchemy 가 MySQL 에 적용하는 기본값과 동일하게 오래된 커넥션을 재생성
+POOL_RECYCLE_SECONDS = int(os.environ.get('SCHEDULER_DB_POOL_RECYCLE', '7200'))
+
+_engine = None
+
+
+def get_engine():
+    """워커 프로세스의 SQLAlchemy 엔진 (처음 호출 시 생성)"""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(
+            Config.SQLALCHEMY_DATABASE_URI,
+            pool_recycle=POOL_RECYCLE_SECONDS,
+            pool_pre_ping=True,
+        )
+    return _engine
+
+
+def reset_inherited_engine():
+    """fork 로 상속된 커넥션 풀을 부모와 공유하지 않도록 새로 만든다."""
+    if _engine is not None:
+        _engine.dispose(close=False)
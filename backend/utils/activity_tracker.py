@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+DMS 사용자 활동(last_seen_at) 추적 모듈
+- 인증된 요청마다 메모리 버퍼에 user_id 만 기록 (요청 경로에 DB 왕복 없음)
+- 백그라운드 스레드가 몇 초마다 모인 사용자를 UPDATE 한 번으로 반영 (write-behind)
+- 같은 사용자의 여러 요청은 한 번의 갱신으로 합쳐짐
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import text, bindparam
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityTracker:
+    """UserInfo.last_seen_at write-behind 버퍼"""
+
+    def __init__(self, app, db, flush_seconds=None):
+        self.app = app
+        self.db = db
+        self.flush_seconds = flush_seconds or float(os.getenv('ACTIVITY_FLUSH_SECONDS', '5'))
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        atexit.register(self.flush)
+
+    def touch(self, user_id):
+        """사용자 활동을 기록합니다 (메모리 버퍼에만 추가)."""
+        with self._lock:
+            self._pending.add(user_id)
+            if self._pid != os.getpid():
+                # 프로세스(fork 된 워커 포함)마다 flush 스레드를 하나씩 띄운다
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='activity-flush', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            self.flush()
+
+    def flush(self):
+        """버퍼에 모인 사용자들의 last_seen_at 을 한 번에 갱신합니다. 갱신한 사용자 수를 반환합니다."""
+        with self._lock:
+            user_ids, self._pending = self._pending, set()
+        if not user_ids:
+            return 0
+
+        try:
+            with self.app.app_context():
+                with self.db.engine.connect() as connection:
+                    connection.execute(
+                        text("UPDATE UserInfo SET last_seen_at = NOW() WHERE user_id IN :user_ids")
+                        .bindparams(bindparam('user_ids', expanding=True)),
+                        {"user_ids": sorted(user_ids)}
+                    )
+                    connection.commit()
+            logger.debug(f"last_seen_at 갱신: {len(user_ids)}명")
+            return len(user_ids)
+        except Exception as e:
+            # 실패한 사용자는 다음 flush 때 다시 시도
+            logger.error(f"❌ last_seen_at 갱신 실패: {e}")
+            with self._lock:
+                self._pending |= user_ids
+            return 0
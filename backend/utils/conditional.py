@@ -0,0 +1,62 @@
+"""
+조건부 GET (ETag / Last-Modified -> 304 Not Modified)
+- 수정 시각 컬럼이 있는 리소스(wills.lastmodified_at, triggers.updated_at)는 그 시각만 조회하는
+  가벼운 쿼리로 버전을 만들고, If-None-Match / If-Modified-Since 가 맞으면 본문(wills.body 등)을
+  읽거나 직렬화하지 않고 바로 304 를 반환
+  ETag = "<리소스>-<id>-<수정 시각 마이크로초>[-<fields 해시>]" (강한 ETag, ?fields= 마다 다른 표현)
+- 수정 시각이 없는 리소스(UserInfo)는 응답 본문 해시로 ETag 를 만들어 대역폭만 절약
+- Cache-Control: private, no-cache 로 브라우저가 매번 재검증하게 한다 (개인 정보이므로 공유 캐시 금지)
+- DB 의 시각은 UTC 로 간주 (모델 default 가 datetime.utcnow)
+"""
+
+import hashlib
+from datetime import timezone
+
+from flask import Response
+
+CACHE_CONTROL = 'private, no-cache'
+
+
+def version_etag(kind, key, modified_at, fields=None):
+    """수정 시각으로 만든 강한 ETag 값 (따옴표 제외). modified_at 이 없으면 None."""
+    if modified_at is None:
+        return None
+    etag = f"{kind}-{key}-{modified_at.strftime('%Y%m%d%H%M%S%f')}"
+    if fields:
+        etag += '-' + hashlib.sha1(','.join(fields).encode('utf-8')).hexdigest()[:8]
+    return etag
+
+
+def _as_utc(value):
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def is_not_modified(request, etag, modified_at):
+    """클라이언트 사본이 최신이면 True. If-None-Match 가 있으면 If-Modified-Since 보다 우선 (RFC 7232)."""
+    if request.if_none_match:
+        return etag is not None and request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and modified_at is not None:
+        # HTTP 날짜는 초 단위
+        return _as_utc(modified_at).replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def set_validators(response, etag, modified_at):
+    """200/304 응답에 ETag, Last-Modified, Cache-Control 을 붙입니다."""
+    if etag is not None:
+        response.set_etag(etag)
+    if modified_at is not None:
+        response.last_modified = _as_utc(modified_at)
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    return response
+
+
+def not_modified_response(etag, modified_at):
+    return set_validators(Response(status=304), etag, modified_at)
+
+
+def content_etag_response(request, response):
+    """본문 해시 ETag 를 붙이고 If-None-Match 가 맞으면 304 로 바꿉니다 (수정 시각 컬럼이 없는 리소스용)."""
+    response.add_etag()
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    return response.make_conditional(request)
@@ -0,0 +1,148 @@
+"""
+자주 읽고 드물게 바뀌는 엔티티의 프로세스 내 read-through 캐시 (LRU + TTL)
+- 키는 (엔티티, id), 값은 직렬화된 to_dict 결과 (ORM 객체가 아니므로 세션과 무관)
+  will               : (lastmodified_at, will.to_dict())    GET /api/wills/<id>
+  user               : user.to_dict()                       GET /api/users/<user_id>
+  recipients_by_will : [recipient.to_dict(), ...]           GET /api/recipients/will/<will_id>
+  triggers_by_user   : [trigger.to_dict(), ...]             GET /api/triggers/user/<user_id>
+  ?fields= 요청은 캐시된 전체 값에서 키만 골라 응답하고, 캐시에 없으면 그 컬럼만 조회하되 저장하지 않음
+- 상한: API_CACHE_MAX_ENTRIES 개, API_CACHE_MAX_BYTES 바이트 (값의 JSON 크기로 추정)
+  넘으면 가장 오래 쓰지 않은 항목부터 제거, 한 항목이 상한보다 크면 저장하지 않음
+- 같은 프로세스의 POST/PUT/DELETE 라우트는 커밋 후 해당 키를 바로 무효화
+  다른 프로세스(gunicorn 워커, 스케줄러의 raw SQL)의 변경은 API_CACHE_TTL_SECONDS 가 지나야 반영
+- 조회 중에 무효화가 있었으면 읽어 온 값을 저장하지 않음 (옛 값이 다시 들어가는 것 방지)
+- API_CACHE_ENABLED=false 면 항상 DB 를 직접 조회
+- 엔티티별 hit/miss/expired/eviction/invalidation 카운터는 stats() 와 GET /api/system/cache 로 확인
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+WILL = 'will'
+USER = 'user'
+RECIPIENTS_BY_WILL = 'recipients_by_will'
+TRIGGERS_BY_USER = 'triggers_by_user'
+
+STAT_NAMES = ('hits', 'misses', 'expired', 'evictions', 'invalidations')
+
+
+def estimate_size(value):
+    """캐시 값의 대략적인 크기 (UTF-8 JSON 바이트)"""
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode('utf-8'))
+
+
+class EntityCache:
+    """(엔티티, id) -> 값 LRU + TTL 캐시 (스레드 안전)"""
+
+    def __init__(self, max_entries=2000, max_bytes=16 * 1024 * 1024, ttl_seconds=30.0, enabled=True,
+                 clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # (entity, key) -> (expires_at, size, value)
+        self._bytes = 0
+        self._generation = 0  # 무효화할 때마다 증가
+        self._stats = {}
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_entries=int(os.environ.get('API_CACHE_MAX_ENTRIES', '2000')),
+            max_bytes=int(os.environ.get('API_CACHE_MAX_BYTES', str(16 * 1024 * 1024))),
+            ttl_seconds=float(os.environ.get('API_CACHE_TTL_SECONDS', '30')),
+            enabled=os.environ.get('API_CACHE_ENABLED', 'true').lower() == 'true',
+        )
+
+    def _count(self, entity, name, amount=1):
+        stats = self._stats.get(entity)
+        if stats is None:
+            stats = self._stats[entity] = dict.fromkeys(STAT_NAMES, 0)
+        stats[name] += amount
+
+    def _remove(self, cache_key):
+        entry = self._entries.pop(cache_key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+        return entry
+
+    @property
+    def generation(self):
+        """조회 전에 읽어 두었다가 set() 에 넘기면, 그 사이 무효화가 있었을 때 저장을 건너뜀"""
+        return self._generation
+
+    def get(self, entity, key):
+        """캐시된 값, 없거나 만료됐으면 None"""
+        if not self.enabled:
+            return None
+        cache_key = (entity, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                self._count(entity, 'misses')
+                return None
+            if entry[0] <= self.clock():
+                self._remove(cache_key)
+                self._count(entity, 'expired')
+                self._count(entity, 'misses')
+                return None
+            self._entries.move_to_end(cache_key)
+            self._count(entity, 'hits')
+            return entry[2]
+
+    def set(self, entity, key, value, generation=None):
+        """값을 저장합니다. generation 이후 무효화가 있었거나 값이 max_bytes 보다 크면 저장하지 않음."""
+        if not self.enabled or value is None:
+            return
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        cache_key = (entity, key)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._remove(cache_key)
+            self._entries[cache_key] = (self.clock() + self.ttl_seconds, size, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                (evicted_entity, _), (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._count(evicted_entity, 'evictions')
+
+    def invalidate(self, entity, *keys):
+        """entity 의 keys 항목을 지웁니다 (쓰기 커밋 후 호출)."""
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                if key is not None and self._remove((entity, key)) is not None:
+                    self._count(entity, 'invalidations')
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            entities = {}
+            for entity, stats in self._stats.items():
+                lookups = stats['hits'] + stats['misses']
+                entities[entity] = dict(stats, hit_ratio=round(stats['hits'] / lookups, 4) if lookups else None)
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'entities': entities,
+            }
+
+
+entity_cache = EntityCache.from_env()
@@ -0,0 +1,131 @@
+"""
+테이블 전체 내보내기 (감사용 덤프) 스트리밍 응답
+- 서버 측 커서(stream_results, PyMySQL SSCursor)로 EXPORT_CHUNK_ROWS 행씩 읽어 generator 로 바로 전송
+  ORM 객체나 전체 리스트를 만들지 않으므로 메모리는 테이블 크기와 무관하고 첫 바이트는 첫 청크 직후 나감
+- 형식은 Accept 로 선택 (?format=ndjson|csv 가 있으면 우선)
+  application/x-ndjson : 한 줄에 JSON 객체 하나 (기본)
+  text/csv             : 헤더 행 + 데이터 행
+- Accept-Encoding 에 gzip 이 있으면 청크마다 sync flush 하며 gzip 스트리밍 (?gzip=0 으로 끔)
+- 스트리밍 중에는 상태 코드를 바꿀 수 없으므로 중간 오류는 로그만 남기고 응답을 끊는다
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import zlib
+from datetime import date, datetime
+
+from flask import Response
+from sqlalchemy import select
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_ROWS = int(os.environ.get('EXPORT_CHUNK_ROWS', '1000'))
+
+NDJSON = 'application/x-ndjson'
+CSV = 'text/csv'
+EXPORT_FORMATS = {'ndjson': NDJSON, 'csv': CSV}
+EXTENSIONS = {NDJSON: 'ndjson', CSV: 'csv'}
+
+
+class ExportFormatError(ValueError):
+    """지원하지 않는 내보내기 형식 (406 으로 응답)"""
+
+
+def choose_export_format(request):
+    """?format= 또는 Accept 헤더로 NDJSON/CSV 를 고릅니다."""
+    requested = request.args.get('format')
+    if requested:
+        try:
+            return EXPORT_FORMATS[requested.lower()]
+        except KeyError:
+            raise ExportFormatError(f'format must be one of: {", ".join(EXPORT_FORMATS)}') from None
+    if not request.accept_mimetypes:
+        return NDJSON
+    mimetype = request.accept_mimetypes.best_match([NDJSON, CSV])
+    if mimetype is None:
+        raise ExportFormatError(f'Acceptable types: {NDJSON}, {CSV}')
+    return mimetype
+
+
+def wants_gzip(request):
+    if request.args.get('gzip', '').lower() in ('0', 'false'):
+        return False
+    return request.accept_encodings['gzip'] > 0
+
+
+def _jsonable(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _ndjson_chunk(columns, rows):
+    dumps = json.dumps
+    return ''.join(
+        dumps({column: _jsonable(value) for column, value in zip(columns, row)}, ensure_ascii=False) + '\n'
+        for row in rows
+    )
+
+
+def _csv_chunk(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([[_jsonable(value) for value in row] for row in rows])
+    return buffer.getvalue()
+
+
+def iter_export(engine, statement, mimetype, chunk_rows=EXPORT_CHUNK_ROWS, compress=False, name='export'):
+    """statement 결과를 서버 측 커서로 chunk_rows 행씩 읽어 직렬화한 bytes 를 차례로 내보냅니다."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def encode(text_chunk, flush=zlib.Z_SYNC_FLUSH):
+        data = text_chunk.encode('utf-8')
+        if compressor is None:
+            return data
+        return compressor.compress(data) + compressor.flush(flush)
+
+    total = 0
+    try:
+        with engine.connect() as connection:
+            result = connection.execution_options(stream_results=True, max_row_buffer=chunk_rows).execute(statement)
+            columns = list(result.keys())
+            if mimetype == CSV:
+                yield encode(_csv_chunk([columns]))
+            for rows in result.partitions(chunk_rows):
+                total += len(rows)
+                if mimetype == CSV:
+                    yield encode(_csv_chunk(rows))
+                else:
+                    yield encode(_ndjson_chunk(columns, rows))
+        if compressor is not None:
+            yield compressor.flush(zlib.Z_FINISH)
+        logger.info(f"✅ {name} 내보내기 완료: {total}행")
+    except Exception as e:
+        # 이미 200 을 보냈으므로 연결을 끊어 클라이언트가 불완전한 파일임을 알게 한다
+        logger.error(f"❌ {name} 내보내기 중단 ({total}행 전송 후): {e}")
+        raise
+
+
+def export_response(engine, table, request, where=None, name=None):
+    """table 을 id 순서로 스트리밍하는 Response. 형식이 맞지 않으면 ExportFormatError."""
+    mimetype = choose_export_format(request)
+    compress = wants_gzip(request)
+    name = name or table.name
+
+    statement = select(table)
+    if where is not None:
+        statement = statement.where(where)
+    statement = statement.order_by(table.c.id)
+
+    headers = {
+        'Content-Disposition': f'attachment; filename={name}.{EXTENSIONS[mimetype]}',
+        'X-Accel-Buffering': 'no',  # nginx 가 응답을 모아 두지 않도록
+        'Vary': 'Accept, Accept-Encoding',
+    }
+    if compress:
+        headers['Content-Encoding'] = 'gzip'
+    content_type = f'{mimetype}; charset=utf-8'
+    return Response(iter_export(engine, statement, mimetype, compress=compress, name=name),
+                    content_type=content_type, headers=headers)
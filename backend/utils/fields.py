@@ -0,0 +1,58 @@
+"""
+?fields= sparse fieldset
+- ?fields=id,subject 처럼 응답에 넣을 to_dict 키를 고르면 그 컬럼만 SELECT (load_only) 하고 그 키만 직렬화
+  요청하지 않은 컬럼(특히 wills.body TEXT)은 DB 에서 읽지도, JSON 으로 만들지도 않음
+- 모델은 FIELD_COLUMNS (to_dict 키 -> 컬럼 속성 이름) 로 선택 가능한 필드를 선언
+- fields 가 없으면 기존과 같이 to_dict() 전체
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy.orm import load_only
+
+
+class FieldsError(ValueError):
+    """알 수 없는 필드 (400 으로 응답)"""
+
+
+def parse_fields(args, Model):
+    """request.args 의 fields 를 to_dict 키 목록으로. 없으면 None, 모르는 키가 있으면 FieldsError."""
+    raw = args.get('fields')
+    if not raw:
+        return None
+    fields = list(dict.fromkeys(field.strip() for field in raw.split(',') if field.strip()))
+    unknown = [field for field in fields if field not in Model.FIELD_COLUMNS]
+    if unknown:
+        raise FieldsError(
+            f'Unknown fields: {", ".join(unknown)}. Available: {", ".join(Model.FIELD_COLUMNS)}'
+        )
+    return fields or None
+
+
+def with_fields(query, Model, fields):
+    """요청한 필드의 컬럼만 읽도록 query 에 load_only 를 적용 (PK 는 항상 포함됨)"""
+    if fields is None:
+        return query
+    columns = dict.fromkeys(Model.FIELD_COLUMNS[field] for field in fields)
+    return query.options(load_only(*[getattr(Model, column) for column in columns]))
+
+
+def _serialize(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def to_dict(obj, fields=None):
+    """fields 의 키만 직렬화. 다른 속성에는 접근하지 않으므로 로드하지 않은 컬럼을 다시 조회하지 않는다."""
+    if fields is None:
+        return obj.to_dict()
+    columns = obj.FIELD_COLUMNS
+    return {field: _serialize(getattr(obj, columns[field])) for field in fields}
+
+
+def project(data, fields=None):
+    """이미 직렬화된 전체 to_dict 결과(캐시 값)에서 fields 키만 고릅니다."""
+    if fields is None:
+        return data
+    return {field: data[field] for field in fields}
@@ -0,0 +1,138 @@
+"""
+목록 API 용 keyset(cursor) 페이지네이션
+- ?after=<마지막으로 받은 id>&limit=<개수> : 인덱스가 있는 키(PK) 순서로 다음 페이지만 조회
+  (OFFSET 없이 WHERE id > :after ORDER BY id LIMIT :limit + 1)
+- limit 을 주지 않으면 API_PAGE_SIZE, 아무리 크게 줘도 API_MAX_PAGE_SIZE 까지만 (테이블 전체 적재 방지)
+- 전체 개수는 요청할 때만 계산
+  ?count=exact    : SELECT COUNT(*)
+  ?count=estimate : MySQL information_schema.TABLES.TABLE_ROWS 추정치 (필터가 있거나 MySQL 이 아니면 exact)
+- 응답의 count 는 이번 페이지의 개수, next_after 를 다음 요청의 after 로 넘기면 된다 (없으면 마지막 페이지)
+"""
+
+import os
+
+from sqlalchemy import func, text
+
+API_PAGE_SIZE = int(os.environ.get('API_PAGE_SIZE', '100'))
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', '1000'))
+
+COUNT_MODES = ('exact', 'estimate')
+
+
+class PaginationError(ValueError):
+    """잘못된 페이지 파라미터 (400 으로 응답)"""
+
+
+class PageRequest:
+    """파싱한 after/limit/count 파라미터"""
+
+    def __init__(self, after=None, limit=API_PAGE_SIZE, count=None):
+        self.after = after
+        self.limit = limit
+        self.count = count
+
+
+class Page:
+    """조회한 한 페이지"""
+
+    def __init__(self, items, limit, next_after=None, total=None):
+        self.items = items
+        self.limit = limit
+        self.next_after = next_after
+        self.total = total
+
+    @property
+    def has_more(self):
+        return self.next_after is not None
+
+
+def parse_page_request(args, default_limit=None, max_limit=None):
+    """request.args 에서 after/limit/count 를 읽습니다. 잘못된 값이면 PaginationError."""
+    default_limit = default_limit or API_PAGE_SIZE
+    max_limit = max_limit or API_MAX_PAGE_SIZE
+
+    after = args.get('after')
+    if after in (None, ''):
+        after = None
+    else:
+        try:
+            after = int(after)
+        except ValueError:
+            raise PaginationError('after must be an integer id') from None
+
+    limit = args.get('limit')
+    if limit in (None, ''):
+        limit = default_limit
+    else:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise PaginationError('limit must be an integer') from None
+        if limit < 1:
+            raise PaginationError('limit must be at least 1')
+    limit = min(limit, max_limit)
+
+    count = args.get('count')
+    if count in (None, '', 'false', '0'):
+        count = None
+    elif count in ('true', '1'):
+        count = 'exact'
+    elif count not in COUNT_MODES:
+        raise PaginationError(f'count must be one of: {", ".join(COUNT_MODES)}')
+
+    return PageRequest(after, limit, count)
+
+
+def estimate_row_count(db, table_name):
+    """MySQL 통계의 테이블 행 수 추정치, 얻을 수 없으면 None"""
+    if db.engine.dialect.name != 'mysql':
+        return None
+    row = db.session.execute(text("""
+        SELECT TABLE_ROWS FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name
+    """), {"table_name": table_name}).fetchone()
+    return int(row[0]) if row and row[0] is not None else None
+
+
+def count_rows(db, query, key_column, mode, filtered=False):
+    """query 의 전체 행 수 (mode 가 estimate 이고 필터가 없으면 추정치)"""
+    if mode == 'estimate' and not filtered:
+        estimate = estimate_row_count(db, key_column.table.name)
+        if estimate is not None:
+            return estimate
+    return query.order_by(None).with_entities(func.count(key_column)).scalar()
+
+
+def fetch_page(db, query, key_column, page_request, filtered=False):
+    """key_column 순서로 page_request.after 다음의 한 페이지를 조회합니다.
+
+    limit + 1 개를 읽어 다음 페이지가 있는지 판단한다 (별도 COUNT 없음).
+    """
+    total = None
+    if page_request.count:
+        total = count_rows(db, query, key_column, page_request.count, filtered)
+
+    if page_request.after is not None:
+        query = query.filter(key_column > page_request.after)
+    rows = query.order_by(key_column).limit(page_request.limit + 1).all()
+
+    next_after = None
+    if len(rows) > page_request.limit:
+        rows = rows[:page_request.limit]
+        next_after = getattr(rows[-1], key_column.key)
+    return Page(rows, page_request.limit, next_after, total)
+
+
+def page_response(page, data):
+    """{'success', 'data', 'count', 'limit', 'next_after', 'has_more'[, 'total']} 응답 본문"""
+    response = {
+        'success': True,
+        'data': data,
+        'count': len(data),
+        'limit': page.limit,
+        'next_after': page.next_after,
+        'has_more': page.has_more,
+    }
+    if page.total is not None:
+        response['total'] = page.total
+    return response
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+DMS 트리거 발송 예정 시각(triggers.due_at) 계산 모듈
+- due_at 은 UTC 로 저장하며 스케줄러는 (status, due_at) 인덱스 range scan 만으로 due 트리거를 찾음
+- date 기준: 사용자 시간대의 trigger_date 다음 날 00:00 (= 그 날짜가 "지난" 시점)
+- is_triggered (수동 발동, inactivity 평가): 즉시
+- inactivity 기간 경과는 스케줄러의 evaluate_inactivity_triggers 가 due_at 을 현재 시각으로 당김
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta, timezone, time as dt_time
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_TIMEZONE = os.getenv('DEFAULT_USER_TIMEZONE', 'Asia/Seoul')
+
+
+def is_valid_timezone(name):
+    """IANA 시간대 이름(예: Asia/Seoul) 유효성 검사"""
+    try:
+        ZoneInfo(name)
+        return True
+    except (ZoneInfoNotFoundError, ValueError, TypeError):
+        return False
+
+
+def user_zone(name=None):
+    """사용자 시간대 (없거나 잘못된 값이면 DEFAULT_USER_TIMEZONE)"""
+    if name:
+        try:
+            return ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            logger.warning(f"⚠️ 알 수 없는 시간대 '{name}', {DEFAULT_USER_TIMEZONE} 사용")
+    return ZoneInfo(DEFAULT_USER_TIMEZONE)
+
+
+def utc_now():
+    """naive UTC 현재 시각 (DB 의 UTC_TIMESTAMP() 와 같은 형식)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def compute_due_at(trigger_date, is_triggered=False, timezone_name=None, now=None):
+    """트리거의 발송 예정 시각(naive UTC)을 계산합니다. 예정 시각이 없으면 None."""
+    if is_triggered:
+        return now or utc_now()
+    if trigger_date is None:
+        return None
+    local_due = datetime.combine(trigger_date + timedelta(days=1), dt_time.min, tzinfo=user_zone(timezone_name))
+    return local_due.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def fetch_user_timezone(connection, user_id):
+    """UserInfo.timezone 조회 (ORM 이벤트/raw SQL 어디서나 쓸 수 있도록 커넥션 사용)"""
+    return connection.execute(
+        text("SELECT timezone FROM UserInfo WHERE user_id = :user_id"),
+        {"user_id": user_id}
+    ).scalar()
+
+
+def reschedule_user_triggers(connection, user_id, timezone_name):
+    """사용자 시간대가 바뀌면 아직 발동되지 않은 pending 트리거의 due_at 을 다시 계산합니다."""
+    rows = connection.execute(text("""
+        SELECT id, trigger_date FROM triggers
+        WHERE user_id = :user_id AND status = 'pending' AND is_triggered = FALSE
+    """), {"user_id": user_id}).fetchall()
+    if rows:
+        connection.execute(
+            text("UPDATE triggers SET due_at = :due_at WHERE id = :id"),
+            [{"id": trigger_id, "due_at": compute_due_at(trigger_date, False, timezone_name)}
+             for trigger_id, trigger_date in rows]
+        )
+    return len(rows)
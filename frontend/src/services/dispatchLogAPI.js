@@ -1,5 +1,6 @@
 // DispatchLog API 서비스
 import config from '../config/config';
+import { fetchAllPages } from './pagination';
 
 const API_BASE_URL = config.api.baseUrl;
 
@@ -43,18 +44,21 @@ export const dispatchLogAPI = {
   // 모든 DispatchLog 조회
   getAllDispatchLogs: async () => {
     try {
-      const response = await fetch(`${API_BASE_URL}/api/dispatch-logs`, {
-        method: 'GET',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-      });
+      // 목록 API 는 페이지 단위로 반환되므로 next_after 로 모든 페이지를 이어서 조회
+      const data = await fetchAllPages(async (params) => {
+        const response = await fetch(`${API_BASE_URL}/api/dispatch-logs?${new URLSearchParams(params)}`, {
+          method: 'GET',
+          headers: {
+            'Content-Type': 'application/json',
+          },
+        });
 
-      if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`);
-      }
+        if (!response.ok) {
+          throw new Error(`HTTP error! status: ${response.status}`);
+        }
 
-      const data = await response.json();
+        return response.json();
+      });
       
       if (data.success) {
         return {
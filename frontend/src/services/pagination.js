@@ -0,0 +1,31 @@
+// 목록 API 페이지네이션 도우미
+// 목록 API 는 keyset 페이지 단위({ data, has_more, next_after })로 반환하므로
+// has_more 가 false 가 될 때까지 next_after 로 다음 페이지를 이어서 받아 합친다.
+
+// 한 번에 받을 최대 행 수 (서버 API_MAX_PAGE_SIZE)
+export const PAGE_LIMIT = 1000;
+
+// fetchPage(params) 는 한 페이지의 응답 JSON 을 반환하는 함수
+// 반환값: { success: true, data: [...전체...], count } (실패 응답이면 그 응답을 그대로 반환)
+export const fetchAllPages = async (fetchPage, params = {}) => {
+  const rows = [];
+  let after = null;
+  for (;;) {
+    const pageParams = { ...params, limit: PAGE_LIMIT };
+    if (after !== null) {
+      pageParams.after = after;
+    }
+    const page = await fetchPage(pageParams);
+    if (!page.success) {
+      return page;
+    }
+    rows.push(...(page.data || []));
+    if (!page.has_more || page.next_after == null) {
+      break;
+    }
+    after = page.next_after;
+  }
+  return { success: true, data: rows, count: rows.length };
+};
+
+export default fetchAllPages;
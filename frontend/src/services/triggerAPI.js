@@ -1,5 +1,6 @@
 // 트리거 API 서비스
 import config from '../config/config';
+import { fetchAllPages } from './pagination';
 
 const API_BASE_URL = config.api.baseUrl;
 
@@ -84,18 +85,21 @@ export const triggerAPI = {
   // 모든 트리거 조회
   getAllTriggers: async () => {
     try {
-      const response = await fetch(`${API_BASE_URL}/api/triggers`, {
-        method: 'GET',
-        headers: {
-          'Content-Type': 'application/json',
-        },
+      // 목록 API 는 페이지 단위로 반환되므로 next_after 로 모든 페이지를 이어서 조회
+      const data = await fetchAllPages(async (params) => {
+        const response = await fetch(`${API_BASE_URL}/api/triggers?${new URLSearchParams(params)}`, {
+          method: 'GET',
+          headers: {
+            'Content-Type': 'application/json',
+          },
+        });
+
+        if (!response.ok) {
+          throw new Error(`HTTP error! status: ${response.status}`);
+        }
+
+        return response.json();
       });
-
-      if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`);
-      }
-
-      const data = await response.json();
       
       if (data.success) {
         return {
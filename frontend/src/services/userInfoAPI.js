@@ -1,13 +1,13 @@
 // UserInfo API 호출 함수들
 import api from './api';
+import { fetchAllPages } from './pagination';
 
 // UserInfo API 함수들
 export const userInfoAPI = {
-  // ✅ 모든 사용자 조회
+  // ✅ 모든 사용자 조회 (has_more 가 false 가 될 때까지 next_after 로 다음 페이지를 이어서 조회)
   getAllUsers: async () => {
     try {
-      const response = await api.get('/api/users');
-      return response.data; // Flask에서 반환하는 데이터
+      return await fetchAllPages(async (params) => (await api.get('/api/users', { params })).data);
     } catch (error) {
       console.error('사용자 목록 조회 실패:', error);
       throw error;
@@ -2,13 +2,13 @@
 // Flask backend의 Will 관련 API 호출을 담당합니다
 
 import api from './api';
+import { fetchAllPages } from './pagination';
 
 export const willAPI = {
-  // ✅ 모든 Will 조회 (문서에 따라 수정)
+  // ✅ 모든 Will 조회 (next_after 로 모든 페이지를 이어서 조회)
   getAllWills: async () => {
     try {
-      const response = await api.get('/api/wills');
-      return response.data;
+      return await fetchAllPages(async (params) => (await api.get('/api/wills', { params })).data);
     } catch (error) {
       console.error('Will 목록 조회 실패:', error);
       throw error;
@@ -31,13 +31,16 @@ export const willAPI = {
     try {
       console.log(`📜 사용자 ${userId}의 Will 조회 시작...`);
       
-      // 모든 Will을 가져와서 해당 사용자의 Will을 필터링
-      const response = await api.get('/api/wills');
+      // 서버에서 user_id로 필터링하고, 페이지 단위로 반환되므로 next_after 로 끝까지 이어서 조회
+      const response = await fetchAllPages(
+        async (params) => (await api.get('/api/wills', { params })).data,
+        { user_id: userId }
+      );
       
-      // Flask API 응답 구조: { success: true, data: [...], count: ... }
-      if (response.data && response.data.success && response.data.data) {
+      // 응답 구조: { success: true, data: [...], count: ... }
+      if (response && response.success && response.data) {
         // 사용자 ID로 필터링 (user_id를 문자열로 비교)
-        const userWills = response.data.data.filter(will => 
+        const userWills = response.data.filter(will => 
           will.user_id === userId
         );
         